@@ -1,7 +1,7 @@
 import { createApi, fetchBaseQuery, } from '@reduxjs/toolkit/query/react';
 
 import { API_MAX_RETRIES, BASE_API_URL, } from '../constants';
-import type { Configuration, Device, Telemetry, } from '../models';
+import type { Configuration, Device, Telemetry, TelemetryBucket, } from '../models';
 import { camelCaseToSnakeCase, snakeCaseToCamelCase, } from '../utils/strings';
 
 export const espartanService = createApi({
@@ -94,6 +94,23 @@ export const espartanService = createApi({
                 maxRetries : API_MAX_RETRIES,
             },
         }),
+        getTelemetrySeries     : build.query<TelemetryBucket[], {
+            deviceIds : string[],
+            dataType  : string,
+            offset    : number,
+            bucket    : number,
+        }>({
+            query             : ({
+                deviceIds,
+                dataType,
+                offset,
+                bucket,
+            }) => `/telemetry/series?${deviceIds.map(deviceId => `device_id=${deviceId}`).join('&')}&data_type=${dataType}&offset=${offset}&bucket=${bucket}`,
+            transformResponse : (response : any) => response.map((item : any) => snakeCaseToCamelCase(item)),
+            extraOptions      : {
+                maxRetries : API_MAX_RETRIES,
+            },
+        }),
     }),
     tagTypes    : [
         'config',
@@ -101,4 +118,4 @@ export const espartanService = createApi({
     ],
 });
 
-export const { useGetConfigurationsQuery, useGetCurrentStateQuery, useGetDeviceQuery, useGetDevicesQuery, useGetHistoricalTelemetryQuery, useGetRecentTelemetryQuery, useGetTelemetriesQuery, useSetConfigurationsMutation, useSetDeviceMutation, } = espartanService;
+export const { useGetConfigurationsQuery, useGetCurrentStateQuery, useGetDeviceQuery, useGetDevicesQuery, useGetHistoricalTelemetryQuery, useGetRecentTelemetryQuery, useGetTelemetriesQuery, useGetTelemetrySeriesQuery, useSetConfigurationsMutation, useSetDeviceMutation, } = espartanService;
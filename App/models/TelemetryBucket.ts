@@ -0,0 +1,9 @@
+export type TelemetryBucket = {
+    deviceId : string,
+    dataType : string,
+    bucket   : string,
+    min      : number,
+    avg      : number,
+    max      : number,
+    count    : number,
+};
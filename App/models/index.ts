@@ -1,3 +1,4 @@
 export type { Configuration, } from './Configuration';
 export type { Device, } from './Device';
 export type { Telemetry, } from './Telemetry';
+export type { TelemetryBucket, } from './TelemetryBucket';
@@ -0,0 +1,86 @@
+from argparse import ArgumentParser
+from asyncio import run
+from contextlib import redirect_stdout
+from json import dumps
+from os import devnull, environ, path
+from subprocess import DEVNULL, CalledProcessError, check_output
+from sys import stdout
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+
+def _parse_args():
+    parser = ArgumentParser(prog='python -m benchmarks', description='Benchmarks evaluation cycles, API endpoints and ingest against a synthetic fleet')
+    parser.add_argument('--devices', type=int, default=100, help='Number of devices in the fleet, one in ten being a relay actuator')
+    parser.add_argument('--telemetry', type=int, default=100000, help='Number of telemetry rows to seed')
+    parser.add_argument('--days', type=float, default=2.0, help='Time span of the seeded telemetry in days')
+    parser.add_argument('--iterations', type=int, default=20, help='Number of timed runs per benchmark')
+    parser.add_argument('--ingest', type=int, default=500, help='Number of telemetry messages to ingest')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the random fleet')
+    parser.add_argument('--output', help='File to write the JSON results to, instead of standard output')
+
+    return parser.parse_args()
+
+
+def _git_commit():
+    try:
+        return check_output(['git', 'rev-parse', 'HEAD'], stderr=DEVNULL, text=True).strip()
+    except (CalledProcessError, OSError):
+        return None
+
+
+async def _benchmark(args) -> dict:
+    # The application reads its database URL on import, so it is only imported once the temporary database is configured
+    # pylint: disable=import-outside-toplevel
+    from esparkcore.data import init_db
+    from esparkcore.data.database import engine
+
+    from . import suite
+    from .seed import seed
+
+    engine.echo = False
+
+    await init_db()
+
+    start = perf_counter()
+    await seed(engine, args.devices, args.telemetry, args.days, args.seed)
+    seeded = perf_counter() - start
+
+    await suite.prepare()
+
+    results = await suite.run(args.devices, args.iterations, args.ingest, args.seed)
+
+    return {
+        'commit'    : _git_commit(),
+        'fleet'     : {
+            'devices'   : args.devices,
+            'telemetry' : args.telemetry,
+            'days'      : args.days,
+        },
+        'seed_s'    : round(seeded, 3),
+        'results'   : results,
+    }
+
+
+def main() -> None:
+    args = _parse_args()
+
+    with TemporaryDirectory() as directory:
+        environ['DATABASE_URL'] = f'sqlite+aiosqlite:///{path.join(directory, "benchmark.db")}'
+        environ['ENVIRONMENT']  = 'dev'
+
+        # The application logs every message it handles, which would drown the results
+        with open(devnull, 'w', encoding='utf-8') as sink, redirect_stdout(sink):
+            report = run(_benchmark(args))
+
+    output = dumps(report, indent=4)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(output + '\n')
+    else:
+        stdout.write(output + '\n')
+
+
+if __name__ == '__main__':
+    main()
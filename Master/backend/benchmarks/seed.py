@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta, timezone
+from random import Random
+from typing import Iterator
+
+from esparkcore.data.models import AppVersion, Device, Telemetry
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.data.models import DeviceCapability, RelayState
+
+APP_NAME     : str = 'Espartan-Thermo'
+APP_VERSION  : str = '0.5.0'
+CHUNK_SIZE   : int = 50000
+ACTUATOR_GAP : int = 10
+
+
+def device_id(index: int) -> str:
+    return f'dev{index:05d}'
+
+
+def is_actuator(index: int) -> bool:
+    return index % ACTUATOR_GAP == 0
+
+
+def capabilities(index: int) -> str:
+    return 'action_relay,temperature' if is_actuator(index) else 'temperature,humidity,battery'
+
+
+async def seed(engine: AsyncEngine, devices: int, telemetry: int, days: float, seed_value: int = 0) -> None:
+    random = Random(seed_value)
+    now    = datetime.now(timezone.utc)
+
+    async with engine.begin() as conn:
+        await conn.execute(insert(AppVersion), [{
+            'id'      : APP_NAME,
+            'version' : APP_VERSION,
+        }])
+
+        await conn.execute(insert(Device), [{
+            'id'           : device_id(index),
+            'app_name'     : APP_NAME,
+            'app_version'  : APP_VERSION,
+            'capabilities' : capabilities(index),
+            'parameters'   : {},
+            'last_seen'    : now,
+        } for index in range(devices)])
+
+        await conn.execute(insert(DeviceCapability), [{
+            'device_id'  : device_id(index),
+            'capability' : capability,
+        } for index in range(devices) for capability in capabilities(index).split(',')])
+
+        relay_states = [{
+            'device_id' : device_id(index),
+            'timestamp' : now - timedelta(hours=1),
+            'state'     : index % 2,
+        } for index in range(devices) if is_actuator(index)]
+
+        if relay_states:
+            await conn.execute(insert(RelayState), relay_states)
+
+    for chunk in _chunks(_telemetry(random, devices, telemetry, days, now)):
+        async with engine.begin() as conn:
+            await conn.execute(insert(Telemetry), chunk)
+
+
+def _telemetry(random: Random, devices: int, count: int, days: float, now: datetime) -> Iterator[dict]:
+    span = days * 86400
+
+    # Rows are generated oldest first, as they would have been ingested
+    for index in range(count):
+        device    = random.randrange(devices)
+        data_type = 'temperature' if is_actuator(device) else random.choice(('temperature', 'temperature', 'humidity', 'battery'))
+
+        yield {
+            'device_id' : device_id(device),
+            'timestamp' : now - timedelta(seconds=span * (1 - index / count)),
+            'data_type' : data_type,
+            'value'     : random.randint(1500, 2300) if data_type == 'temperature' else random.randint(0, 10000),
+        }
+
+
+def _chunks(rows: Iterator[dict]) -> Iterator[list[dict]]:
+    chunk = []
+
+    for row in rows:
+        chunk.append(row)
+
+        if len(chunk) == CHUNK_SIZE:
+            yield chunk
+
+            chunk = []
+
+    if chunk:
+        yield chunk
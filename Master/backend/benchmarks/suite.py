@@ -0,0 +1,153 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from math import ceil
+from random import Random
+from time import perf_counter
+from typing import Awaitable, Callable
+from unittest.mock import patch
+
+from esparkcore.data.models import Telemetry
+from httpx import ASGITransport, AsyncClient
+
+from src.data import count_queries, init_capabilities, init_indexes, init_relays, init_settings
+from src.main import app, telemetry_repo
+from src.schedules import evaluate, process_outbox
+from src.services import MQTTManager, capability_cache, ingest_buffer, settings_cache, telemetry_cache
+
+from .seed import device_id, is_actuator
+
+
+@dataclass
+class Measurement:
+    durations : list[float] = field(default_factory=list)
+    queries   : int         = 0
+
+    def summarise(self) -> dict:
+        durations = sorted(self.durations)
+
+        return {
+            'iterations'      : len(durations),
+            'p50_ms'          : round(_percentile(durations, 50) * 1000, 3),
+            'p95_ms'          : round(_percentile(durations, 95) * 1000, 3),
+            'mean_ms'         : round(sum(durations) / len(durations) * 1000, 3),
+            'queries_per_run' : round(self.queries / len(durations), 2),
+            'runs_per_second' : round(len(durations) / sum(durations), 2) if sum(durations) else None,
+        }
+
+
+class NullMQTTClient:
+    # Outbox publishing is measured without a broker, so only the database work of the consumer is timed
+    def __init__(self, *args, **kwargs) -> None:
+        pass
+
+    async def __aenter__(self) -> 'NullMQTTClient':
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        pass
+
+    async def publish(self, *args, **kwargs) -> None:
+        pass
+
+
+async def measure(callback: Callable[[], Awaitable[None]], iterations: int, warmup: int = 1) -> dict:
+    for _ in range(warmup):
+        await callback()
+
+    measurement = Measurement()
+
+    with count_queries() as stats:
+        for _ in range(iterations):
+            start = perf_counter()
+
+            await callback()
+
+            measurement.durations.append(perf_counter() - start)
+
+        measurement.queries = stats.count
+
+    return measurement.summarise()
+
+
+async def prepare() -> None:
+    await init_indexes()
+    await init_settings()
+    await init_relays()
+    await init_capabilities()
+    await telemetry_cache.warm()
+
+    capability_cache.invalidate()
+    settings_cache.invalidate()
+
+
+async def run(devices: int, iterations: int, ingest: int, seed_value: int = 0) -> dict:
+    random  = Random(seed_value)
+    sensors = [device_id(index) for index in range(devices)]
+    results = {}
+
+    cold = False
+
+    async def evaluation_cycle() -> None:
+        nonlocal cold
+
+        # Alternating cold and warm readings switch every relay on each cycle, the worst case of an evaluation
+        cold = not cold
+
+        for sensor_id in sensors:
+            telemetry_cache.put(Telemetry(device_id=sensor_id, data_type='temperature', value=random.randint(1500, 1600) if cold else random.randint(2000, 2100), timestamp=datetime.now(timezone.utc)))
+
+        await evaluate()
+
+    results['evaluate']       = await measure(evaluation_cycle, iterations)
+
+    with patch('esparkcore.schedules.outbox.Client', NullMQTTClient):
+        results['process_outbox'] = await measure(process_outbox, iterations)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url='http://benchmark') as client:
+        actuator = next((device_id(index) for index in range(devices) if is_actuator(index)), device_id(0))
+
+        for name, url in (
+            ('GET /devices', '/api/v1/devices/'),
+            ('GET /devices/all', '/api/v1/devices/all?limit=100'),
+            ('GET /relays/current', f'/api/v1/relays/current/{actuator}'),
+            ('GET /settings/1', '/api/v1/settings/1'),
+            ('GET /telemetry/recent', '/api/v1/telemetry/recent?offset=86400'),
+            ('GET /telemetry/history', f'/api/v1/telemetry/history?device_id={actuator}&offset=86400'),
+            ('GET /telemetry/series', f'/api/v1/telemetry/series?device_id={actuator}&data_type=temperature&offset=86400&bucket=3600'),
+        ):
+            async def request(url: str = url) -> None:
+                (await client.get(url)).raise_for_status()
+
+            results[name] = await measure(request, iterations)
+
+    manager = MQTTManager(telemetry_repo=telemetry_repo)
+    index   = 0
+
+    async def ingest_messages(count: int) -> None:
+        nonlocal index
+
+        for _ in range(count):
+            index += 1
+
+            # pylint: disable=protected-access
+            await manager._handle_telemetry(sensors[index % len(sensors)], {
+                'data_type' : 'temperature',
+                'value'     : random.randint(1500, 2300),
+            })
+
+        while await ingest_buffer.flush():
+            pass
+
+    # A lone message is flushed on its own, while a burst fills whole batches of the ingest buffer
+    results['ingest']       = await measure(lambda: ingest_messages(1), ingest)
+    results['ingest_burst'] = await measure(lambda: ingest_messages(ingest_buffer.batch_size), max(1, ingest // ingest_buffer.batch_size))
+
+    return results
+
+
+def _percentile(values: list[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+
+    # Nearest-rank percentile
+    return values[max(0, ceil(percentile / 100 * len(values)) - 1)]
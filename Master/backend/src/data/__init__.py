@@ -1,10 +1,45 @@
 from esparkcore.data import async_session
-from esparkcore.data.models import AppVersion
+from esparkcore.data.database import engine
+from esparkcore.data.models import AppVersion, Device
 from esparkcore.data.repositories import AppVersionRepository
+from sqlalchemy import Connection, func
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import SQLModel, select
 
-from .models import Settings
-from .repositories import SettingsRepository
+from .database import apply_read_only, apply_sqlite_profile, get_request_session, read_engine, read_session
+from .instrumentation import QueryStats, count_queries, instrument_engine, track_queries
+from .models import DeviceCapability, Relay, RelayState, Settings
+from .repositories import DeviceRepository, RelayRepository, SettingsRepository
+
+
+async def init_indexes() -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(ensure_indexes)
+
+
+def ensure_indexes(conn: Connection) -> None:
+    # create_all() only creates indexes together with new tables, so indexes added later are created here
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
+async def init_capabilities() -> None:
+    async with async_session() as session:
+        await ensure_device_capabilities(session)
+
+        await session.commit()
+
+
+async def ensure_device_capabilities(session: AsyncSession) -> None:
+    # pylint: disable=not-callable
+    if (await session.execute(select(func.count()).select_from(DeviceCapability))).scalar_one() > 0:
+        return
+
+    repo = DeviceRepository()
+
+    for device in (await session.execute(select(Device))).scalars().all():
+        await repo.stage_capabilities(session, device)
 
 
 async def init_settings() -> None:
@@ -17,6 +52,28 @@ async def init_settings() -> None:
         await session.commit()
 
 
+async def init_relays() -> None:
+    async with async_session() as session:
+        await ensure_relay_states(session)
+
+        await session.commit()
+
+
+async def ensure_relay_states(session: AsyncSession) -> None:
+    # pylint: disable=not-callable
+    if (await session.execute(select(func.count()).select_from(RelayState))).scalar_one() > 0:
+        return
+
+    latest: dict[str, Relay] = {}
+
+    # pylint: disable=no-member
+    for relay in await RelayRepository().list(session, order_by=Relay.timestamp.asc()):
+        latest[relay.device_id] = relay
+
+    for relay in latest.values():
+        session.add(RelayState(device_id=relay.device_id, timestamp=relay.timestamp, state=relay.state))
+
+
 async def ensure_settings(session: AsyncSession) -> None:
     settings = Settings()
     repo     = SettingsRepository()
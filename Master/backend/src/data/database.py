@@ -0,0 +1,63 @@
+from esparkcore.data import async_session
+from esparkcore.data.database import engine
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from ..utils import AppConfig
+from .instrumentation import instrument_engine
+
+app_config = AppConfig()
+
+
+def apply_sqlite_profile(async_engine: AsyncEngine) -> None:
+    if async_engine.dialect.name == 'sqlite':
+        event.listen(async_engine.sync_engine, 'connect', _on_connect)
+
+
+def apply_read_only(async_engine: AsyncEngine) -> None:
+    if async_engine.dialect.name == 'sqlite':
+        event.listen(async_engine.sync_engine, 'connect', _on_read_connect)
+
+
+# pylint: disable=unused-argument
+def _on_connect(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+
+    cursor.execute(f'PRAGMA journal_mode={app_config.sqlite_journal_mode}')
+    cursor.execute(f'PRAGMA synchronous={app_config.sqlite_synchronous}')
+    cursor.execute(f'PRAGMA cache_size={int(app_config.sqlite_cache_size)}')
+    cursor.execute(f'PRAGMA mmap_size={int(app_config.sqlite_mmap_size)}')
+    cursor.execute(f'PRAGMA busy_timeout={int(app_config.sqlite_busy_timeout)}')
+    cursor.execute(f'PRAGMA temp_store={app_config.sqlite_temp_store}')
+
+    cursor.close()
+
+
+# pylint: disable=unused-argument
+def _on_read_connect(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+
+    # A write through the read pool fails loudly, instead of contending with the writer
+    cursor.execute('PRAGMA query_only=ON')
+
+    cursor.close()
+
+
+# The espark-core engine serves writes, MQTT ingest and scheduled jobs, while API reads get a pool of their own
+apply_sqlite_profile(engine)
+instrument_engine(engine)
+
+# pylint: disable=invalid-name
+read_engine  = create_async_engine(engine.url, pool_size=app_config.database_read_pool_size)
+read_session = async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+
+apply_sqlite_profile(read_engine)
+apply_read_only(read_engine)
+instrument_engine(read_engine)
+
+
+async def get_request_session(request: Request):
+    # Only safe methods are served from the read pool, so requests that change data keep using the writer
+    async with (read_session if request.method in ('GET', 'HEAD') else async_session)() as session:
+        yield session
@@ -0,0 +1,6 @@
+from sqlalchemy import ColumnElement, Integer, cast, func
+
+
+def epoch_bucket(timestamp: ColumnElement, width: int) -> ColumnElement[int]:
+    # Start of the bucket of the given width, in seconds since the epoch
+    return (cast(func.strftime('%s', timestamp), Integer) // width * width).label('bucket')
@@ -0,0 +1,75 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ..utils import metrics_registry
+
+query_duration = metrics_registry.histogram('espartan_db_query_duration_seconds', 'Duration of SQL statements')
+
+
+@dataclass
+class QueryStats:
+    count    : int   = 0
+    duration : float = 0.0
+
+    def add(self, duration: float) -> None:
+        self.count    += 1
+        self.duration += duration
+
+
+_current  : ContextVar[Optional[QueryStats]] = ContextVar('query_stats', default=None)
+_counters : list[QueryStats]                 = []
+
+
+def instrument_engine(async_engine: AsyncEngine) -> None:
+    event.listen(async_engine.sync_engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(async_engine.sync_engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    # Statements are attributed to the task that issues them, so concurrent requests and jobs are counted apart
+    stats = QueryStats()
+    token = _current.set(stats)
+
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryStats]:
+    # Counts every statement on instrumented engines whichever task issues it, which suits tests and benchmarks
+    stats = QueryStats()
+
+    _counters.append(stats)
+
+    try:
+        yield stats
+    finally:
+        _counters.remove(stats)
+
+
+# pylint: disable=unused-argument,too-many-arguments,too-many-positional-arguments
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info['query_started_at'] = perf_counter()
+
+
+# pylint: disable=unused-argument,too-many-arguments,too-many-positional-arguments
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    duration = perf_counter() - conn.info.pop('query_started_at', perf_counter())
+
+    query_duration.observe(duration)
+
+    stats = _current.get()
+    if stats is not None:
+        stats.add(duration)
+
+    for counter in _counters:
+        counter.add(duration)
@@ -1,2 +1,9 @@
+from .device_capability import DeviceCapability
+from .lease import Lease
 from .relay import Relay
-from .settings import Settings
+from .relay_state import RelayState
+from .relay_usage import PERIODS, RelayUsage
+from .settings import Settings, SettingsSnapshot
+from .telemetry import TELEMETRY_INDEXES
+from .telemetry_rollup import RESOLUTIONS, TelemetryRollup
+from .zone import Zone
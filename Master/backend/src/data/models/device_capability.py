@@ -0,0 +1,16 @@
+from typing import Optional
+
+from sqlmodel import SQLModel, Field, Index
+
+
+class DeviceCapability(SQLModel, table=True):
+    __table_args__ = (
+        Index('ix_device_capability_capability_device_id', 'capability', 'device_id'),
+    )
+
+    device_id  : str = Field(primary_key=True, foreign_key='device.id', ondelete='CASCADE', description='Device having the capability')
+    capability : str = Field(primary_key=True, description='Capability of the device (e.g., temperature, action_relay)')
+
+    @staticmethod
+    def parse(capabilities: Optional[str]) -> list[str]:
+        return list(dict.fromkeys(capability.strip() for capability in capabilities.split(',') if capability.strip())) if capabilities else []
@@ -0,0 +1,9 @@
+from datetime import datetime
+
+from sqlmodel import SQLModel, Field
+
+
+class Lease(SQLModel, table=True):
+    name       : str      = Field(primary_key=True, description='Name of the leased role (e.g., leader)')
+    holder     : str      = Field(description='Process currently holding the lease')
+    expires_at : datetime = Field(description='Timestamp after which the lease may be taken over by another process')
@@ -1,10 +1,14 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlmodel import SQLModel, Field
+from sqlmodel import SQLModel, Field, Index
 
 
 class Relay(SQLModel, table=True):
+    __table_args__ = (
+        Index('ix_relay_device_id_timestamp', 'device_id', 'timestamp'),
+    )
+
     id        : Optional[int] = Field(primary_key=True, default=None)
     device_id : str           = Field(foreign_key='device.id', ondelete='CASCADE', description='Device controlling the relay')
     timestamp : datetime      = Field(description='Timestamp of the relay state change')
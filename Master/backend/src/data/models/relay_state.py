@@ -0,0 +1,9 @@
+from datetime import datetime
+
+from sqlmodel import SQLModel, Field
+
+
+class RelayState(SQLModel, table=True):
+    device_id : str      = Field(primary_key=True, foreign_key='device.id', ondelete='CASCADE', description='Device controlling the relay')
+    timestamp : datetime = Field(description='Timestamp of the latest relay state transition')
+    state     : int      = Field(description='Current relay state: 0 for off, 1 for on')
@@ -0,0 +1,21 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlmodel import SQLModel, Field, UniqueConstraint
+
+PERIODS: dict[str, int] = {
+    'hour' : 3600,
+    'day'  : 86400,
+}
+
+
+class RelayUsage(SQLModel, table=True):
+    __table_args__ = (
+        UniqueConstraint('device_id', 'period', 'bucket', name='uq_relay_usage'),
+    )
+
+    id         : Optional[int] = Field(primary_key=True, default=None)
+    device_id  : str           = Field(foreign_key='device.id', ondelete='CASCADE', description='Device controlling the relay')
+    period     : str           = Field(description='Aggregation period (e.g., hour, day)')
+    bucket     : datetime      = Field(description='Start of the aggregation period')
+    on_seconds : float         = Field(default=0.0, description='Number of seconds the relay was on during the period')
@@ -1,3 +1,6 @@
+from dataclasses import dataclass, replace
+from typing import Optional
+
 from sqlmodel import SQLModel, Field
 
 
@@ -6,3 +9,22 @@ class Settings(SQLModel, table=True):
     threshold_on      : float = Field(default=17.5, description='Temperature threshold to turn heating on')
     threshold_off     : float = Field(default=18.5, description='Temperature threshold to turn heating off')
     decision_strategy : str   = Field(default='min', description='Strategy for heating decision (e.g., min, avg)')
+
+
+@dataclass(frozen=True)
+class SettingsSnapshot:
+    threshold_on      : float
+    threshold_off     : float
+    decision_strategy : str
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> 'SettingsSnapshot':
+        return cls(threshold_on=settings.threshold_on, threshold_off=settings.threshold_off, decision_strategy=settings.decision_strategy)
+
+    def with_overrides(self, threshold_on: Optional[float] = None, threshold_off: Optional[float] = None, decision_strategy: Optional[str] = None) -> 'SettingsSnapshot':
+        return replace(
+            self,
+            threshold_on=self.threshold_on if threshold_on is None else threshold_on,
+            threshold_off=self.threshold_off if threshold_off is None else threshold_off,
+            decision_strategy=decision_strategy or self.decision_strategy,
+        )
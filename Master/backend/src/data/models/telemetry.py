@@ -0,0 +1,8 @@
+from esparkcore.data.models import Telemetry
+from sqlmodel import Index
+
+# Telemetry is declared by espark-core, so the composite index of its hot lookups is attached to the shared table here
+TELEMETRY_INDEXES: tuple[Index, ...] = (
+    # pylint: disable=no-member
+    Index('ix_telemetry_device_id_data_type_timestamp', Telemetry.device_id, Telemetry.data_type, Telemetry.timestamp),
+)
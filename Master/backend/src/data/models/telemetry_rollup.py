@@ -0,0 +1,30 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlmodel import SQLModel, Field, UniqueConstraint
+
+RESOLUTIONS: tuple[int, ...] = (
+    300,
+    3600,
+    86400,
+)
+
+
+class TelemetryRollup(SQLModel, table=True):
+    __table_args__ = (
+        UniqueConstraint('device_id', 'resolution', 'bucket', 'data_type', name='uq_telemetry_rollup'),
+    )
+
+    id         : Optional[int] = Field(primary_key=True, default=None)
+    device_id  : str           = Field(foreign_key='device.id', ondelete='CASCADE', description='Device that sent the data')
+    data_type  : str           = Field(description='Type of the data (e.g., motion, temperature)')
+    resolution : int           = Field(description='Width of the bucket in seconds (e.g., 300, 3600, 86400)')
+    bucket     : datetime      = Field(description='Start of the bucket')
+    min_value  : int           = Field(description='Minimum value within the bucket')
+    max_value  : int           = Field(description='Maximum value within the bucket')
+    sum_value  : int           = Field(description='Sum of the values within the bucket')
+    count      : int           = Field(description='Number of values within the bucket')
+
+    @property
+    def avg_value(self) -> float:
+        return self.sum_value / self.count if self.count else 0.0
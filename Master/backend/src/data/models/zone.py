@@ -0,0 +1,17 @@
+from typing import Optional
+
+from sqlmodel import SQLModel, Field
+
+
+class Zone(SQLModel, table=True):
+    id                : Optional[int]   = Field(primary_key=True, default=None)
+    name              : str             = Field(index=True, unique=True, description='Name of the heating zone')
+    actuator_id       : str             = Field(foreign_key='device.id', ondelete='CASCADE', index=True, description='Relay device heating the zone')
+    sensor_ids        : Optional[str]   = Field(default=None, description='Comma separated temperature sensor device IDs of the zone, or all sensors if empty')
+    threshold_on      : Optional[float] = Field(default=None, description='Zone-specific temperature threshold to turn heating on')
+    threshold_off     : Optional[float] = Field(default=None, description='Zone-specific temperature threshold to turn heating off')
+    decision_strategy : Optional[str]   = Field(default=None, description='Zone-specific strategy for heating decision (e.g., min, avg)')
+
+    def get_sensor_ids(self) -> Optional[list[str]]:
+        # pylint: disable=no-member
+        return [sensor_id.strip() for sensor_id in self.sensor_ids.split(',') if sensor_id.strip()] if self.sensor_ids else None
@@ -1,2 +1,7 @@
+from .device_repository import DeviceRepository
+from .lease_repository import LeaseRepository
 from .relay_repository import RelayRepository
 from .settings_repository import SettingsRepository
+from .telemetry_repository import TelemetryRepository
+from .telemetry_rollup_repository import TelemetryRollupRepository
+from .zone_repository import ZoneRepository
@@ -0,0 +1,54 @@
+from typing import Sequence
+
+from esparkcore.data.models import Device
+from esparkcore.data.repositories import DeviceRepository as BaseDeviceRepository
+from sqlalchemy import delete, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from ..models import DeviceCapability, RelayState, RelayUsage, TelemetryRollup, Zone
+
+
+class DeviceRepository(BaseDeviceRepository):
+    async def add(self, session: AsyncSession, entity: Device) -> Device:
+        await self.stage_capabilities(session, entity)
+
+        return await super().add(session, entity)
+
+    async def update(self, session: AsyncSession, entity: Device, **kwargs) -> Device:
+        for key, value in kwargs.items():
+            setattr(entity, key, value)
+
+        if inspect(entity).attrs.capabilities.history.has_changes():
+            await self.stage_capabilities(session, entity)
+
+        return await super().update(session, entity)
+
+    async def delete(self, session: AsyncSession, entity: Device) -> None:
+        # SQLite does not enforce foreign keys unless asked to, so the rows referencing the device are removed explicitly
+        # pylint: disable=no-member
+        for model, column in ((DeviceCapability, DeviceCapability.device_id), (RelayState, RelayState.device_id), (RelayUsage, RelayUsage.device_id), (TelemetryRollup, TelemetryRollup.device_id), (Zone, Zone.actuator_id)):
+            await session.execute(delete(model).where(column == entity.id))
+
+        await super().delete(session, entity)
+
+    async def list_by_capability(self, session: AsyncSession, capability: str) -> Sequence[Device]:
+        # pylint: disable=no-member
+        query = select(Device).join(DeviceCapability, DeviceCapability.device_id == Device.id).where(DeviceCapability.capability == capability)
+
+        return (await session.execute(query)).scalars().all()
+
+    async def list_capabilities(self, session: AsyncSession) -> dict[str, list[str]]:
+        capabilities: dict[str, list[str]] = {}
+
+        for device_capability in (await session.execute(select(DeviceCapability))).scalars().all():
+            capabilities.setdefault(device_capability.capability, []).append(device_capability.device_id)
+
+        return capabilities
+
+    async def stage_capabilities(self, session: AsyncSession, entity: Device) -> None:
+        # pylint: disable=no-member
+        await session.execute(delete(DeviceCapability).where(DeviceCapability.device_id == entity.id))
+
+        for capability in DeviceCapability.parse(entity.capabilities):
+            session.add(DeviceCapability(device_id=entity.id, capability=capability))
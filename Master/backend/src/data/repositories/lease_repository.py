@@ -0,0 +1,31 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import and_, or_, update
+
+from ..models import Lease
+
+
+class LeaseRepository:
+    async def acquire(self, session: AsyncSession, name: str, holder: str, ttl: float, now: Optional[datetime] = None) -> bool:
+        now        = now or datetime.now(timezone.utc)
+        expires_at = now + timedelta(seconds=ttl)
+
+        # Taking over and renewing is a single conditional upsert, so concurrent processes cannot both win
+        statement = insert(Lease).values(name=name, holder=holder, expires_at=expires_at)
+        statement = statement.on_conflict_do_update(index_elements=[Lease.name], set_={
+            'holder'     : statement.excluded.holder,
+            'expires_at' : statement.excluded.expires_at,
+        }, where=or_(Lease.holder == holder, Lease.expires_at < now))
+
+        result = await session.execute(statement)
+        await session.commit()
+
+        return result.rowcount == 1
+
+    async def release(self, session: AsyncSession, name: str, holder: str, now: Optional[datetime] = None) -> None:
+        # pylint: disable=no-member
+        await session.execute(update(Lease).where(and_(Lease.name == name, Lease.holder == holder)).values(expires_at=now or datetime.now(timezone.utc)))
+        await session.commit()
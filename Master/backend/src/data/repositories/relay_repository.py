@@ -1,27 +1,129 @@
-from datetime import datetime
-from typing import Optional, Sequence
+from datetime import datetime, timezone
+from typing import Iterable, Optional, Sequence
 
 from esparkcore.data.repositories.base_repository import AsyncRepository
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import and_
+from sqlmodel import and_, select
 
-from ..models import Relay
+from ...utils import as_utc
+from ..models import PERIODS, Relay, RelayState, RelayUsage
 
 
 class RelayRepository(AsyncRepository[Relay]):
     def __init__(self):
         super().__init__(Relay)
 
+    async def get_current(self, session: AsyncSession, device_id: str) -> Optional[RelayState]:
+        return await session.get(RelayState, device_id)
+
     async def get_current_state(self, session: AsyncSession, device_id: str) -> Optional[int]:
-        # pylint: disable=no-member,unexpected-keyword-arg
-        results = await self.list(session, Relay.device_id == device_id, order_by=Relay.timestamp.desc(), limit=1)
-        return results[0].state if results else None
+        current = await self.get_current(session, device_id)
+        return current.state if current else None
 
     async def get_latest(self, session: AsyncSession, device_id: str) -> Optional[Relay]:
         # pylint: disable=no-member,unexpected-keyword-arg
         results = await self.list(session, Relay.device_id == device_id, order_by=Relay.timestamp.desc(), limit=1)
         return results[0] if results else None
 
+    async def list_current(self, session: AsyncSession, device_ids: Iterable[str]) -> Sequence[RelayState]:
+        device_ids = list(device_ids)
+        if not device_ids:
+            return []
+
+        # pylint: disable=no-member
+        return (await session.execute(select(RelayState).where(RelayState.device_id.in_(device_ids)))).scalars().all()
+
     async def list_recent(self, session: AsyncSession, device_id: str, since: datetime) -> Sequence[Relay]:
         # pylint: disable=no-member
         return await self.list(session, and_(Relay.device_id == device_id, Relay.timestamp >= since), order_by=Relay.timestamp.desc())
+
+    async def list_usage(self, session: AsyncSession, device_id: str, period: str, since: datetime, now: Optional[datetime] = None) -> Sequence[RelayUsage]:
+        now   = now or datetime.now(timezone.utc)
+        since = _floor(as_utc(since), PERIODS[period])
+
+        # pylint: disable=no-member
+        query  = select(RelayUsage).where(and_(RelayUsage.device_id == device_id, RelayUsage.period == period, RelayUsage.bucket >= since)).order_by(RelayUsage.bucket)
+        usages = {as_utc(usage.bucket): usage for usage in (await session.execute(query)).scalars().all()}
+
+        # The ongoing on-period is only aggregated at the next transition, so it is added on the fly
+        current = await session.get(RelayState, device_id)
+        if current and current.state == 1:
+            for bucket, seconds in _split(max(as_utc(current.timestamp), since), now, PERIODS[period]):
+                usage = usages.get(bucket)
+                if usage is None:
+                    usages[bucket] = RelayUsage(device_id=device_id, period=period, bucket=bucket, on_seconds=seconds)
+                else:
+                    usages[bucket] = RelayUsage(id=usage.id, device_id=device_id, period=period, bucket=bucket, on_seconds=usage.on_seconds + seconds)
+
+        return [usages[bucket] for bucket in sorted(usages)]
+
+    async def record_transition(self, session: AsyncSession, device_id: str, state: int, timestamp: datetime) -> RelayState:
+        current = await session.get(RelayState, device_id)
+        if current and current.state == state:
+            return current
+
+        if current is None:
+            current = RelayState(device_id=device_id)
+        elif current.state == 1:
+            await self._add_usage(session, device_id, as_utc(current.timestamp), timestamp)
+
+        current.timestamp = timestamp
+        current.state     = state
+
+        session.add(Relay(device_id=device_id, timestamp=timestamp, state=state))
+        session.add(current)
+
+        return current
+
+    async def sync_current(self, session: AsyncSession, device_id: str) -> Optional[RelayState]:
+        # Relay rows written outside of record_transition only move the current state to the latest of them
+        latest  = await self.get_latest(session, device_id)
+        current = await session.get(RelayState, device_id)
+
+        if latest is None:
+            if current is not None:
+                await session.delete(current)
+
+            return None
+
+        if current is None:
+            current = RelayState(device_id=device_id)
+
+        current.timestamp = latest.timestamp
+        current.state     = latest.state
+
+        session.add(current)
+
+        return current
+
+    async def _add_usage(self, session: AsyncSession, device_id: str, start: datetime, end: datetime) -> None:
+        for period, width in PERIODS.items():
+            for bucket, seconds in _split(start, end, width):
+                # pylint: disable=no-member
+                usage = (await session.execute(select(RelayUsage).where(and_(RelayUsage.device_id == device_id, RelayUsage.period == period, RelayUsage.bucket == bucket)))).scalars().first()
+                if usage is None:
+                    usage = RelayUsage(device_id=device_id, period=period, bucket=bucket)
+
+                usage.on_seconds = (usage.on_seconds or 0.0) + seconds
+
+                session.add(usage)
+
+
+def _floor(timestamp: datetime, width: int) -> datetime:
+    seconds = timestamp.timestamp()
+    return datetime.fromtimestamp(seconds - seconds % width, timezone.utc)
+
+
+def _split(start: datetime, end: datetime, width: int) -> list[tuple[datetime, float]]:
+    results = []
+    bucket  = _floor(start, width)
+
+    while bucket < end:
+        bucket_end = datetime.fromtimestamp(bucket.timestamp() + width, timezone.utc)
+        seconds    = (min(end, bucket_end) - max(start, bucket)).total_seconds()
+        if seconds > 0:
+            results.append((bucket, seconds))
+
+        bucket = bucket_end
+
+    return results
@@ -0,0 +1,78 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Iterable, Optional, Sequence
+
+from esparkcore.data.models import Telemetry
+from esparkcore.data.repositories import TelemetryRepository as BaseTelemetryRepository
+from sqlalchemy import Row, func, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import and_, select
+
+from ..functions import epoch_bucket
+
+
+class TelemetryRepository(BaseTelemetryRepository):
+    async def add_all(self, session: AsyncSession, telemetries: Sequence[Telemetry]) -> None:
+        if not telemetries:
+            return
+
+        # pylint: disable=no-member
+        query = insert(Telemetry).values([{
+            'device_id' : telemetry.device_id,
+            'timestamp' : telemetry.timestamp,
+            'data_type' : telemetry.data_type,
+            'value'     : telemetry.value,
+        } for telemetry in telemetries]).returning(Telemetry.id, Telemetry.device_id, Telemetry.timestamp, Telemetry.data_type, Telemetry.value)
+
+        rows = (await session.execute(query)).all()
+
+        # SQLite does not guarantee the order of returned rows, so generated ids are matched back by content
+        pending: dict[tuple, list[Telemetry]] = defaultdict(list)
+        for telemetry in telemetries:
+            pending[_key(telemetry.device_id, telemetry.timestamp, telemetry.data_type, telemetry.value)].append(telemetry)
+
+        # A row stored differently from its buffered value is left without an id, instead of failing the whole batch
+        for row in rows:
+            matches = pending.get(_key(row.device_id, row.timestamp, row.data_type, row.value))
+            if matches:
+                matches.pop().id = row.id
+
+        await session.commit()
+
+    async def list_latest(self, session: AsyncSession, data_type: Optional[str] = None, device_ids: Optional[Iterable[str]] = None) -> Sequence[Telemetry]:
+        # pylint: disable=no-member,not-callable
+        latest = select(Telemetry.device_id, Telemetry.data_type, func.max(Telemetry.timestamp).label('timestamp'))
+
+        if data_type is not None:
+            latest = latest.where(Telemetry.data_type == data_type)
+
+        if device_ids is not None:
+            device_ids = list(device_ids)
+            if not device_ids:
+                return []
+
+            latest = latest.where(Telemetry.device_id.in_(device_ids))
+
+        latest = latest.group_by(Telemetry.device_id, Telemetry.data_type).subquery()
+        query  = select(Telemetry).join(latest, and_(Telemetry.device_id == latest.c.device_id, Telemetry.data_type == latest.c.data_type, Telemetry.timestamp == latest.c.timestamp))
+
+        results: dict[tuple[str, str], Telemetry] = {}
+
+        # Rows sharing the same latest timestamp are collapsed, keeping the most recently inserted one
+        for telemetry in (await session.execute(query)).scalars().all():
+            key = (telemetry.device_id, telemetry.data_type)
+            if key not in results or results[key].id < telemetry.id:
+                results[key] = telemetry
+
+        return list(results.values())
+
+    async def list_series(self, session: AsyncSession, device_ids: Iterable[str], data_type: str, since: datetime, until: datetime, width: int) -> Sequence[Row]:
+        # pylint: disable=no-member,not-callable
+        bucket = epoch_bucket(Telemetry.timestamp, width)
+        query  = select(Telemetry.device_id, bucket, func.min(Telemetry.value), func.max(Telemetry.value), func.sum(Telemetry.value), func.count()).where(and_(Telemetry.device_id.in_(list(device_ids)), Telemetry.data_type == data_type, Telemetry.timestamp >= since, Telemetry.timestamp < until)).group_by(Telemetry.device_id, bucket)
+
+        return (await session.execute(query)).all()
+
+
+def _key(device_id: str, timestamp: datetime, data_type: str, value: int) -> tuple:
+    return device_id, timestamp.replace(tzinfo=None), data_type, value
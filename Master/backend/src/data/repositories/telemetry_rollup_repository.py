@@ -0,0 +1,87 @@
+from datetime import datetime, timezone
+from typing import Iterable, Optional, Sequence
+
+from esparkcore.data.models import Telemetry
+from esparkcore.data.repositories import AsyncRepository
+from sqlalchemy import Row, delete, func
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import and_, select
+
+from ..functions import epoch_bucket
+from ...utils import as_utc
+from ..models import RESOLUTIONS, TelemetryRollup
+
+
+class TelemetryRollupRepository(AsyncRepository[TelemetryRollup]):
+    def __init__(self):
+        super().__init__(TelemetryRollup)
+
+    async def list_range(self, session: AsyncSession, device_id: str, resolution: int, since: datetime, until: Optional[datetime] = None, data_type: Optional[str] = None) -> Sequence[TelemetryRollup]:
+        # pylint: disable=no-member
+        conditions = [TelemetryRollup.device_id == device_id, TelemetryRollup.resolution == resolution, TelemetryRollup.bucket >= since]
+
+        if until is not None:
+            conditions.append(TelemetryRollup.bucket < until)
+
+        if data_type is not None:
+            conditions.append(TelemetryRollup.data_type == data_type)
+
+        return await self.list(session, and_(*conditions), order_by=TelemetryRollup.bucket.desc())
+
+    async def list_series(self, session: AsyncSession, device_ids: Iterable[str], data_type: str, resolution: int, since: datetime, until: datetime, width: int) -> Sequence[Row]:
+        # pylint: disable=no-member,not-callable
+        bucket = epoch_bucket(TelemetryRollup.bucket, width)
+        query  = select(TelemetryRollup.device_id, bucket, func.min(TelemetryRollup.min_value), func.max(TelemetryRollup.max_value), func.sum(TelemetryRollup.sum_value), func.sum(TelemetryRollup.count)).where(and_(TelemetryRollup.device_id.in_(list(device_ids)), TelemetryRollup.data_type == data_type, TelemetryRollup.resolution == resolution, TelemetryRollup.bucket >= since, TelemetryRollup.bucket < until)).group_by(TelemetryRollup.device_id, bucket)
+
+        return (await session.execute(query)).all()
+
+    async def rollup(self, session: AsyncSession, cutoff: datetime, batch_size: int) -> int:
+        # The latest reading of every device and data type is kept, so latest-value lookups survive the retention
+        # pylint: disable=no-member,not-callable
+        latest = select(func.max(Telemetry.id)).group_by(Telemetry.device_id, Telemetry.data_type)
+        query  = select(Telemetry).where(and_(Telemetry.timestamp < cutoff, Telemetry.id.not_in(latest))).order_by(Telemetry.id).limit(batch_size)
+        rows   = (await session.execute(query)).scalars().all()
+        if not rows:
+            return 0
+
+        buckets: dict[tuple[str, str, int, datetime], dict[str, int]] = {}
+
+        for telemetry in rows:
+            seconds = as_utc(telemetry.timestamp).timestamp()
+
+            for resolution in RESOLUTIONS:
+                key   = (telemetry.device_id, telemetry.data_type, resolution, datetime.fromtimestamp(seconds - seconds % resolution, timezone.utc))
+                value = buckets.get(key)
+
+                if value is None:
+                    buckets[key] = {
+                        'min_value' : telemetry.value,
+                        'max_value' : telemetry.value,
+                        'sum_value' : telemetry.value,
+                        'count'     : 1,
+                    }
+                else:
+                    value['min_value']  = min(value['min_value'], telemetry.value)
+                    value['max_value']  = max(value['max_value'], telemetry.value)
+                    value['sum_value'] += telemetry.value
+                    value['count']     += 1
+
+        statement = insert(TelemetryRollup).values([{
+            'device_id'  : device_id,
+            'data_type'  : data_type,
+            'resolution' : resolution,
+            'bucket'     : bucket,
+            **value,
+        } for (device_id, data_type, resolution, bucket), value in buckets.items()])
+
+        await session.execute(statement.on_conflict_do_update(index_elements=['device_id', 'resolution', 'bucket', 'data_type'], set_={
+            'min_value' : func.min(TelemetryRollup.min_value, statement.excluded.min_value),
+            'max_value' : func.max(TelemetryRollup.max_value, statement.excluded.max_value),
+            'sum_value' : TelemetryRollup.sum_value + statement.excluded.sum_value,
+            'count'     : TelemetryRollup.count + statement.excluded.count,
+        }))
+
+        await session.execute(delete(Telemetry).where(Telemetry.id.in_([telemetry.id for telemetry in rows])))
+
+        return len(rows)
@@ -0,0 +1,8 @@
+from esparkcore.data.repositories import AsyncRepository
+
+from ..models import Zone
+
+
+class ZoneRepository(AsyncRepository[Zone]):
+    def __init__(self):
+        super().__init__(Zone)
@@ -1,22 +1,23 @@
-from asyncio import create_task
+from asyncio import Task, create_task
 from contextlib import asynccontextmanager
 from os import getenv, path
 
-from esparkcore.data.repositories import AppVersionRepository, DeviceRepository, NotificationRepository, TelemetryRepository, TriggerRepository
+from esparkcore.data.models import Telemetry
+from esparkcore.data.repositories import AppVersionRepository, NotificationRepository, TriggerRepository
 from esparkcore.data import init_db
-from esparkcore.routers import AppVersionRouter, DeviceRouter, NotificationRouter, TelemetryRouter, TriggerRouter
+from esparkcore.routers import AppVersionRouter, NotificationRouter
+from esparkcore.routers.base_router import BaseRouter
 from esparkcore.schedules import start_scheduler
-from esparkcore.services import MQTTManager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from sentry_sdk import init
 
-from .data.repositories import RelayRepository, SettingsRepository
-from .data import init_settings
-from .routers import RelayRouter, SettingsRouter
-from .schedules import evaluate, process_outbox
-from .utils import AppConfig
+from .data.repositories import DeviceRepository, RelayRepository, SettingsRepository, TelemetryRepository, ZoneRepository
+from .data import get_request_session, init_capabilities, init_indexes, init_relays, init_settings
+from .routers import DeviceRouter, EventRouter, MetricsRouter, RelayRouter, SettingsRouter, TelemetryRouter, TriggerRouter, ZoneRouter
+from .schedules import evaluate, process_outbox, rollup_telemetry
+from .services import Debouncer, MQTTManager, ServerTimingMiddleware, capability_cache, event_bridge, event_bus, ingest_buffer, instrument_job, leader_election, outbox_dispatcher, refresh_tracker, settings_cache, telemetry_cache, trigger_cache
+from .utils import AppConfig, ETagMiddleware, SpaStaticFiles
 
 app_config        = AppConfig()
 device_repo       = DeviceRepository()
@@ -25,43 +26,120 @@ telemetry_repo    = TelemetryRepository()
 trigger_repo      = TriggerRepository()
 version_repo      = AppVersionRepository()
 
+evaluation_trigger = Debouncer(instrument_job('evaluation_job', evaluate), app_config.heating_evaluation_debounce, app_config.heating_evaluation_min_spacing)
 
-class SpaStaticFiles(StaticFiles):
-    # pylint: disable=redefined-outer-name
-    def lookup_path(self, path: str):
-        full_path, stat_result = super().lookup_path(path)
-        if stat_result is None:
-            full_path, stat_result = super().lookup_path('index.html')
-        return full_path, stat_result
+
+def _on_telemetry(telemetry: Telemetry) -> None:
+    if telemetry.data_type == 'temperature':
+        evaluation_trigger.notify()
+
+
+def _publish_telemetry(telemetry: Telemetry) -> None:
+    event_bus.publish('telemetry', telemetry.device_id, {
+        'device_id' : telemetry.device_id,
+        'data_type' : telemetry.data_type,
+        'value'     : telemetry.value,
+        'timestamp' : telemetry.timestamp.isoformat(),
+    })
+
+
+async def _refresh_caches() -> None:
+    etag = settings_cache.etag
+
+    # Writes served by other worker processes only invalidate their own caches
+    settings_cache.invalidate()
+    capability_cache.invalidate()
+    trigger_cache.invalidate()
+
+    # Settings written through another worker reach the event streams served by this one on the next refresh
+    settings = await settings_cache.get_settings()
+    if etag is not None and settings is not None and settings_cache.etag != etag:
+        event_bus.publish('settings', None, settings.model_dump(mode='json'))
+
+    # Only the leader ingests telemetry, so the other workers reload the latest readings from the database
+    if not leader_election.is_leader:
+        await telemetry_cache.warm()
 
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
     await init_db()
+    await init_indexes()
     await init_settings()
+    await init_relays()
+    await init_capabilities()
+    await telemetry_cache.warm()
 
     scheduler = await start_scheduler()
-    scheduler.add_job(evaluate, 'interval', minutes=app_config.heating_evaluation_interval, id='evaluation_job', replace_existing=True)
-    scheduler.add_job(process_outbox, 'interval', minutes=app_config.heating_evaluation_interval, id='outbox_consumer_job', replace_existing=True)
+    scheduler.add_job(leader_election.guard(evaluation_trigger.run), 'interval', minutes=app_config.heating_evaluation_interval, id='evaluation_job', replace_existing=True)
+    scheduler.add_job(leader_election.guard(instrument_job('outbox_consumer_job', process_outbox)), 'interval', minutes=app_config.heating_evaluation_interval, id='outbox_consumer_job', replace_existing=True)
+    scheduler.add_job(leader_election.guard(instrument_job('telemetry_rollup_job', rollup_telemetry)), 'interval', minutes=app_config.telemetry_rollup_interval, id='telemetry_rollup_job', replace_existing=True)
+    scheduler.add_job(_refresh_caches, 'interval', seconds=app_config.cache_refresh_interval, id='cache_refresh_job', replace_existing=True)
+
+    mqtt_manager = MQTTManager(version_repo=version_repo, device_repo=device_repo, notification_repo=notification_repo, telemetry_repo=telemetry_repo, trigger_repo=trigger_repo)
+    mqtt_manager.add_listener(_publish_telemetry)
+    if app_config.heating_evaluation_mode == 'event':
+        mqtt_manager.add_listener(_on_telemetry)
+
+    tasks: list[Task] = []
 
-    create_task(MQTTManager(version_repo=version_repo, device_repo=device_repo, notification_repo=notification_repo, telemetry_repo=telemetry_repo, trigger_repo=trigger_repo).start())
+    # The leader publishes events as it ingests and switches, while the others relay them from MQTT for their own event streams
+    event_bridge.add_listener(_publish_telemetry)
+
+    async def on_acquired() -> None:
+        await event_bridge.close()
+        await telemetry_cache.warm()
+
+        ingest_buffer.start()
+        outbox_dispatcher.start()
+        tasks.append(create_task(mqtt_manager.start()))
+
+    async def on_released() -> None:
+        for task in tasks:
+            task.cancel()
+
+        tasks.clear()
+
+        await ingest_buffer.close()
+        await evaluation_trigger.close()
+        await outbox_dispatcher.close()
+
+        # A later leadership starts from the retained states, which the new leader may have refreshed meanwhile
+        refresh_tracker.reset()
+
+        event_bridge.start()
+
+    # Only the process holding the lease ingests MQTT messages and runs jobs, the others serve HTTP and relay events only
+    leader_election.add_listener(on_acquired, on_released)
+    event_bridge.start()
+    leader_election.start()
 
     yield
 
+    await leader_election.close()
+    await event_bridge.close()
+
 
 init(dsn=getenv('SENTRY_DSN'))
 
 app = FastAPI(title='Espartan API', version='v1', lifespan=lifespan)
+# pylint: disable=protected-access
+app.dependency_overrides[BaseRouter._get_session] = get_request_session
 
 app.include_router(AppVersionRouter(version_repo).router)
 app.include_router(DeviceRouter(device_repo).router)
+app.include_router(EventRouter().router)
+app.include_router(MetricsRouter().router)
 app.include_router(NotificationRouter().router)
 app.include_router(RelayRouter(RelayRepository()).router)
 app.include_router(SettingsRouter(SettingsRepository()).router)
 app.include_router(TelemetryRouter(telemetry_repo).router)
-app.include_router(TriggerRouter().router)
+app.include_router(TriggerRouter(trigger_repo).router)
+app.include_router(ZoneRouter(ZoneRepository()).router)
 
-app.add_middleware(CORSMiddleware, expose_headers=['X-Total-Count'], allow_headers=['*'], allow_methods=['*'], allow_origins=['*'])
+app.add_middleware(ETagMiddleware, paths=('/api/v1/devices',))
+app.add_middleware(ServerTimingMiddleware)
+app.add_middleware(CORSMiddleware, expose_headers=['ETag', 'Last-Modified', 'Server-Timing', 'X-Total-Count'], allow_headers=['*'], allow_methods=['*'], allow_origins=['*'])
 
 if app_config.environment != 'dev':
     app.mount('/web', SpaStaticFiles(directory=path.join(path.dirname(__file__), '..', 'web'), html=True), name='web')
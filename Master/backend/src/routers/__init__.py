@@ -1,2 +1,8 @@
+from .device import DeviceRouter
+from .events import EventRouter
+from .metrics import MetricsRouter
 from .relay import RelayRouter
 from .settings import SettingsRouter
+from .telemetry import TelemetryRouter
+from .trigger import TriggerRouter
+from .zone import ZoneRouter
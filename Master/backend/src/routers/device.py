@@ -0,0 +1,82 @@
+from json import dumps
+from os import getenv
+from time import time_ns
+
+from aiomqtt import Client
+from esparkcore.constants import ENV_MQTT_HOST, ENV_MQTT_PORT, TOPIC_DEVICE
+from esparkcore.data.models import Device
+from esparkcore.routers import DeviceRouter as BaseDeviceRouter
+from esparkcore.utils import log_debug
+from fastapi import Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..data.repositories import DeviceRepository
+from ..services import capability_cache, refresh_tracker, telemetry_cache
+
+
+class DeviceRouter(BaseDeviceRouter):
+    def __init__(self, repo: DeviceRepository = None) -> None:
+        super().__init__(repo or DeviceRepository())
+
+    async def _after_add(self, entity: Device, session: AsyncSession) -> None:
+        await super()._after_add(entity, session)
+
+        capability_cache.invalidate()
+
+    async def _before_delete(self, entity: Device, session: AsyncSession) -> None:
+        await super()._before_delete(entity, session)
+
+        session.info['device_id'] = entity.id
+
+    async def _after_delete(self, entity: Device, session: AsyncSession) -> None:
+        await super()._after_delete(entity, session)
+
+        capability_cache.invalidate()
+        refresh_tracker.remove(session.info.pop('device_id'))
+
+    async def _before_update(self, entity: Device, data: dict, session: AsyncSession) -> None:
+        await super()._before_update(entity, data, session)
+
+        # The cache is only invalidated once the update commits, so a concurrent reload cannot keep the old capabilities
+        session.info['capabilities_changed'] = 'capabilities' in data and data['capabilities'] != entity.capabilities
+
+    async def _after_update(self, entity: Device, session: AsyncSession) -> None:
+        await super()._after_update(entity, session)
+
+        if session.info.pop('capabilities_changed', False):
+            capability_cache.invalidate()
+
+    async def _publish_update(self, entity: Device) -> None:
+        # Nodes cache their parameters across wakes, and only apply retained parameters with a newer version
+        parameters = {**entity.parameters, 'version': time_ns() // 1_000_000} if entity.parameters else None
+
+        log_debug(f'Publishing parameters update for device {entity.id}: {parameters}')
+
+        async with Client(getenv(ENV_MQTT_HOST, 'localhost'), int(getenv(ENV_MQTT_PORT, '1883'))) as client:
+            await client.publish(f'{TOPIC_DEVICE}/{entity.id}', payload=dumps(parameters) if parameters else None, qos=1, retain=True)
+
+    def _setup_routes(self) -> None:
+        # Registered ahead of the base route, which looks up the battery level of every device with a query of its own
+        @self.router.get('/all')
+        async def list_all(response: Response, session: AsyncSession = Depends(self._get_session), order_by: str = Query(None), offset: int = Query(0, ge=0), limit: int = Query(10, ge=1, le=100)):
+            response.headers['X-Total-Count'] = str(await self.repo.count(session))
+
+            results = []
+
+            for device in await self.repo.list(session, order_by=order_by, offset=offset, limit=limit):
+                battery = telemetry_cache.get(device.id, 'battery')
+
+                results.append({
+                    'id'           : device.id,
+                    'display_name' : device.display_name,
+                    'app_name'     : device.app_name,
+                    'app_version'  : device.app_version,
+                    'capabilities' : device.capabilities,
+                    'parameters'   : device.parameters,
+                    'last_seen'    : device.last_seen,
+                    'battery'      : battery.value if battery else None,
+                })
+
+            return results
+
+        super()._setup_routes()
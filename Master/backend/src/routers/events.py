@@ -0,0 +1,43 @@
+from asyncio import wait_for
+from json import dumps
+from typing import AsyncIterator, Optional
+
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import StreamingResponse
+
+from ..services import EventBus, event_bus
+from ..utils import AppConfig
+
+app_config = AppConfig()
+
+
+class EventRouter:
+    def __init__(self, bus: EventBus = None) -> None:
+        self.bus    : EventBus  = bus or event_bus
+        self.router : APIRouter = APIRouter(prefix='/api/v1/events', tags=['event'])
+
+        self._setup_routes()
+
+    def _setup_routes(self) -> None:
+        @self.router.get('')
+        async def stream(request: Request, device_id: Optional[list[str]] = Query(None)) -> StreamingResponse:
+            return StreamingResponse(self._stream(request, device_id), media_type='text/event-stream', headers={
+                'Cache-Control'     : 'no-cache',
+                'X-Accel-Buffering' : 'no',
+            })
+
+    async def _stream(self, request: Request, device_ids: Optional[list[str]]) -> AsyncIterator[str]:
+        subscription = self.bus.subscribe(device_ids)
+
+        try:
+            while not await request.is_disconnected():
+                try:
+                    event = await wait_for(subscription.queue.get(), app_config.event_stream_heartbeat)
+                except TimeoutError:
+                    # Comments keep idle connections open through proxies and let disconnects be noticed
+                    yield ': keep-alive\n\n'
+                    continue
+
+                yield f'event: {event.event_type}\ndata: {dumps(event.payload, default=str)}\n\n'
+        finally:
+            self.bus.unsubscribe(subscription)
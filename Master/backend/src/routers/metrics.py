@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Response
+
+from ..utils import MetricsRegistry, metrics_registry
+
+
+class MetricsRouter:
+    def __init__(self, registry: MetricsRegistry = None) -> None:
+        self.registry : MetricsRegistry = registry or metrics_registry
+        self.router   : APIRouter       = APIRouter(tags=['metrics'])
+
+        self._setup_routes()
+
+    def _setup_routes(self) -> None:
+        @self.router.get('/metrics', include_in_schema=False)
+        async def get_metrics() -> Response:
+            return Response(self.registry.render(), media_type='text/plain; version=0.0.4; charset=utf-8')
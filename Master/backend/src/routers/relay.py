@@ -1,10 +1,13 @@
+from datetime import datetime, timedelta, timezone
 from typing import cast
 
 from esparkcore.routers.base_router import BaseRouter
-from fastapi import Depends, HTTPException, Path, status
+from fastapi import Depends, HTTPException, Path, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..data.models import Relay
+from ..data.models import PERIODS, Relay
 from ..data.repositories import RelayRepository
+from ..utils import cache_headers, is_not_modified, make_etag
 
 
 class RelayRouter(BaseRouter):
@@ -13,13 +16,65 @@ class RelayRouter(BaseRouter):
 
         super().__init__(Relay, self.repo, '/api/v1/relays', ['relay'])
 
+    async def _after_add(self, entity: Relay, session: AsyncSession) -> None:
+        await cast(RelayRepository, self.repo).sync_current(session, entity.device_id)
+
+        await super()._after_add(entity, session)
+
+    async def _before_update(self, entity: Relay, data: dict, session: AsyncSession) -> None:
+        await super()._before_update(entity, data, session)
+
+        session.info['relay_device_id'] = entity.device_id
+
+    async def _after_update(self, entity: Relay, session: AsyncSession) -> None:
+        # A row moved to another device changes the current state of both devices
+        for device_id in dict.fromkeys((session.info.pop('relay_device_id', entity.device_id), entity.device_id)):
+            await cast(RelayRepository, self.repo).sync_current(session, device_id)
+
+        await super()._after_update(entity, session)
+
+    async def _before_delete(self, entity: Relay, session: AsyncSession) -> None:
+        await super()._before_delete(entity, session)
+
+        # The deleted row is expired once the delete commits, so its device is kept aside
+        session.info['relay_device_id'] = entity.device_id
+
+    async def _after_delete(self, entity: Relay, session: AsyncSession) -> None:
+        await cast(RelayRepository, self.repo).sync_current(session, session.info.pop('relay_device_id'))
+
+        await super()._after_delete(entity, session)
+
     def _setup_routes(self) -> None:
         super()._setup_routes()
 
         @self.router.get('/current/{device_id}', response_model=int)
-        async def get_current_state(device_id: str = Path(...), session=Depends(BaseRouter._get_session)) -> int:
-            result = await cast(RelayRepository, self.repo).get_current_state(session, device_id)
-            if result is None:
+        async def get_current_state(request: Request, response: Response, device_id: str = Path(...), session=Depends(BaseRouter._get_session)) -> int:
+            current = await cast(RelayRepository, self.repo).get_current(session, device_id)
+            if current is None:
                 raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
 
-            return result
+            # The timestamp of the last transition versions the current state
+            etag    = make_etag(current.device_id, current.state, current.timestamp)
+            headers = cache_headers(etag, current.timestamp)
+
+            if is_not_modified(request, etag, current.timestamp):
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+            response.headers.update(headers)
+
+            return current.state
+
+        @self.router.get('/usage/{device_id}')
+        async def list_usage(response: Response, device_id: str = Path(...), period: str = Query('hour', pattern='^(hour|day)$'), offset: int = Query(86400, ge=0), session=Depends(BaseRouter._get_session)) -> list[dict]:
+            now     = datetime.now(timezone.utc)
+            results = [{
+                'device_id'  : usage.device_id,
+                'period'     : usage.period,
+                'bucket'     : usage.bucket,
+                'on_seconds' : usage.on_seconds,
+                'duty_cycle' : usage.on_seconds / PERIODS[period],
+            } for usage in await cast(RelayRepository, self.repo).list_usage(session, device_id, period, now - timedelta(seconds=offset), now)]
+
+            response.headers['X-Total-Count'] = str(len(results))
+
+            return results
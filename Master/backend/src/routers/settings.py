@@ -1,9 +1,11 @@
 from esparkcore.routers.base_router import BaseRouter
-from fastapi import Depends, HTTPException, Path, status
+from fastapi import Depends, HTTPException, Path, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..data.models import Settings
 from ..data.repositories import SettingsRepository
+from ..services import event_bus, settings_cache
+from ..utils import cache_headers, is_not_modified, make_etag
 
 
 class SettingsRouter(BaseRouter):
@@ -12,14 +14,46 @@ class SettingsRouter(BaseRouter):
 
         super().__init__(Settings, self.repo, '/api/v1/settings', ['settings'])
 
+    async def _after_add(self, entity: Settings, session: AsyncSession) -> None:
+        await super()._after_add(entity, session)
+
+        settings_cache.invalidate()
+        event_bus.publish('settings', None, entity.model_dump(mode='json'))
+
+    async def _after_delete(self, entity: Settings, session: AsyncSession) -> None:
+        await super()._after_delete(entity, session)
+
+        settings_cache.invalidate()
+        event_bus.publish('settings', None, entity.model_dump(mode='json'))
+
+    async def _after_update(self, entity: Settings, session: AsyncSession) -> None:
+        await super()._after_update(entity, session)
+
+        settings_cache.invalidate()
+        event_bus.publish('settings', None, entity.model_dump(mode='json'))
+
     def _setup_routes(self) -> None:
         @self.router.get('/{id}', response_model=Settings)
-        async def get_by_id(id: int = Path(..., gt=0), session: AsyncSession = Depends(BaseRouter._get_session)) -> Settings:
-            # pylint: disable=unexpected-keyword-arg
-            settings = await self.repo.get(session, Settings.id == id)
+        async def get_by_id(request: Request, response: Response, id: int = Path(..., gt=0), session: AsyncSession = Depends(BaseRouter._get_session)) -> Settings:
+            # The settings in use are served from the cache, which also holds their ETag
+            if id == 1:
+                settings = await settings_cache.get_settings()
+                etag     = settings_cache.etag
+            else:
+                # pylint: disable=unexpected-keyword-arg
+                settings = await self.repo.get(session, Settings.id == id)
+                etag     = make_etag(settings.model_dump_json()) if settings else None
+
             if not settings:
                 raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
 
+            headers = cache_headers(etag)
+
+            if is_not_modified(request, etag):
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+            response.headers.update(headers)
+
             return settings
 
         super()._setup_routes()
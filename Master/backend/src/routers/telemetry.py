@@ -0,0 +1,145 @@
+from datetime import datetime, timedelta, timezone
+from typing import Sequence, cast
+
+from esparkcore.data.models import Telemetry
+from esparkcore.data.repositories import DeviceRepository
+from esparkcore.routers import TelemetryRouter as BaseTelemetryRouter
+from fastapi import Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import and_
+
+from ..data.models import RESOLUTIONS
+from ..data.repositories import TelemetryRepository, TelemetryRollupRepository
+from ..services import telemetry_cache
+from ..utils import AppConfig, as_utc
+
+app_config = AppConfig()
+
+
+class TelemetryRouter(BaseTelemetryRouter):
+    def __init__(self, repo: TelemetryRepository = None, rollup_repo: TelemetryRollupRepository = None) -> None:
+        self.rollup_repo : TelemetryRollupRepository = rollup_repo or TelemetryRollupRepository()
+
+        super().__init__(repo or TelemetryRepository())
+
+    async def _after_add(self, entity: Telemetry, session: AsyncSession) -> None:
+        await super()._after_add(entity, session)
+
+        telemetry_cache.put(entity)
+
+    async def _after_update(self, entity: Telemetry, session: AsyncSession) -> None:
+        await super()._after_update(entity, session)
+
+        telemetry_cache.put(entity)
+
+    async def _after_delete(self, entity: Telemetry, session: AsyncSession) -> None:
+        await super()._after_delete(entity, session)
+
+        telemetry_cache.remove(entity)
+
+    def _setup_routes(self) -> None:
+        @self.router.get('/history', response_model=Sequence[Telemetry])
+        async def list_history(response: Response, session: AsyncSession = Depends(self._get_session), device_id: str = Query(..., min_length=1), offset: int = Query(0, min=0)) -> Sequence[Telemetry]:
+            now       = datetime.now(timezone.utc)
+            from_date = now - timedelta(seconds=offset)
+            cutoff    = now - timedelta(days=app_config.telemetry_retention_days)
+            # pylint: disable=no-member
+            results   = list(await self.repo.list(session, and_(Telemetry.device_id == device_id, Telemetry.timestamp >= from_date)))
+
+            # Raw rows older than the retention only survive as rollups, read at a resolution that keeps the response bounded
+            if from_date < cutoff:
+                for rollup in await self.rollup_repo.list_range(session, device_id, _get_resolution(cutoff - from_date), from_date, cutoff):
+                    results.append(Telemetry(device_id=rollup.device_id, timestamp=rollup.bucket, data_type=rollup.data_type, value=round(rollup.avg_value)))
+
+                results.sort(key=lambda result: as_utc(result.timestamp), reverse=True)
+
+            response.headers['X-Total-Count'] = str(len(results))
+
+            return results
+
+        @self.router.get('/series')
+        async def list_series(response: Response, session: AsyncSession = Depends(self._get_session), device_id: list[str] = Query(..., min_length=1), data_type: str = Query(..., min_length=1), offset: int = Query(86400, ge=1), bucket: int = Query(3600, ge=60)) -> list[dict]:
+            if offset / bucket > app_config.telemetry_history_max_points:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Too many buckets requested')
+
+            buckets = _merge_buckets(await self._list_series_rows(session, device_id, data_type, offset, bucket))
+            results = [{
+                'device_id' : key[0],
+                'data_type' : data_type,
+                'bucket'    : datetime.fromtimestamp(key[1], timezone.utc),
+                'min'       : value[0],
+                'avg'       : value[2] / value[3],
+                'max'       : value[1],
+                'count'     : value[3],
+            } for key, value in sorted(buckets.items())]
+
+            response.headers['X-Total-Count'] = str(len(results))
+
+            return results
+
+        @self.router.get('/recent', response_model=Sequence[Telemetry])
+        async def list_recent(response: Response, session: AsyncSession = Depends(self._get_session), offset: int = Query(0, min=0)) -> Sequence[Telemetry]:
+            from_date = datetime.now(timezone.utc) - timedelta(seconds=offset)
+            devices   = await DeviceRepository().list(session)
+            results   = []
+
+            for device in devices:
+                capabilities = device.capabilities.split(',') if device.capabilities else []
+                for data_type in capabilities:
+                    if not data_type.startswith('action_'):
+                        telemetry = telemetry_cache.get(device.id, data_type)
+                        if telemetry and telemetry.timestamp >= from_date:
+                            results.append(telemetry)
+
+            response.headers['X-Total-Count'] = str(len(results))
+
+            results.sort(key=lambda result: result.timestamp, reverse=True)
+
+            return results
+
+        super()._setup_routes()
+
+    async def _list_series_rows(self, session: AsyncSession, device_ids: list[str], data_type: str, offset: int, bucket: int) -> list[tuple]:
+        now       = datetime.now(timezone.utc)
+        from_date = now - timedelta(seconds=offset)
+        cutoff    = now - timedelta(days=app_config.telemetry_retention_days)
+        rows      = list(await cast(TelemetryRepository, self.repo).list_series(session, device_ids, data_type, from_date, now, bucket))
+
+        if from_date < cutoff:
+            rows.extend(await self.rollup_repo.list_series(session, device_ids, data_type, _get_rollup_resolution(bucket), from_date, cutoff, bucket))
+
+        return rows
+
+
+def _merge_buckets(rows: list[tuple]) -> dict[tuple[str, int], list[int]]:
+    buckets: dict[tuple[str, int], list[int]] = {}
+
+    # A bucket straddling the retention cutoff is made of both rollups and raw rows
+    for row_device_id, row_bucket, min_value, max_value, sum_value, count in rows:
+        key     = (row_device_id, row_bucket)
+        current = buckets.get(key)
+
+        if current is None:
+            buckets[key] = [min_value, max_value, sum_value, count]
+        else:
+            buckets[key] = [min(current[0], min_value), max(current[1], max_value), current[2] + sum_value, current[3] + count]
+
+    return buckets
+
+
+def _get_resolution(span: timedelta) -> int:
+    # Only the span older than the retention cutoff is read from rollups
+    for resolution in RESOLUTIONS:
+        if span.total_seconds() / resolution <= app_config.telemetry_history_max_points:
+            return resolution
+
+    return RESOLUTIONS[-1]
+
+
+def _get_rollup_resolution(width: int) -> int:
+    # The coarsest rollup that tiles the requested buckets exactly, or the finest one otherwise
+    for resolution in reversed(RESOLUTIONS):
+        if width % resolution == 0:
+            return resolution
+
+    return RESOLUTIONS[0]
@@ -0,0 +1,22 @@
+from esparkcore.data.models import Trigger
+from esparkcore.routers import TriggerRouter as BaseTriggerRouter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..services import trigger_cache
+
+
+class TriggerRouter(BaseTriggerRouter):
+    async def _after_add(self, entity: Trigger, session: AsyncSession) -> None:
+        await super()._after_add(entity, session)
+
+        trigger_cache.invalidate()
+
+    async def _after_update(self, entity: Trigger, session: AsyncSession) -> None:
+        await super()._after_update(entity, session)
+
+        trigger_cache.invalidate()
+
+    async def _after_delete(self, entity: Trigger, session: AsyncSession) -> None:
+        await super()._after_delete(entity, session)
+
+        trigger_cache.invalidate()
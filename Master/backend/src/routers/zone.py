@@ -0,0 +1,11 @@
+from esparkcore.routers.base_router import BaseRouter
+
+from ..data.models import Zone
+from ..data.repositories import ZoneRepository
+
+
+class ZoneRouter(BaseRouter):
+    def __init__(self, repo: ZoneRepository = None) -> None:
+        self.repo : ZoneRepository = repo or ZoneRepository()
+
+        super().__init__(Zone, self.repo, '/api/v1/zones', ['zone'])
@@ -1,2 +1,3 @@
 from .evaluation import evaluate
 from .outbox import process_outbox
+from .retention import rollup_telemetry
@@ -1,81 +1,141 @@
-from datetime import datetime, timezone
+from asyncio import gather
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Sequence
 
 from esparkcore.data.models import Device, OutboxEvent
-from esparkcore.data.repositories import DeviceRepository, OutboxRepository, TelemetryRepository
 from esparkcore.data import async_session
 from esparkcore.utils import log_debug
+from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import and_
 
-from ..data.models import Relay
-from ..data.repositories import RelayRepository
-from ..services import DecisionEngine
+from ..data.models import RelayState, SettingsSnapshot, Zone
+from ..data.repositories import DeviceRepository, RelayRepository, ZoneRepository
+from ..services import DecisionEngine, capability_cache, event_bus, outbox_dispatcher, refresh_tracker, settings_cache, telemetry_cache
+from ..utils import AppConfig, as_utc
 
-engine = DecisionEngine()
+app_config = AppConfig()
+engine     = DecisionEngine()
 
 
 async def evaluate():
     async with async_session() as session:
-        device_repo    = DeviceRepository()
-        outbox_repo    = OutboxRepository()
-        relay_repo     = RelayRepository()
-        telemetry_repo = TelemetryRepository()
-
         log_debug('Starting evaluation cycle')
 
-        actuators = await device_repo.list_by_capability(session, 'action_relay')
-        if not actuators or len(actuators) == 0:
+        actuator_ids = await capability_cache.get('action_relay')
+        if not actuator_ids:
             return
 
-        current_state = await relay_repo.get_current_state(session, actuators[0].id)
+        # pylint: disable=no-member
+        actuators = await DeviceRepository().list(session, Device.id.in_(actuator_ids))
+        states    = await _resolve_states(session, actuators)
+        now       = datetime.now(timezone.utc)
 
-        log_debug(f'Current actuator state: {current_state}')
+        queued, switched = await _queue_states(session, states, {actuator.id: actuator.last_seen for actuator in actuators}, now)
 
-        values: list[float] = []
+        if queued:
+            await session.commit()
 
-        # pylint: disable=no-member
-        devices = await device_repo.list(session, Device.capabilities.contains('temperature'))
-        for device in devices:
-            telemetry = await telemetry_repo.get_latest_for_device(session, device.id, 'temperature')
-            if telemetry:
-                values.append(telemetry.value / 100.0)
-
-        decision = await engine.decide(values)
-        if decision is None:
-            return
+        # The interval outbox job stays as a safety net for events that could not be dispatched right away
+        for actuator_id in queued:
+            outbox_dispatcher.notify(actuator_id)
+
+        for actuator_id in switched:
+            event_bus.publish('relay', actuator_id, {
+                'device_id' : actuator_id,
+                'state'     : states[actuator_id],
+                'timestamp' : now.isoformat(),
+            })
+
+
+async def _resolve_states(session: AsyncSession, actuators: Sequence[Device]) -> dict[str, int]:
+    sensor_ids = await capability_cache.get('temperature')
+    values     = {telemetry.device_id: telemetry.value / 100.0 for telemetry in telemetry_cache.list_latest('temperature', sensor_ids)}
+    zones      = await _list_zones(session, ZoneRepository(), actuators)
+    settings   = await settings_cache.get()
+    decisions  = await gather(*[_decide(zone, sensor_ids, values, settings) for zone in zones])
+
+    return _merge_decisions(zones, decisions)
+
+
+async def _queue_states(session: AsyncSession, states: dict[str, int], last_seen: dict[str, Optional[datetime]], now: datetime) -> tuple[list[str], list[str]]:
+    relay_repo = RelayRepository()
+    relays     = {relay.device_id: relay for relay in await relay_repo.list_current(session, states.keys())}
+    queued     = []
+    switched   = []
+
+    for actuator_id, state in states.items():
+        relay = relays.get(actuator_id)
+
+        if relay is None or relay.state != state:
+            log_debug(f'Decision made for actuator {actuator_id}: {"ON" if state else "OFF"}')
+
+            relay = await relay_repo.record_transition(session, actuator_id, state, now)
 
-        log_debug(f'Decision made: {"ON" if decision else "OFF"}')
+            switched.append(actuator_id)
+        elif not _needs_refresh(relay, last_seen.get(actuator_id), now):
+            continue
+        else:
+            log_debug(f'Refreshing unchanged state of actuator {actuator_id}: {"ON" if state else "OFF"}')
 
-        relay = await _upsert_relay(session, relay_repo, actuators[0].id, 1 if decision else 0)
+        refresh_tracker.mark(actuator_id, now)
 
-        await _upsert_event(session, outbox_repo, actuators[0].id, relay.state)
+        queued.append(actuator_id)
 
-        await session.commit()
+        await _upsert_event(session, actuator_id, relay.state)
 
+    return queued, switched
 
-async def _upsert_relay(session: AsyncSession, relay_repo: RelayRepository, actuator_id: str, state: int) -> Relay:
-    relay = await relay_repo.get_latest(session, actuator_id)
-    if relay:
-        await relay_repo.update(session, relay, timestamp=datetime.now(timezone.utc), state=state)
-    else:
-        relay = Relay()
-        relay.device_id = actuator_id
-        relay.timestamp = datetime.now(timezone.utc)
-        relay.state     = state
 
-        await relay_repo.add(session, relay)
+async def _list_zones(session: AsyncSession, zone_repo: ZoneRepository, actuators: Sequence[Device]) -> list[Zone]:
+    actuator_ids = {actuator.id for actuator in actuators}
+    zones        = [zone for zone in await zone_repo.list(session) if zone.actuator_id in actuator_ids]
+    zoned_ids    = {zone.actuator_id for zone in zones}
 
-    return relay
+    # An actuator without a configured zone heats a zone made of all temperature sensors
+    return zones + [Zone(name=actuator.id, actuator_id=actuator.id) for actuator in actuators if actuator.id not in zoned_ids]
 
 
-async def _upsert_event(session: AsyncSession, outbox_repo: OutboxRepository, actuator_id: str, state: int) -> OutboxEvent:
-    await outbox_repo.delete_pending(session, actuator_id, 'relay_state_changed')
+async def _decide(zone: Zone, sensor_ids: list[str], values: dict[str, float], settings: SettingsSnapshot) -> Optional[bool]:
+    zone_values = [values[sensor_id] for sensor_id in zone.get_sensor_ids() or sensor_ids if sensor_id in values]
+
+    return await engine.decide(zone_values, settings.with_overrides(zone.threshold_on, zone.threshold_off, zone.decision_strategy))
+
+
+def _merge_decisions(zones: list[Zone], decisions: list[Optional[bool]]) -> dict[str, int]:
+    states: dict[str, int] = {}
+
+    # An actuator shared by several zones heats as soon as any of them needs heating
+    for zone, decision in zip(zones, decisions):
+        if decision is not None:
+            states[zone.actuator_id] = max(states.get(zone.actuator_id, 0), 1 if decision else 0)
+
+    return states
+
+
+def _needs_refresh(relay: RelayState, last_seen: Optional[datetime], now: datetime) -> bool:
+    if app_config.relay_refresh_interval <= 0 or last_seen is None:
+        return False
+
+    last_sent = max(as_utc(relay.timestamp), refresh_tracker.get(relay.device_id) or as_utc(relay.timestamp))
+
+    # The retained state only needs resending to an actuator that has come online since it was last sent
+    return as_utc(last_seen) > last_sent and now - last_sent >= timedelta(minutes=app_config.relay_refresh_interval)
+
+
+async def _upsert_event(session: AsyncSession, actuator_id: str, state: int) -> OutboxEvent:
+    # pylint: disable=singleton-comparison
+    await session.execute(delete(OutboxEvent).where(and_(OutboxEvent.device_id == actuator_id, OutboxEvent.event_type == 'relay_state_changed', OutboxEvent.is_processed == False)))
 
     event = OutboxEvent()
     event.device_id  = actuator_id
     event.event_type = 'relay_state_changed'
+    event.created_at = datetime.now(timezone.utc)
     event.payload    = {
         'device_id' : actuator_id,
         'state'     : state,
     }
 
-    return await outbox_repo.add(session, event)
+    session.add(event)
+
+    return event
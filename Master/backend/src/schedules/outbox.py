@@ -1,14 +1,13 @@
-from esparkcore.data.repositories import DeviceRepository
-from esparkcore.data import async_session
+from asyncio import gather
+
 from esparkcore.schedules import consume_outbox
 
+from ..services import capability_cache
 
-async def process_outbox():
-    async with async_session() as session:
-        device_repo = DeviceRepository()
-        actuators   = await device_repo.list_by_capability(session, 'action_relay')
 
-        if not actuators or len(actuators) == 0:
-            return
+async def process_outbox():
+    actuator_ids = await capability_cache.get('action_relay')
+    if not actuator_ids:
+        return
 
-        await consume_outbox(actuators[0].id, 'relay_state_changed')
+    await gather(*[consume_outbox(actuator_id, 'relay_state_changed') for actuator_id in actuator_ids])
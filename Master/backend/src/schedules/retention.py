@@ -0,0 +1,34 @@
+from asyncio import sleep
+from datetime import datetime, timedelta, timezone
+
+from esparkcore.data import async_session
+from esparkcore.utils import log_debug
+
+from ..data.repositories import TelemetryRollupRepository
+from ..utils import AppConfig
+
+app_config = AppConfig()
+
+
+async def rollup_telemetry():
+    repo   = TelemetryRollupRepository()
+    cutoff = datetime.now(timezone.utc) - timedelta(days=app_config.telemetry_retention_days)
+    total  = 0
+
+    log_debug(f'Rolling up telemetry older than {cutoff.isoformat()}')
+
+    while True:
+        # Each batch is committed on its own so the write lock is only held briefly
+        async with async_session() as session:
+            processed = await repo.rollup(session, cutoff, app_config.telemetry_rollup_batch_size)
+
+            await session.commit()
+
+        total += processed
+
+        if processed < app_config.telemetry_rollup_batch_size:
+            break
+
+        await sleep(0)
+
+    log_debug(f'Rolled up {total} telemetry rows')
@@ -1 +1,14 @@
+from .bridge import EventBridge, event_bridge
+from .capabilities import CapabilityCache, capability_cache
+from .debouncer import Debouncer
 from .decision_engine import DecisionEngine
+from .dispatcher import OutboxDispatcher, outbox_dispatcher
+from .events import Event, EventBus, Subscription, event_bus
+from .ingest import IngestBuffer, ingest_buffer
+from .instrumentation import ServerTimingMiddleware, instrument_job
+from .leader import LeaderElection, leader_election
+from .mqtt import MQTTManager
+from .refresh import RefreshTracker, refresh_tracker
+from .settings import SettingsCache, settings_cache
+from .telemetry import TelemetryCache, telemetry_cache
+from .triggers import TriggerCache, trigger_cache
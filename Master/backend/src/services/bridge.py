@@ -0,0 +1,117 @@
+from asyncio import CancelledError, Task, create_task, sleep
+from contextlib import suppress
+from datetime import datetime, timedelta, timezone
+from json import loads
+from typing import Callable, Optional
+
+from aiomqtt import Client, MqttError
+from esparkcore.constants import TOPIC_ACTION, TOPIC_TELEMETRY
+from esparkcore.data.models import Telemetry
+from esparkcore.utils import log_error
+
+from ..utils import AppConfig, decode_readings, is_binary
+from .events import event_bus
+
+app_config = AppConfig()
+
+
+class EventBridge:
+    def __init__(self, retry_delay: Optional[float] = None) -> None:
+        self.retry_delay : float                             = app_config.event_bridge_retry_delay if retry_delay is None else retry_delay
+        self.listeners   : list[Callable[[Telemetry], None]] = []
+        self.states      : dict[str, int]                    = {}
+        self.task        : Optional[Task]                    = None
+
+    def add_listener(self, listener: Callable[[Telemetry], None]) -> None:
+        self.listeners.append(listener)
+
+    def start(self) -> None:
+        if self.task is None or self.task.done():
+            self.task = create_task(self._bridge())
+
+    async def close(self) -> None:
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+
+            with suppress(CancelledError):
+                await self.task
+
+        self.task = None
+        self.states.clear()
+
+    async def _bridge(self) -> None:
+        while True:
+            try:
+                # Followers subscribe without a client identifier of their own, so they never take over the session of the leader
+                async with Client(app_config.mqtt_host, app_config.mqtt_port) as client:
+                    await client.subscribe(f'{TOPIC_TELEMETRY}/+')
+                    await client.subscribe(f'{TOPIC_ACTION}/+')
+
+                    async for message in client.messages:
+                        self.handle(str(message.topic), message.payload)
+            except MqttError as e:
+                with suppress(Exception):
+                    log_error(e)
+
+                await sleep(self.retry_delay)
+
+    def handle(self, topic: str, payload: bytes) -> None:
+        topic_parts = topic.split('/')
+        if len(topic_parts) != 3 or topic_parts[0] != 'espark':
+            return
+
+        _, message_type, device_id = topic_parts
+
+        try:
+            if message_type == TOPIC_TELEMETRY.split('/')[1]:
+                self._handle_telemetry(device_id, payload)
+            elif message_type == TOPIC_ACTION.split('/')[1]:
+                self._handle_action(device_id, payload)
+        # pylint: disable=broad-exception-caught
+        except Exception as e:
+            # log_error re-raises, which would stop relaying every later message
+            with suppress(Exception):
+                log_error(e)
+
+    def _handle_telemetry(self, device_id: str, payload: bytes) -> None:
+        if is_binary(payload):
+            readings = decode_readings(payload)
+        else:
+            message  = loads(payload.decode())
+            readings = message.get('readings')
+            if readings is None:
+                readings = [(message.get('data_type'), message.get('value'))]
+
+        now = datetime.now(timezone.utc)
+
+        for data_type, value, *age in readings:
+            telemetry = Telemetry()
+
+            telemetry.device_id = device_id
+            telemetry.timestamp = now - timedelta(seconds=age[0] if age else 0)
+            telemetry.data_type = data_type
+            telemetry.value     = int(value)
+
+            for listener in self.listeners:
+                listener(telemetry)
+
+    def _handle_action(self, device_id: str, payload: bytes) -> None:
+        # A cleared retained message carries no state
+        if not payload:
+            return
+
+        state    = int(loads(payload.decode())['state'])
+        previous = self.states.get(device_id)
+
+        self.states[device_id] = state
+
+        # The retained state received on subscribing and republished unchanged states are not switches
+        if previous is not None and previous != state:
+            event_bus.publish('relay', device_id, {
+                'device_id' : device_id,
+                'state'     : state,
+                'timestamp' : datetime.now(timezone.utc).isoformat(),
+            })
+
+
+event_bridge = EventBridge()
@@ -0,0 +1,43 @@
+from asyncio import Lock
+from typing import Optional
+
+from esparkcore.data import async_session
+
+from ..data.repositories import DeviceRepository
+
+
+class CapabilityCache:
+    def __init__(self, repo: DeviceRepository = None) -> None:
+        self.repo         : DeviceRepository               = repo or DeviceRepository()
+        self.capabilities : Optional[dict[str, list[str]]] = None
+        self.device_ids   : set[str]                       = set()
+        self.lock         : Lock                           = Lock()
+
+    async def get(self, capability: str) -> list[str]:
+        return list((await self._load()).get(capability, []))
+
+    async def contains(self, device_id: str) -> bool:
+        await self._load()
+
+        return device_id in self.device_ids
+
+    def invalidate(self) -> None:
+        self.capabilities = None
+
+    async def _load(self) -> dict[str, list[str]]:
+        capabilities = self.capabilities
+        if capabilities is not None:
+            return capabilities
+
+        async with self.lock:
+            if self.capabilities is None:
+                async with async_session() as session:
+                    capabilities = await self.repo.list_capabilities(session)
+
+                self.device_ids   = {device_id for device_ids in capabilities.values() for device_id in device_ids}
+                self.capabilities = capabilities
+
+            return self.capabilities
+
+
+capability_cache = CapabilityCache()
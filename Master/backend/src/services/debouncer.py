@@ -0,0 +1,51 @@
+from asyncio import Lock, Task, create_task, sleep
+from contextlib import suppress
+from time import monotonic
+from typing import Awaitable, Callable, Optional
+
+from esparkcore.utils import log_error
+
+
+class Debouncer:
+    def __init__(self, callback: Callable[[], Awaitable[None]], delay: float, min_interval: float = 0) -> None:
+        self.callback     : Callable[[], Awaitable[None]] = callback
+        self.delay        : float                         = delay
+        self.min_interval : float                         = min_interval
+        self.last_run     : Optional[float]               = None
+        self.pending      : bool                          = False
+        self.task         : Optional[Task]                = None
+        self.lock         : Lock                          = Lock()
+
+    def notify(self) -> None:
+        self.pending = True
+
+        if self.task is None or self.task.done():
+            self.task = create_task(self._run_pending())
+
+    async def run(self) -> None:
+        async with self.lock:
+            try:
+                await self.callback()
+            finally:
+                self.last_run = monotonic()
+
+    async def close(self) -> None:
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+
+    async def _run_pending(self) -> None:
+        while self.pending:
+            await sleep(self.delay)
+
+            if self.last_run is not None:
+                await sleep(max(0.0, self.last_run + self.min_interval - monotonic()))
+
+            self.pending = False
+
+            try:
+                await self.run()
+            # pylint: disable=broad-exception-caught
+            except Exception as e:
+                # log_error re-raises, which would end this task and drop the notifications that arrived meanwhile
+                with suppress(Exception):
+                    log_error(e)
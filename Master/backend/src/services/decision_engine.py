@@ -1,10 +1,9 @@
-from typing import Iterable, Optional
+from typing import Optional, Sequence
 
-from ..data.models import Settings
-from ..data.repositories import SettingsRepository
-from ..data import async_session
+from ..data.models import SettingsSnapshot
 from ..strategies import AvgStrategy, MinStrategy
 from ..utils import AppConfig
+from .settings import settings_cache
 
 STRATEGIES = {
     'avg': AvgStrategy,
@@ -15,18 +14,12 @@ app_config = AppConfig()
 
 
 class DecisionEngine:
-    def __init__(self):
-        self.repo     = SettingsRepository()
-        self.strategy = MinStrategy()
-
-    async def decide(self, values: Iterable[float]) -> Optional[bool]:
-        async with async_session() as session:
-            settings: Settings = await self.repo.get(session, Settings.id == 1)
-            if settings:
-                self.strategy = STRATEGIES.get(settings.decision_strategy, MinStrategy)()
+    async def decide(self, values: Sequence[float], settings: Optional[SettingsSnapshot] = None) -> Optional[bool]:
+        if settings is None:
+            settings = await settings_cache.get()
 
         for value in values:
             if value < app_config.heating_min_temperature:
                 return True
 
-        return await self.strategy.evaluate(values)
+        return STRATEGIES.get(settings.decision_strategy, MinStrategy)().evaluate(values, settings)
@@ -0,0 +1,49 @@
+from asyncio import Queue, QueueEmpty, Task, create_task, gather
+from contextlib import suppress
+from typing import Optional
+
+from esparkcore.schedules import consume_outbox
+from esparkcore.utils import log_error
+
+
+class OutboxDispatcher:
+    def __init__(self, event_type: str = 'relay_state_changed') -> None:
+        self.event_type : str            = event_type
+        self.queue      : Queue[str]     = Queue()
+        self.queued     : set[str]       = set()
+        self.task       : Optional[Task] = None
+
+    def start(self) -> None:
+        if self.task is None or self.task.done():
+            self.task = create_task(self._dispatch())
+
+    def notify(self, device_id: str) -> None:
+        # A device already waiting is dispatched once, since consuming publishes its latest pending event only
+        if device_id not in self.queued:
+            self.queued.add(device_id)
+            self.queue.put_nowait(device_id)
+
+    async def close(self) -> None:
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+
+    async def _dispatch(self) -> None:
+        while True:
+            device_ids = [await self.queue.get()]
+
+            try:
+                while True:
+                    device_ids.append(self.queue.get_nowait())
+            except QueueEmpty:
+                pass
+
+            self.queued.difference_update(device_ids)
+
+            for result in await gather(*[consume_outbox(device_id, self.event_type) for device_id in device_ids], return_exceptions=True):
+                if isinstance(result, Exception):
+                    # log_error re-raises, which would stop dispatching for every device until the next leader election
+                    with suppress(Exception):
+                        log_error(result)
+
+
+outbox_dispatcher = OutboxDispatcher()
@@ -0,0 +1,55 @@
+from asyncio import Queue, QueueFull
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional
+
+from esparkcore.utils import log_debug
+
+from ..utils import AppConfig
+
+app_config = AppConfig()
+
+
+@dataclass(frozen=True)
+class Event:
+    event_type : str
+    device_id  : Optional[str]
+    payload    : dict[str, Any]
+
+
+class Subscription:
+    def __init__(self, device_ids: Optional[Iterable[str]] = None, max_size: int = 0) -> None:
+        self.device_ids : Optional[set[str]] = set(device_ids) if device_ids else None
+        self.queue      : Queue[Event]       = Queue(max_size)
+
+    def accepts(self, event: Event) -> bool:
+        # Events not tied to a device, such as settings changes, reach every subscriber
+        return self.device_ids is None or event.device_id is None or event.device_id in self.device_ids
+
+
+class EventBus:
+    def __init__(self, max_size: Optional[int] = None) -> None:
+        self.max_size      : int               = app_config.event_stream_queue_size if max_size is None else max_size
+        self.subscriptions : set[Subscription] = set()
+
+    def subscribe(self, device_ids: Optional[Iterable[str]] = None) -> Subscription:
+        subscription = Subscription(device_ids, self.max_size)
+
+        self.subscriptions.add(subscription)
+
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self.subscriptions.discard(subscription)
+
+    def publish(self, event_type: str, device_id: Optional[str], payload: dict[str, Any]) -> None:
+        event = Event(event_type, device_id, payload)
+
+        for subscription in list(self.subscriptions):
+            if subscription.accepts(event):
+                try:
+                    subscription.queue.put_nowait(event)
+                except QueueFull:
+                    log_debug(f'Dropping {event_type} event for a slow subscriber')
+
+
+event_bus = EventBus()
@@ -0,0 +1,128 @@
+from asyncio import CancelledError, Condition, Event, Lock, Task, create_task, wait_for
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Optional
+
+from esparkcore.data import async_session
+from esparkcore.data.models import Telemetry
+from esparkcore.utils import log_error
+from sqlalchemy.exc import IntegrityError
+
+from ..data.repositories import TelemetryRepository
+from ..utils import AppConfig
+
+app_config = AppConfig()
+
+
+@dataclass(frozen=True)
+class IngestConfig:
+    batch_size     : int
+    flush_interval : float
+    capacity       : int
+
+
+class IngestBuffer:
+    def __init__(self, repo: TelemetryRepository = None, batch_size: Optional[int] = None, flush_interval: Optional[float] = None, capacity: Optional[int] = None) -> None:
+        self.repo    : TelemetryRepository = repo or TelemetryRepository()
+        self.config  : IngestConfig        = IngestConfig(
+            app_config.telemetry_ingest_batch_size if batch_size is None else batch_size,
+            app_config.telemetry_ingest_flush_interval if flush_interval is None else flush_interval,
+            app_config.telemetry_ingest_capacity if capacity is None else capacity,
+        )
+        self.pending : list[Telemetry]     = []
+        self.ready   : Event               = Event()
+        self.space   : Condition           = Condition()
+        self.lock    : Lock                = Lock()
+        self.task    : Optional[Task]      = None
+
+    async def add(self, telemetry: Telemetry) -> None:
+        # A full buffer holds back the caller until a flush frees up space, so memory stays bounded while the database is slow
+        async with self.space:
+            await self.space.wait_for(lambda: len(self.pending) < self.config.capacity)
+
+            self.pending.append(telemetry)
+
+        if len(self.pending) >= self.config.batch_size:
+            self.ready.set()
+
+    def start(self) -> None:
+        if self.task is None or self.task.done():
+            self.task = create_task(self._run())
+
+    async def close(self) -> None:
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+
+            # A flush interrupted by the cancellation leaves its rows buffered for the final flushes below
+            with suppress(CancelledError):
+                await self.task
+
+        while await self.flush():
+            pass
+
+        if self.pending:
+            # Rows that could not be written stay buffered for a later leadership, but are lost if the process is shutting down
+            with suppress(Exception):
+                log_error(RuntimeError(f'{len(self.pending)} telemetry rows could not be flushed on close'))
+
+    async def flush(self) -> int:
+        async with self.lock:
+            batch = self.pending[:self.config.batch_size]
+            if not batch:
+                return 0
+
+            try:
+                await self._add_all(batch)
+            except IntegrityError:
+                batch = await self._add_each(batch)
+            # pylint: disable=broad-exception-caught
+            except Exception as e:
+                # Rows stay buffered and are written by the next flush
+                with suppress(Exception):
+                    log_error(e)
+
+                return 0
+
+            del self.pending[:len(batch)]
+
+        async with self.space:
+            self.space.notify_all()
+
+        return len(batch)
+
+    async def _add_all(self, batch: list[Telemetry]) -> None:
+        async with async_session() as session:
+            await self.repo.add_all(session, batch)
+
+    async def _add_each(self, batch: list[Telemetry]) -> list[Telemetry]:
+        # A row rejected by the database would hold back every batch behind it, so rows are written one by one and rejected ones dropped
+        for index, telemetry in enumerate(batch):
+            try:
+                await self._add_all([telemetry])
+            except IntegrityError as e:
+                with suppress(IntegrityError):
+                    log_error(e)
+            # pylint: disable=broad-exception-caught
+            except Exception as e:
+                # Rows handled so far leave the buffer, while the rest are written by the next flush
+                with suppress(Exception):
+                    log_error(e)
+
+                return batch[:index]
+
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await wait_for(self.ready.wait(), self.config.flush_interval)
+            except TimeoutError:
+                pass
+
+            self.ready.clear()
+
+            while await self.flush() == self.config.batch_size:
+                pass
+
+
+ingest_buffer = IngestBuffer()
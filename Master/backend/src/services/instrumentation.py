@@ -0,0 +1,63 @@
+from time import perf_counter
+from typing import Awaitable, Callable
+
+from esparkcore.utils import log_debug
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..data import QueryStats, track_queries
+from ..utils import COUNT_BUCKETS, metrics_registry
+
+request_duration = metrics_registry.histogram('espartan_http_request_duration_seconds', 'Duration of HTTP requests')
+request_queries  = metrics_registry.histogram('espartan_http_request_queries', 'SQL statements issued per HTTP request', COUNT_BUCKETS)
+job_duration     = metrics_registry.histogram('espartan_job_duration_seconds', 'Duration of scheduled job runs')
+job_queries      = metrics_registry.histogram('espartan_job_queries', 'SQL statements issued per scheduled job run', COUNT_BUCKETS)
+
+
+class ServerTimingMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        started_at = perf_counter()
+
+        with track_queries() as stats:
+            async def send_with_timing(message: Message) -> None:
+                if message['type'] == 'http.response.start':
+                    message = {**message, 'headers': [*message.get('headers', []), (b'server-timing', _server_timing(stats, perf_counter() - started_at).encode('latin-1'))]}
+
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                # Routes are labelled by their template, so path parameters do not multiply the series
+                route = getattr(scope.get('route'), 'path', None) or 'unmatched'
+
+                request_duration.observe(perf_counter() - started_at, method=scope['method'], route=route)
+                request_queries.observe(stats.count, method=scope['method'], route=route)
+
+
+def instrument_job(name: str, callback: Callable[[], Awaitable[None]]) -> Callable[[], Awaitable[None]]:
+    async def run() -> None:
+        started_at = perf_counter()
+
+        with track_queries() as stats:
+            try:
+                await callback()
+            finally:
+                duration = perf_counter() - started_at
+
+                job_duration.observe(duration, job=name)
+                job_queries.observe(stats.count, job=name)
+
+                log_debug(f'Job {name} took {duration * 1000:.1f} ms with {stats.count} queries in {stats.duration * 1000:.1f} ms')
+
+    return run
+
+
+def _server_timing(stats: QueryStats, duration: float) -> str:
+    return f'db;dur={stats.duration * 1000:.3f};desc="{stats.count} queries", app;dur={duration * 1000:.3f}'
@@ -0,0 +1,102 @@
+from asyncio import Task, create_task, sleep
+from contextlib import suppress
+from dataclasses import dataclass
+from os import getpid
+from socket import gethostname
+from typing import Awaitable, Callable, Optional
+from uuid import uuid4
+
+from esparkcore.data import async_session
+from esparkcore.utils import log_debug, log_error
+
+from ..data.repositories import LeaseRepository
+from ..utils import AppConfig
+
+app_config = AppConfig()
+
+
+@dataclass(frozen=True)
+class LeaseConfig:
+    name   : str
+    ttl    : float
+    holder : str
+
+
+class LeaderElection:
+    def __init__(self, name: str = 'leader', ttl: Optional[float] = None, repo: LeaseRepository = None) -> None:
+        self.lease     : LeaseConfig                         = LeaseConfig(name, app_config.leader_lease_ttl if ttl is None else ttl, f'{gethostname()}:{getpid()}:{uuid4().hex[:8]}')
+        self.repo      : LeaseRepository                     = repo or LeaseRepository()
+        self.is_leader : bool                                = False
+        self.acquired  : list[Callable[[], Awaitable[None]]] = []
+        self.released  : list[Callable[[], Awaitable[None]]] = []
+        self.task      : Optional[Task]                      = None
+
+    def add_listener(self, on_acquired: Callable[[], Awaitable[None]], on_released: Callable[[], Awaitable[None]]) -> None:
+        self.acquired.append(on_acquired)
+        self.released.append(on_released)
+
+    def guard(self, callback: Callable[[], Awaitable[None]]) -> Callable[[], Awaitable[None]]:
+        async def wrapper() -> None:
+            if self.is_leader:
+                await callback()
+
+        return wrapper
+
+    def start(self) -> None:
+        if self.task is None or self.task.done():
+            self.task = create_task(self._run())
+
+    async def close(self) -> None:
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+
+        if self.is_leader:
+            await self._set_leader(False)
+
+            # Releasing lets another process take over right away instead of waiting for the lease to expire
+            try:
+                async with async_session() as session:
+                    await self.repo.release(session, self.lease.name, self.lease.holder)
+            # pylint: disable=broad-exception-caught
+            except Exception as e:
+                with suppress(Exception):
+                    log_error(e)
+
+    async def renew(self) -> bool:
+        try:
+            async with async_session() as session:
+                is_leader = await self.repo.acquire(session, self.lease.name, self.lease.holder, self.lease.ttl)
+        # pylint: disable=broad-exception-caught
+        except Exception as e:
+            # A lease that cannot be renewed may expire at any time, so leadership is given up rather than risked
+            with suppress(Exception):
+                log_error(e)
+
+            is_leader = False
+
+        if is_leader != self.is_leader:
+            await self._set_leader(is_leader)
+
+        return is_leader
+
+    async def _run(self) -> None:
+        while True:
+            await self.renew()
+            await sleep(self.lease.ttl / 3)
+
+    async def _set_leader(self, is_leader: bool) -> None:
+        self.is_leader = is_leader
+
+        log_debug(f'Process {self.lease.holder} {"acquired" if is_leader else "released"} lease {self.lease.name}')
+
+        for listener in self.acquired if is_leader else self.released:
+            try:
+                await listener()
+            # pylint: disable=broad-exception-caught
+            except Exception as e:
+                # log_error re-raises, which would skip the listeners after a failing one
+                with suppress(Exception):
+                    log_error(e)
+
+
+leader_election = LeaderElection()
@@ -0,0 +1,126 @@
+from contextlib import suppress
+from datetime import datetime, timedelta, timezone
+from json import loads
+from typing import Callable
+
+from esparkcore.constants import TOPIC_CRASH, TOPIC_REGISTRATION, TOPIC_TELEMETRY
+from esparkcore.data.models import Telemetry
+from esparkcore.data.repositories import AppVersionRepository, DeviceRepository, NotificationRepository, TelemetryRepository, TriggerRepository
+from esparkcore.services import MQTTManager as BaseMQTTManager
+from esparkcore.utils import log_debug, log_error
+
+from ..utils import decode_readings, is_binary
+from .capabilities import capability_cache
+from .ingest import ingest_buffer
+from .telemetry import telemetry_cache
+from .triggers import trigger_cache
+
+
+class MQTTManager(BaseMQTTManager):
+    def __init__(self, version_repo: AppVersionRepository = None, device_repo: DeviceRepository = None, notification_repo: NotificationRepository = None, telemetry_repo: TelemetryRepository = None, trigger_repo: TriggerRepository = None) -> None:
+        super().__init__(version_repo=version_repo, device_repo=device_repo, notification_repo=notification_repo, telemetry_repo=telemetry_repo, trigger_repo=trigger_repo)
+
+        self.listeners : list[Callable[[Telemetry], None]] = []
+
+    def add_listener(self, listener: Callable[[Telemetry], None]) -> None:
+        self.listeners.append(listener)
+
+    async def _process_queue(self) -> None:
+        while True:
+            topic, payload = await self.queue.get()
+
+            try:
+                await self._process_message(str(topic), payload)
+            # pylint: disable=broad-exception-caught
+            except Exception as e:
+                # A malformed message is skipped, instead of stopping the processing of every later one
+                with suppress(Exception):
+                    log_error(e)
+            finally:
+                self.queue.task_done()
+
+    async def _process_message(self, topic: str, payload: bytes) -> None:
+        topic_parts = topic.split('/')
+        if len(topic_parts) != 3 or topic_parts[0] != 'espark':
+            log_debug(f'Invalid topic {topic}, skipping message')
+            return
+
+        _, message_type, device_id = topic_parts
+
+        if message_type == TOPIC_TELEMETRY.split('/')[1] and is_binary(payload):
+            await self._handle_telemetry(device_id, {
+                'readings' : decode_readings(payload),
+            })
+            return
+
+        payload = loads(payload.decode())
+
+        if message_type == TOPIC_REGISTRATION.split('/')[1]:
+            await self._handle_registration(device_id, payload)
+        elif message_type == TOPIC_TELEMETRY.split('/')[1]:
+            await self._handle_telemetry(device_id, payload)
+        elif message_type == TOPIC_CRASH.split('/')[1]:
+            log_debug(f'Received crash report from device {device_id}: {payload}')
+        else:
+            log_debug(f'Unknown message type "{message_type}", skipping message')
+
+    async def _handle_registration(self, device_id: str, payload: dict) -> None:
+        # Devices register on every wake, so the capability map is only reloaded for devices it does not know yet
+        known = await capability_cache.contains(device_id)
+
+        await super()._handle_registration(device_id, payload)
+
+        if not known:
+            capability_cache.invalidate()
+
+    async def _handle_telemetry(self, device_id: str, payload: dict) -> None:
+        # A batched message carries every reading of a wake cycle, while the legacy one carries a single reading
+        readings = payload.get('readings')
+        if readings is None:
+            readings = [(payload.get('data_type'), payload.get('value'))]
+
+        for reading in readings:
+            try:
+                if not isinstance(reading, (list, tuple)) or len(reading) not in (2, 3):
+                    raise ValueError(f'Malformed reading from device {device_id}: {reading}')
+
+                await self._handle_reading(device_id, *reading)
+            # pylint: disable=broad-exception-caught
+            except Exception as e:
+                # log_error re-raises, which would drop every reading after a malformed one
+                with suppress(Exception):
+                    log_error(e)
+
+    async def _handle_reading(self, device_id: str, data_type: str, value: int, age: int = 0) -> None:
+        # A reading without a numeric value is rejected before it reaches the buffer, the cache or the triggers
+        value = int(value)
+
+        try:
+            log_debug(f'Receiving telemetry from device: {device_id} - {data_type}: {value}')
+
+            telemetry = Telemetry()
+
+            # Readings queued on the node while it could not connect carry their age in seconds
+            telemetry.device_id = device_id
+            telemetry.timestamp = datetime.now(timezone.utc) - timedelta(seconds=age)
+            telemetry.data_type = data_type
+            telemetry.value     = value
+
+            # Rows are written behind by the ingest buffer, while readers see them in the cache right away
+            await ingest_buffer.add(telemetry)
+
+            telemetry_cache.put(telemetry)
+
+            for listener in self.listeners:
+                listener(telemetry)
+        # pylint: disable=broad-exception-caught
+        except Exception as e:
+            with suppress(Exception):
+                log_error(e)
+
+        await self._handle_triggers(device_id, data_type, value)
+
+    async def _handle_triggers(self, device_id: str, data_type: str, value: int) -> None:
+        # Triggers are matched against the cached list, so a database session is only opened when one fires
+        if await trigger_cache.matches(device_id, data_type, value):
+            await super()._handle_triggers(device_id, data_type, value)
@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import Optional
+
+
+class RefreshTracker:
+    def __init__(self) -> None:
+        self.refreshed_at : dict[str, datetime] = {}
+
+    def get(self, device_id: str) -> Optional[datetime]:
+        return self.refreshed_at.get(device_id)
+
+    def mark(self, device_id: str, timestamp: datetime) -> None:
+        self.refreshed_at[device_id] = timestamp
+
+    def remove(self, device_id: str) -> None:
+        self.refreshed_at.pop(device_id, None)
+
+    def reset(self) -> None:
+        self.refreshed_at.clear()
+
+
+# Last time the state of each actuator was queued for publishing by this process
+refresh_tracker = RefreshTracker()
@@ -0,0 +1,50 @@
+from asyncio import Lock
+from typing import Optional
+
+from ..data.models import Settings, SettingsSnapshot
+from ..data.repositories import SettingsRepository
+from ..data import async_session
+from ..utils import make_etag
+
+
+class SettingsCache:
+    def __init__(self, repo: SettingsRepository = None) -> None:
+        self.repo     : SettingsRepository         = repo or SettingsRepository()
+        self.snapshot : Optional[SettingsSnapshot] = None
+        self.settings : Optional[Settings]         = None
+        self.etag     : Optional[str]              = None
+        self.lock     : Lock                       = Lock()
+
+    async def get(self) -> SettingsSnapshot:
+        snapshot = self.snapshot
+        if snapshot is not None:
+            return snapshot
+
+        await self._load()
+
+        return self.snapshot
+
+    async def get_settings(self) -> Optional[Settings]:
+        if self.snapshot is None:
+            await self._load()
+
+        return self.settings
+
+    def invalidate(self) -> None:
+        self.snapshot = None
+        self.settings = None
+        self.etag     = None
+
+    async def _load(self) -> None:
+        async with self.lock:
+            if self.snapshot is None:
+                async with async_session() as session:
+                    # pylint: disable=unexpected-keyword-arg
+                    settings = await self.repo.get(session, Settings.id == 1)
+
+                self.settings = settings
+                self.etag     = make_etag(settings.model_dump_json()) if settings else None
+                self.snapshot = SettingsSnapshot.from_settings(settings or Settings())
+
+
+settings_cache = SettingsCache()
@@ -0,0 +1,49 @@
+from datetime import timezone
+from typing import Iterable, Optional
+
+from esparkcore.data import async_session
+from esparkcore.data.models import Telemetry
+
+from ..data.repositories import TelemetryRepository
+
+
+class TelemetryCache:
+    def __init__(self, repo: TelemetryRepository = None) -> None:
+        self.repo    : TelemetryRepository              = repo or TelemetryRepository()
+        self.entries : dict[tuple[str, str], Telemetry] = {}
+
+    async def warm(self) -> None:
+        async with async_session() as session:
+            for telemetry in await self.repo.list_latest(session):
+                self.put(telemetry)
+
+    def put(self, telemetry: Telemetry) -> None:
+        if telemetry.timestamp.tzinfo is None:
+            telemetry.timestamp = telemetry.timestamp.replace(tzinfo=timezone.utc)
+
+        key      = (telemetry.device_id, telemetry.data_type)
+        existing = self.entries.get(key)
+
+        if existing is None or existing.timestamp <= telemetry.timestamp:
+            self.entries[key] = telemetry
+
+    def remove(self, telemetry: Telemetry) -> None:
+        key = (telemetry.device_id, telemetry.data_type)
+
+        if key in self.entries and self.entries[key].id == telemetry.id:
+            del self.entries[key]
+
+    def get(self, device_id: str, data_type: str) -> Optional[Telemetry]:
+        return self.entries.get((device_id, data_type))
+
+    def list_latest(self, data_type: Optional[str] = None, device_ids: Optional[Iterable[str]] = None) -> list[Telemetry]:
+        if device_ids is not None:
+            device_ids = set(device_ids)
+
+        return [telemetry for (device_id, key), telemetry in self.entries.items() if (data_type is None or key == data_type) and (device_ids is None or device_id in device_ids)]
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+
+telemetry_cache = TelemetryCache()
@@ -0,0 +1,47 @@
+from asyncio import Lock
+from typing import Optional
+
+from esparkcore.data import async_session
+from esparkcore.data.models import Trigger
+from esparkcore.data.repositories import TriggerRepository
+
+CONDITIONS = {
+    '==' : lambda value, threshold: value == threshold,
+    '>'  : lambda value, threshold: value > threshold,
+    '>=' : lambda value, threshold: value >= threshold,
+    '<'  : lambda value, threshold: value < threshold,
+    '<=' : lambda value, threshold: value <= threshold,
+}
+
+
+class TriggerCache:
+    def __init__(self, repo: TriggerRepository = None) -> None:
+        self.repo     : TriggerRepository       = repo or TriggerRepository()
+        self.triggers : Optional[list[Trigger]] = None
+        self.lock     : Lock                    = Lock()
+
+    async def get(self) -> list[Trigger]:
+        triggers = self.triggers
+        if triggers is not None:
+            return triggers
+
+        async with self.lock:
+            if self.triggers is None:
+                async with async_session() as session:
+                    self.triggers = list(await self.repo.list(session))
+
+            return self.triggers
+
+    async def matches(self, device_id: str, data_type: str, value: int) -> bool:
+        for trigger in await self.get():
+            if (trigger.device_id is None or trigger.device_id == device_id) and (trigger.data_type is None or trigger.data_type == data_type):
+                if trigger.condition is None or trigger.condition in CONDITIONS and CONDITIONS[trigger.condition](value, trigger.value):
+                    return True
+
+        return False
+
+    def invalidate(self) -> None:
+        self.triggers = None
+
+
+trigger_cache = TriggerCache()
@@ -1,28 +1,19 @@
-from typing import Iterable, Optional
+from typing import Optional, Sequence
 
-from ..data.models import Settings
-from ..data.repositories import SettingsRepository
-from ..data import async_session
+from ..data.models import SettingsSnapshot
 from .base_strategy import BaseStrategy
 
 
 class AvgStrategy(BaseStrategy):
-    def __init__(self):
-        self.repo = SettingsRepository()
-
-    async def evaluate(self, values: Iterable[float]) -> Optional[bool]:
+    def evaluate(self, values: Sequence[float], settings: SettingsSnapshot) -> Optional[bool]:
         if not values:
             return None
 
-        async with async_session() as session:
-            # pylint: disable=unexpected-keyword-arg
-            settings = await self.repo.get(session, Settings.id == 1)
-
-            current_avg = sum(values) / len(list(values))
-            if current_avg < settings.threshold_on:
-                return True
+        current_avg = sum(values) / len(values)
+        if current_avg < settings.threshold_on:
+            return True
 
-            if current_avg > settings.threshold_off:
-                return False
+        if current_avg > settings.threshold_off:
+            return False
 
         return None
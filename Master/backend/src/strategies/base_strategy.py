@@ -1,8 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import Iterable, Optional
+from typing import Optional, Sequence
+
+from ..data.models import SettingsSnapshot
 
 
 class BaseStrategy(ABC):
     @abstractmethod
-    async def evaluate(self, values: Iterable[float]) -> Optional[bool]:
+    def evaluate(self, values: Sequence[float], settings: SettingsSnapshot) -> Optional[bool]:
         raise NotImplementedError('Subclasses must implement this method')
@@ -1 +1,6 @@
 from .config import AppConfig
+from .http import ETagMiddleware, cache_headers, is_not_modified, make_etag
+from .metrics import COUNT_BUCKETS, DURATION_BUCKETS, Histogram, MetricsRegistry, metrics_registry
+from .static_files import SpaStaticFiles
+from .telemetry_codec import DATA_TYPES, decode_readings, is_binary
+from .timestamps import as_utc
@@ -6,18 +6,42 @@ ENV_FILE : str = '/opt/espartan/.env'
 
 
 class AppConfig(BaseSettings):
-    environment                 : str = 'dev'
-    database_url                : str = 'sqlite+aiosqlite:///database.db'
-    mqtt_host                   : str = 'localhost'
-    mqtt_port                   : int = 1883
-    slack_token                 : str = ''
-    slack_channel               : str = ''
-    device_sleep_interval       : int = 600
-    heating_evaluation_interval : int = 10
-    heating_evaluation_strategy : str = 'min'
-    heating_min_temperature     : int = 16
-    outbox_processing_interval  : int = 10
-    sentry_dsn                  : str = ''
+    environment                     : str   = 'dev'
+    database_url                    : str   = 'sqlite+aiosqlite:///database.db'
+    database_read_pool_size         : int   = 5
+    sqlite_journal_mode             : str   = 'WAL'
+    sqlite_synchronous              : str   = 'NORMAL'
+    sqlite_cache_size               : int   = -16000
+    sqlite_mmap_size                : int   = 134217728
+    sqlite_busy_timeout             : int   = 5000
+    sqlite_temp_store               : str   = 'MEMORY'
+    # Settings written through one worker reach the caches and event streams of the others within this many seconds
+    cache_refresh_interval          : int   = 30
+    event_stream_heartbeat          : float = 15.0
+    event_stream_queue_size         : int   = 100
+    event_bridge_retry_delay        : float = 5.0
+    leader_lease_ttl                : float = 30.0
+    mqtt_host                       : str   = 'localhost'
+    mqtt_port                       : int   = 1883
+    slack_token                     : str   = ''
+    slack_channel                   : str   = ''
+    device_sleep_interval           : int   = 600
+    heating_evaluation_interval     : int   = 10
+    heating_evaluation_mode         : str   = 'event'
+    heating_evaluation_debounce     : float = 5.0
+    heating_evaluation_min_spacing  : float = 60.0
+    heating_evaluation_strategy     : str   = 'min'
+    heating_min_temperature         : int   = 16
+    outbox_processing_interval      : int   = 10
+    relay_refresh_interval          : int   = 60
+    telemetry_retention_days        : int   = 7
+    telemetry_rollup_interval       : int   = 60
+    telemetry_rollup_batch_size     : int   = 1000
+    telemetry_history_max_points    : int   = 1000
+    telemetry_ingest_batch_size     : int   = 100
+    telemetry_ingest_flush_interval : float = 0.25
+    telemetry_ingest_capacity       : int   = 10000
+    sentry_dsn                      : str   = ''
 
     model_config = SettingsConfigDict(
         env_file=ENV_FILE if path.exists(ENV_FILE) else '.env',
@@ -0,0 +1,95 @@
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from hashlib import sha1
+from typing import Any, Optional
+
+from fastapi import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .timestamps import as_utc
+
+
+def make_etag(*parts: Any) -> str:
+    return '"' + sha1('|'.join(str(part) for part in parts).encode()).hexdigest() + '"'
+
+
+def cache_headers(etag: str, last_modified: Optional[datetime] = None) -> dict[str, str]:
+    headers = {
+        'Cache-Control' : 'no-cache',
+        'ETag'          : etag,
+    }
+
+    if last_modified is not None:
+        headers['Last-Modified'] = format_datetime(as_utc(last_modified), usegmt=True)
+
+    return headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is not None:
+        return if_none_match.strip() == '*' or etag in [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+
+    if_modified_since = request.headers.get('if-modified-since')
+    if if_modified_since is None or last_modified is None:
+        return False
+
+    try:
+        # HTTP dates have a resolution of one second
+        return as_utc(last_modified).replace(microsecond=0) <= parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+
+class ETagMiddleware:
+    def __init__(self, app: ASGIApp, paths: tuple[str, ...]) -> None:
+        self.app   = app
+        self.paths = paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http' or scope['method'] != 'GET' or not scope['path'].startswith(self.paths):
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        start   : Optional[Message] = None
+        body    : list[bytes]       = []
+
+        # Successful responses are buffered so their ETag can be computed from the body
+        async def send_with_etag(message: Message) -> None:
+            nonlocal start
+
+            if message['type'] == 'http.response.start':
+                if message['status'] == 200:
+                    start = message
+                else:
+                    await send(message)
+            elif start is None:
+                await send(message)
+            else:
+                body.append(message.get('body', b''))
+
+                if not message.get('more_body', False):
+                    content = b''.join(body)
+                    etag    = make_etag(content.decode('latin-1'))
+                    headers = [(key, value) for key, value in start['headers'] if key.lower() not in (b'etag', b'cache-control')]
+                    headers.extend((key.lower().encode('latin-1'), value.encode('latin-1')) for key, value in cache_headers(etag).items())
+
+                    if is_not_modified(request, etag):
+                        await send({
+                            'type'    : 'http.response.start',
+                            'status'  : 304,
+                            'headers' : [(key, value) for key, value in headers if key not in (b'content-length', b'content-type')],
+                        })
+                        await send({
+                            'type' : 'http.response.body',
+                            'body' : b'',
+                        })
+                    else:
+                        await send({**start, 'headers': headers})
+                        await send({
+                            'type' : 'http.response.body',
+                            'body' : content,
+                        })
+
+        await self.app(scope, receive, send_with_etag)
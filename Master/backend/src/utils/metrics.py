@@ -0,0 +1,80 @@
+from typing import Optional
+
+DURATION_BUCKETS : tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS    : tuple[float, ...] = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+class Histogram:
+    def __init__(self, name: str, description: str, buckets: tuple[float, ...] = DURATION_BUCKETS) -> None:
+        self.name        : str                                             = name
+        self.description : str                                             = description
+        self.buckets     : tuple[float, ...]                               = buckets
+        self.series      : dict[tuple[tuple[str, str], ...], list[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key    = tuple(sorted(labels.items()))
+        series = self.series.get(key)
+
+        if series is None:
+            # One cumulative count per bucket, followed by the sum and the count of the observations
+            series           = [0.0] * (len(self.buckets) + 2)
+            self.series[key] = series
+
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[index] += 1
+
+        series[-2] += value
+        series[-1] += 1
+
+    def render(self) -> list[str]:
+        lines = [
+            f'# HELP {self.name} {self.description}',
+            f'# TYPE {self.name} histogram',
+        ]
+
+        for key, series in sorted(self.series.items()):
+            for bound, count in zip(self.buckets, series):
+                lines.append(f'{self.name}_bucket{_format_labels(key, ("le", _format_value(bound)))} {_format_value(count)}')
+
+            lines.append(f'{self.name}_bucket{_format_labels(key, ("le", "+Inf"))} {_format_value(series[-1])}')
+            lines.append(f'{self.name}_sum{_format_labels(key)} {_format_value(series[-2])}')
+            lines.append(f'{self.name}_count{_format_labels(key)} {_format_value(series[-1])}')
+
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self.histograms : dict[str, Histogram] = {}
+
+    def histogram(self, name: str, description: str, buckets: tuple[float, ...] = DURATION_BUCKETS) -> Histogram:
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = Histogram(name, description, buckets)
+
+            self.histograms[name] = histogram
+
+        return histogram
+
+    def render(self) -> str:
+        return '\n'.join(line for name in sorted(self.histograms) for line in self.histograms[name].render()) + '\n'
+
+
+def _format_labels(key: tuple[tuple[str, str], ...], extra: Optional[tuple[str, str]] = None) -> str:
+    labels = list(key) + ([extra] if extra else [])
+    if not labels:
+        return ''
+
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+metrics_registry = MetricsRegistry()
@@ -0,0 +1,116 @@
+from gzip import compress
+from os import path, sep, stat_result
+from typing import Optional
+
+from anyio import to_thread
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+try:
+    from brotli import compress as brotli_compress
+except ImportError:
+    brotli_compress = None
+
+ENCODINGS : tuple[str, ...] = ('br', 'gzip') if brotli_compress else ('gzip',)
+
+COMPRESSIBLE_TYPES : tuple[str, ...] = (
+    'application/javascript',
+    'application/json',
+    'application/manifest+json',
+    'application/xml',
+    'image/svg+xml',
+    'text/',
+)
+
+CACHE_CONTROL_ASSET : str = 'public, max-age=31536000, immutable'
+CACHE_CONTROL_OTHER : str = 'no-cache'
+
+MIN_COMPRESS_SIZE : int = 1024
+MAX_FALLBACKS     : int = 1024
+
+
+# The overrides keep the parameter names of Starlette, which shadow the imports from os
+# pylint: disable=redefined-outer-name
+class SpaStaticFiles(StaticFiles):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+
+        self.asset_directories : list[str]                             = [path.realpath(path.join(directory, 'assets')) + sep for directory in self.all_directories]
+        self.fallbacks         : dict[str, tuple[str, stat_result]] = {}
+        self.compressed        : dict[tuple[str, float, str], bytes]   = {}
+
+    def lookup_path(self, path: str) -> tuple[str, Optional[stat_result]]:
+        # The bundle does not change while the app runs, so deep links resolve to index.html without touching the disk again
+        fallback = self.fallbacks.get(path)
+        if fallback is not None:
+            return fallback
+
+        full_path, stat_result = super().lookup_path(path)
+        if stat_result is None:
+            full_path, stat_result = super().lookup_path('index.html')
+
+            if stat_result is not None and len(self.fallbacks) < MAX_FALLBACKS:
+                self.fallbacks[path] = (full_path, stat_result)
+
+        return full_path, stat_result
+
+    def file_response(self, full_path: str, stat_result: stat_result, scope: Scope, status_code: int = 200) -> Response:
+        response = super().file_response(full_path, stat_result, scope, status_code)
+
+        # Vite fingerprints everything under assets/, so only those files may be cached for good
+        response.headers['Cache-Control'] = CACHE_CONTROL_ASSET if full_path.startswith(tuple(self.asset_directories)) else CACHE_CONTROL_OTHER
+
+        return response
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        response = await super().get_response(path, scope)
+        if not isinstance(response, FileResponse) or response.stat_result is None or not (response.media_type or '').startswith(COMPRESSIBLE_TYPES):
+            return response
+
+        response.headers['Vary'] = 'Accept-Encoding'
+
+        encoding = _get_encoding(Headers(scope=scope).get('accept-encoding', ''))
+        if encoding is None or response.stat_result.st_size < MIN_COMPRESS_SIZE:
+            return response
+
+        content = await to_thread.run_sync(self._compress, str(response.path), response.stat_result, encoding)
+        headers = {key: value for key, value in response.headers.items() if key not in ('content-length', 'content-type', 'etag')}
+
+        headers['Content-Encoding'] = encoding
+        headers['ETag']             = 'W/' + response.headers['etag']
+
+        return Response(content, status_code=response.status_code, headers=headers, media_type=response.media_type)
+
+    def _compress(self, full_path: str, stat_result: stat_result, encoding: str) -> bytes:
+        key     = (full_path, stat_result.st_mtime, encoding)
+        content = self.compressed.get(key)
+
+        if content is None:
+            with open(full_path, 'rb') as file:
+                data = file.read()
+
+            content              = brotli_compress(data) if encoding == 'br' else compress(data, 9)
+            self.compressed[key] = content
+
+        return content
+
+
+def _get_encoding(accept_encoding: str) -> Optional[str]:
+    qualities: dict[str, float] = {}
+
+    for item in accept_encoding.split(','):
+        name, _, parameters = item.partition(';')
+        parameters          = parameters.strip()
+
+        try:
+            qualities[name.strip().lower()] = float(parameters[2:]) if parameters.startswith('q=') else 1.0
+        except ValueError:
+            qualities[name.strip().lower()] = 0.0
+
+    for encoding in ENCODINGS:
+        if qualities.get(encoding, qualities.get('*', 0.0)) > 0:
+            return encoding
+
+    return None
@@ -0,0 +1,50 @@
+from struct import error, unpack_from
+
+# Mirrors the data type table of esparknode, where the position of a data type is its code in binary telemetry
+DATA_TYPES : tuple[str, ...] = (
+    'temperature',
+    'humidity',
+    'battery',
+    'pressure',
+    'air_quality',
+    'light_level',
+    'door_open',
+    'motion',
+    'mail',
+)
+
+ENCODING_VERSION : int = 1
+INT32_FLAG       : int = 0x80
+
+
+def is_binary(payload: bytes) -> bool:
+    # JSON payloads start with a brace, binary ones with the encoding version
+    return len(payload) > 0 and payload[0] == ENCODING_VERSION
+
+
+def decode_readings(payload: bytes) -> list[tuple[str, int]]:
+    try:
+        _, count = unpack_from('<BB', payload)
+
+        readings = []
+        offset   = 2
+
+        for _ in range(count):
+            code = payload[offset]
+
+            if code & INT32_FLAG:
+                value   = unpack_from('<i', payload, offset + 1)[0]
+                offset += 5
+            else:
+                value   = unpack_from('<h', payload, offset + 1)[0]
+                offset += 3
+
+            code &= ~INT32_FLAG
+
+            # Codes appended by newer nodes are skipped rather than failing the whole message
+            if code < len(DATA_TYPES):
+                readings.append((DATA_TYPES[code], value))
+    except (error, IndexError) as e:
+        raise ValueError(f'Malformed binary telemetry: {e}') from e
+
+    return readings
@@ -0,0 +1,6 @@
+from datetime import datetime, timezone
+
+
+def as_utc(timestamp: datetime) -> datetime:
+    # SQLite returns naive timestamps, which are stored in UTC
+    return timestamp.replace(tzinfo=timezone.utc) if timestamp.tzinfo is None else timestamp.astimezone(timezone.utc)
@@ -0,0 +1,14 @@
+from benchmarks.suite import Measurement
+
+
+def test_measurement_summarise():
+    measurement = Measurement(durations=[0.004, 0.001, 0.003, 0.002, 0.010], queries=15)
+
+    assert measurement.summarise() == {
+        'iterations'      : 5,
+        'p50_ms'          : 3.0,
+        'p95_ms'          : 10.0,
+        'mean_ms'         : 4.0,
+        'queries_per_run' : 3.0,
+        'runs_per_second' : 250.0,
+    }
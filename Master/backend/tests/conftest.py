@@ -0,0 +1,41 @@
+from contextlib import contextmanager
+
+from pytest import fixture
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+import src.data.models
+from src.data import count_queries, instrument_engine
+
+
+@fixture
+async def session_factory():
+    engine = create_async_engine('sqlite+aiosqlite://')
+
+    instrument_engine(engine)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    await engine.dispose()
+
+
+@fixture
+async def session(session_factory):
+    async with session_factory() as session:
+        yield session
+
+
+@fixture
+def max_queries():
+    @contextmanager
+    def _max_queries(limit: int):
+        with count_queries() as stats:
+            yield stats
+
+        assert stats.count <= limit, f'{stats.count} queries issued where at most {limit} were expected'
+
+    return _max_queries
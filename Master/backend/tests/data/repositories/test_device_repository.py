@@ -0,0 +1,67 @@
+from datetime import datetime, timezone
+
+from esparkcore.data.models import Device
+from pytest import mark
+from sqlmodel import select
+
+from src.data import ensure_device_capabilities
+from src.data.models import DeviceCapability, RelayState, RelayUsage, TelemetryRollup, Zone
+from src.data.repositories import DeviceRepository
+
+NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+async def _capabilities(session) -> set[tuple[str, str]]:
+    return {(row.device_id, row.capability) for row in (await session.execute(select(DeviceCapability))).scalars().all()}
+
+
+@mark.asyncio
+async def test_capabilities_follow_device_writes(session):
+    repo = DeviceRepository()
+
+    device = await repo.add(session, Device(id='dev1', capabilities='temperature, action_relay', last_seen=NOW))
+    await repo.add(session, Device(id='dev2', capabilities='temperature', last_seen=NOW))
+
+    assert await _capabilities(session) == {('dev1', 'temperature'), ('dev1', 'action_relay'), ('dev2', 'temperature')}
+    assert [device.id for device in await repo.list_by_capability(session, 'action_relay')] == ['dev1']
+
+    await repo.update(session, device, capabilities='humidity')
+
+    assert await _capabilities(session) == {('dev1', 'humidity'), ('dev2', 'temperature')}
+    assert await repo.list_capabilities(session) == {
+        'humidity'    : ['dev1'],
+        'temperature' : ['dev2'],
+    }
+
+    await repo.delete(session, device)
+
+    assert await _capabilities(session) == {('dev2', 'temperature')}
+
+
+@mark.asyncio
+async def test_ensure_device_capabilities_backfills(session):
+    session.add(Device(id='dev1', capabilities='temperature,humidity', last_seen=NOW))
+    await session.commit()
+
+    await ensure_device_capabilities(session)
+    await session.commit()
+
+    assert await _capabilities(session) == {('dev1', 'temperature'), ('dev1', 'humidity')}
+
+
+@mark.asyncio
+async def test_delete_removes_rows_referencing_the_device(session):
+    repo   = DeviceRepository()
+    device = await repo.add(session, Device(id='dev1', capabilities='action_relay', last_seen=NOW))
+
+    session.add(RelayState(device_id='dev1', timestamp=NOW, state=1))
+    session.add(RelayUsage(device_id='dev1', period='hour', bucket=NOW, on_seconds=60.0))
+    session.add(TelemetryRollup(device_id='dev1', data_type='temperature', resolution=3600, bucket=NOW, min_value=1900, max_value=1900, sum_value=1900, count=1))
+    session.add(Zone(name='living', actuator_id='dev1'))
+
+    await session.commit()
+
+    await repo.delete(session, device)
+
+    for model in (DeviceCapability, RelayState, RelayUsage, TelemetryRollup, Zone):
+        assert (await session.execute(select(model))).scalars().all() == []
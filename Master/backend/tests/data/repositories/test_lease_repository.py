@@ -0,0 +1,34 @@
+from datetime import datetime, timedelta, timezone
+
+from pytest import mark
+
+from src.data.repositories import LeaseRepository
+
+NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+@mark.asyncio
+async def test_lease_is_held_by_one_process_until_it_expires(session):
+    repo = LeaseRepository()
+
+    assert await repo.acquire(session, 'leader', 'worker1', 30, NOW)
+    assert not await repo.acquire(session, 'leader', 'worker2', 30, NOW + timedelta(seconds=10))
+    assert await repo.acquire(session, 'leader', 'worker1', 30, NOW + timedelta(seconds=20))
+    assert not await repo.acquire(session, 'leader', 'worker2', 30, NOW + timedelta(seconds=40))
+    assert await repo.acquire(session, 'leader', 'worker2', 30, NOW + timedelta(seconds=51))
+    assert not await repo.acquire(session, 'leader', 'worker1', 30, NOW + timedelta(seconds=60))
+
+
+@mark.asyncio
+async def test_released_lease_can_be_taken_over(session):
+    repo = LeaseRepository()
+
+    assert await repo.acquire(session, 'leader', 'worker1', 30, NOW)
+
+    await repo.release(session, 'leader', 'worker2', NOW + timedelta(seconds=5))
+
+    assert not await repo.acquire(session, 'leader', 'worker2', 30, NOW + timedelta(seconds=10))
+
+    await repo.release(session, 'leader', 'worker1', NOW + timedelta(seconds=10))
+
+    assert await repo.acquire(session, 'leader', 'worker2', 30, NOW + timedelta(seconds=11))
@@ -1,8 +1,12 @@
+from datetime import datetime, timezone
+
+from esparkcore.data.models import Device
 from pytest import mark
+from sqlmodel import select
 
 from unittest.mock import AsyncMock
 
-from src.data.models import Relay
+from src.data.models import Relay, RelayState
 from src.data.repositories import RelayRepository
 
 
@@ -10,9 +14,8 @@ from src.data.repositories import RelayRepository
 async def test_get_current_state():
     repo    = RelayRepository()
     session = AsyncMock()
-    relay   = Relay(device_id='dev1', state=1)
 
-    repo.list = AsyncMock(return_value=[relay])
+    session.get = AsyncMock(return_value=RelayState(device_id='dev1', state=1))
 
     state = await repo.get_current_state(session, 'dev1')
 
@@ -30,3 +33,39 @@ async def test_get_latest():
     latest = await repo.get_latest(session, 'dev1')
 
     assert latest == relay
+
+
+@mark.asyncio
+async def test_record_transition_stores_transitions_only(session):
+    repo = RelayRepository()
+
+    session.add(Device(id='dev1', capabilities='action_relay', last_seen=datetime.now(timezone.utc)))
+
+    await repo.record_transition(session, 'dev1', 1, datetime(2025, 1, 1, 10, 0, tzinfo=timezone.utc))
+    await repo.record_transition(session, 'dev1', 1, datetime(2025, 1, 1, 10, 10, tzinfo=timezone.utc))
+    await repo.record_transition(session, 'dev1', 0, datetime(2025, 1, 1, 10, 20, tzinfo=timezone.utc))
+    await session.commit()
+
+    assert [relay.state for relay in (await session.execute(select(Relay).order_by(Relay.timestamp))).scalars().all()] == [1, 0]
+    assert await repo.get_current_state(session, 'dev1') == 0
+    assert [state.device_id for state in await repo.list_current(session, ['dev1', 'dev2'])] == ['dev1']
+
+
+@mark.asyncio
+async def test_list_usage(session):
+    repo = RelayRepository()
+
+    session.add(Device(id='dev1', capabilities='action_relay', last_seen=datetime.now(timezone.utc)))
+
+    await repo.record_transition(session, 'dev1', 1, datetime(2025, 1, 1, 9, 30, tzinfo=timezone.utc))
+    await repo.record_transition(session, 'dev1', 0, datetime(2025, 1, 1, 10, 15, tzinfo=timezone.utc))
+    await repo.record_transition(session, 'dev1', 1, datetime(2025, 1, 1, 10, 45, tzinfo=timezone.utc))
+    await session.commit()
+
+    hours = await repo.list_usage(session, 'dev1', 'hour', datetime(2025, 1, 1, 9, 0, tzinfo=timezone.utc), datetime(2025, 1, 1, 11, 30, tzinfo=timezone.utc))
+
+    assert [(usage.bucket.hour, usage.on_seconds) for usage in hours] == [(9, 1800.0), (10, 1800.0), (11, 1800.0)]
+
+    days = await repo.list_usage(session, 'dev1', 'day', datetime(2025, 1, 1, tzinfo=timezone.utc), datetime(2025, 1, 1, 11, 30, tzinfo=timezone.utc))
+
+    assert [usage.on_seconds for usage in days] == [5400.0]
@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta, timezone
+
+from esparkcore.data.models import Device, Telemetry
+from pytest import mark
+from sqlmodel import select
+
+from src.data.repositories import TelemetryRepository
+
+
+async def _seed(session) -> datetime:
+    now = datetime.now(timezone.utc)
+
+    for device_id in ('dev1', 'dev2', 'dev3'):
+        session.add(Device(id=device_id, capabilities='temperature,humidity', last_seen=now))
+
+    session.add(Telemetry(device_id='dev1', data_type='temperature', value=1800, timestamp=now - timedelta(minutes=10)))
+    session.add(Telemetry(device_id='dev1', data_type='temperature', value=1900, timestamp=now))
+    session.add(Telemetry(device_id='dev1', data_type='humidity', value=5000, timestamp=now))
+    session.add(Telemetry(device_id='dev2', data_type='temperature', value=2000, timestamp=now - timedelta(minutes=5)))
+    session.add(Telemetry(device_id='dev3', data_type='temperature', value=2100, timestamp=now))
+
+    await session.commit()
+
+    return now
+
+
+@mark.asyncio
+async def test_list_latest_by_data_type(session):
+    await _seed(session)
+
+    results = await TelemetryRepository().list_latest(session, 'temperature')
+
+    assert {item.device_id: item.value for item in results} == {
+        'dev1' : 1900,
+        'dev2' : 2000,
+        'dev3' : 2100,
+    }
+
+
+@mark.asyncio
+async def test_list_latest_by_device_ids(session):
+    await _seed(session)
+
+    results = await TelemetryRepository().list_latest(session, device_ids=['dev1'])
+
+    assert {item.data_type: item.value for item in results} == {
+        'temperature' : 1900,
+        'humidity'    : 5000,
+    }
+
+
+@mark.asyncio
+async def test_list_latest_without_device_ids(session):
+    await _seed(session)
+
+    assert await TelemetryRepository().list_latest(session, 'temperature', []) == []
+
+
+@mark.asyncio
+async def test_list_series(session):
+    start = datetime(2025, 1, 1, 10, tzinfo=timezone.utc)
+
+    session.add(Device(id='dev1', capabilities='temperature', last_seen=start))
+
+    for minutes, value in ((0, 1800), (20, 2000), (59, 2200), (60, 1000), (130, 1500)):
+        session.add(Telemetry(device_id='dev1', data_type='temperature', value=value, timestamp=start + timedelta(minutes=minutes)))
+
+    await session.commit()
+
+    results = await TelemetryRepository().list_series(session, ['dev1'], 'temperature', start, start + timedelta(hours=2), 3600)
+
+    assert sorted(tuple(row) for row in results) == [
+        ('dev1', int(start.timestamp()), 1800, 2200, 6000, 3),
+        ('dev1', int(start.timestamp()) + 3600, 1000, 1000, 1000, 1),
+    ]
+
+
+@mark.asyncio
+async def test_add_all_inserts_rows_and_assigns_ids(session):
+    repo      = TelemetryRepository()
+    timestamp = datetime.now(timezone.utc)
+    rows      = [Telemetry(device_id='dev1', data_type='temperature', value=value, timestamp=timestamp) for value in (1900, 2000, 1900)]
+
+    await repo.add_all(session, rows)
+
+    stored = {telemetry.id: telemetry.value for telemetry in (await session.execute(select(Telemetry))).scalars().all()}
+
+    assert sorted(telemetry.id for telemetry in rows) == sorted(stored)
+    assert all(stored[telemetry.id] == telemetry.value for telemetry in rows)
+
+
+@mark.asyncio
+async def test_add_all_writes_rows_stored_differently_once(session):
+    repo = TelemetryRepository()
+
+    await repo.add_all(session, [Telemetry(device_id='dev1', data_type='temperature', value='21', timestamp=datetime.now(timezone.utc))])
+
+    assert [telemetry.value for telemetry in (await session.execute(select(Telemetry))).scalars().all()] == [21]
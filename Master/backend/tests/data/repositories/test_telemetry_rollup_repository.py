@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta, timezone
+
+from esparkcore.data.models import Device, Telemetry
+from pytest import mark
+from sqlmodel import select
+
+from src.data.models import TelemetryRollup
+from src.data.repositories import TelemetryRollupRepository
+
+NOW = datetime(2025, 1, 10, 12, 0, tzinfo=timezone.utc)
+
+
+async def _seed(session) -> None:
+    session.add(Device(id='dev1', capabilities='temperature', last_seen=NOW))
+
+    for minutes, value in ((0, 1800), (1, 2000), (2, 2200), (6, 1000)):
+        session.add(Telemetry(device_id='dev1', data_type='temperature', value=value, timestamp=NOW - timedelta(days=8, minutes=-minutes)))
+
+    session.add(Telemetry(device_id='dev1', data_type='temperature', value=2100, timestamp=NOW))
+
+    await session.commit()
+
+
+@mark.asyncio
+async def test_rollup_aggregates_and_deletes_old_rows(session):
+    await _seed(session)
+
+    repo = TelemetryRollupRepository()
+
+    assert await repo.rollup(session, NOW - timedelta(days=7), 100) == 4
+    await session.commit()
+
+    remaining = (await session.execute(select(Telemetry))).scalars().all()
+    assert [telemetry.value for telemetry in remaining] == [2100]
+
+    rollups = await repo.list_range(session, 'dev1', 300, NOW - timedelta(days=9))
+    assert sorted((rollup.min_value, rollup.max_value, rollup.count, rollup.avg_value) for rollup in rollups) == [
+        (1000, 1000, 1, 1000),
+        (1800, 2200, 3, 2000),
+    ]
+
+    days = await repo.list_range(session, 'dev1', 86400, NOW - timedelta(days=9))
+    assert [(rollup.min_value, rollup.max_value, rollup.sum_value, rollup.count) for rollup in days] == [(1000, 2200, 7000, 4)]
+
+
+@mark.asyncio
+async def test_rollup_merges_batches_into_existing_buckets(session):
+    await _seed(session)
+
+    repo = TelemetryRollupRepository()
+
+    assert await repo.rollup(session, NOW - timedelta(days=7), 2) == 2
+    assert await repo.rollup(session, NOW - timedelta(days=7), 2) == 2
+    assert await repo.rollup(session, NOW - timedelta(days=7), 2) == 0
+    await session.commit()
+
+    hours = (await session.execute(select(TelemetryRollup).where(TelemetryRollup.resolution == 3600))).scalars().all()
+    assert [(rollup.min_value, rollup.max_value, rollup.sum_value, rollup.count) for rollup in hours] == [(1000, 2200, 7000, 4)]
+
+
+@mark.asyncio
+async def test_rollup_keeps_latest_reading(session):
+    session.add(Device(id='dev1', capabilities='temperature', last_seen=NOW))
+    session.add(Telemetry(device_id='dev1', data_type='temperature', value=1800, timestamp=NOW - timedelta(days=30)))
+    await session.commit()
+
+    assert await TelemetryRollupRepository().rollup(session, NOW - timedelta(days=7), 100) == 0
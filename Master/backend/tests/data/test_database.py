@@ -0,0 +1,57 @@
+from types import SimpleNamespace
+
+from esparkcore.data.database import engine as write_engine
+from pytest import mark, raises
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.data import apply_read_only, apply_sqlite_profile, get_request_session, read_engine
+
+
+@mark.asyncio
+async def test_apply_sqlite_profile(tmp_path):
+    engine = create_async_engine(f'sqlite+aiosqlite:///{tmp_path / "database.db"}')
+
+    apply_sqlite_profile(engine)
+
+    async with engine.connect() as conn:
+        assert (await conn.execute(text('PRAGMA journal_mode'))).scalar_one() == 'wal'
+        assert (await conn.execute(text('PRAGMA synchronous'))).scalar_one() == 1
+        assert (await conn.execute(text('PRAGMA busy_timeout'))).scalar_one() == 5000
+        assert (await conn.execute(text('PRAGMA temp_store'))).scalar_one() == 2
+
+    await engine.dispose()
+
+
+@mark.asyncio
+async def test_apply_read_only_rejects_writes(tmp_path):
+    engine = create_async_engine(f'sqlite+aiosqlite:///{tmp_path / "database.db"}')
+
+    async with engine.begin() as conn:
+        await conn.execute(text('CREATE TABLE item (id INTEGER PRIMARY KEY)'))
+
+    await engine.dispose()
+
+    apply_read_only(engine)
+
+    async with engine.connect() as conn:
+        assert (await conn.execute(text('SELECT COUNT(*) FROM item'))).scalar_one() == 0
+
+        with raises(OperationalError):
+            await conn.execute(text('INSERT INTO item (id) VALUES (1)'))
+
+    await engine.dispose()
+
+
+@mark.asyncio
+@mark.parametrize('method, engine', [
+    ('GET', read_engine),
+    ('HEAD', read_engine),
+    ('POST', write_engine),
+    ('PUT', write_engine),
+    ('DELETE', write_engine),
+])
+async def test_get_request_session_reads_only_safe_methods_from_the_read_pool(method, engine):
+    async for session in get_request_session(SimpleNamespace(method=method)):
+        assert session.bind is engine
@@ -0,0 +1,86 @@
+from datetime import datetime, timezone
+from re import match
+from unittest.mock import AsyncMock, MagicMock
+
+from pytest import fixture, mark
+from sqlalchemy import create_engine, inspect, text
+from sqlmodel import SQLModel
+
+from src.data import ensure_indexes
+from src.data.repositories import DeviceRepository, RelayRepository, TelemetryRepository, TelemetryRollupRepository
+
+SINCE = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+@fixture
+def connection():
+    engine = create_engine('sqlite://')
+
+    SQLModel.metadata.create_all(engine)
+
+    with engine.connect() as conn:
+        yield conn
+
+
+def _capture():
+    statements = []
+
+    async def execute(statement):
+        statements.append(statement)
+
+        return MagicMock()
+
+    session = AsyncMock()
+    session.execute = execute
+
+    return session, statements
+
+
+def _plan(connection, statement) -> list[str]:
+    compiled = statement.compile(dialect=connection.dialect, compile_kwargs={'render_postcompile': True})
+    params   = tuple(compiled.params[name] for name in compiled.positiontup)
+
+    return [row[-1] for row in connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {compiled}', params).all()]
+
+
+@mark.asyncio
+async def test_hot_queries_use_indexes(connection):
+    session, statements = _capture()
+
+    device_repo    = DeviceRepository()
+    relay_repo     = RelayRepository()
+    rollup_repo    = TelemetryRollupRepository()
+    telemetry_repo = TelemetryRepository()
+
+    await device_repo.list_by_capability(session, 'action_relay')
+    await relay_repo.get_latest(session, 'dev1')
+    await relay_repo.list_recent(session, 'dev1', SINCE)
+    await telemetry_repo.get_latest_for_device(session, 'dev1', 'temperature')
+    await telemetry_repo.list_latest(session, 'temperature', ['dev1', 'dev2'])
+    await rollup_repo.list_range(session, 'dev1', 3600, SINCE)
+
+    assert len(statements) == 6
+
+    for statement in statements:
+        for line in _plan(connection, statement):
+            scan = match(r'^SCAN (\w+)$', line)
+
+            assert not (scan and scan.group(1) in SQLModel.metadata.tables), f'Full table scan in query plan of:\n{statement}'
+            assert 'TEMP B-TREE FOR ORDER BY' not in line, f'Unindexed sort in query plan of:\n{statement}'
+
+
+def test_ensure_indexes_migrates_existing_tables():
+    engine = create_engine('sqlite://')
+
+    SQLModel.metadata.create_all(engine)
+
+    with engine.begin() as conn:
+        conn.execute(text('DROP INDEX ix_relay_device_id_timestamp'))
+        conn.execute(text("INSERT INTO relay (device_id, timestamp, state) VALUES ('dev1', '2025-01-01 00:00:00', 1)"))
+
+    with engine.begin() as conn:
+        ensure_indexes(conn)
+
+    with engine.connect() as conn:
+        assert 'ix_relay_device_id_timestamp' in {index['name'] for index in inspect(conn).get_indexes('relay')}
+        assert conn.execute(text('SELECT COUNT(*) FROM relay')).scalar_one() == 1
@@ -0,0 +1,68 @@
+from datetime import datetime, timezone
+
+from esparkcore.data.models import Device, Telemetry
+from esparkcore.routers.base_router import BaseRouter
+from httpx import ASGITransport, AsyncClient
+from pytest import fixture, mark
+
+from src.data import get_request_session
+from src.data.models import RelayState
+from src.main import app
+from src.services import telemetry_cache
+
+
+@fixture
+async def client(session_factory):
+    async def get_session():
+        async with session_factory() as session:
+            yield session
+
+    now = datetime.now(timezone.utc)
+
+    async with session_factory() as session:
+        for index in range(20):
+            session.add(Device(id=f'dev{index}', capabilities='temperature,battery', last_seen=now))
+
+        session.add(RelayState(device_id='dev0', timestamp=now, state=1))
+
+        await session.commit()
+
+    telemetry_cache.clear()
+
+    for index in range(20):
+        telemetry_cache.put(Telemetry(id=index, device_id=f'dev{index}', data_type='battery', value=90, timestamp=now))
+
+    # pylint: disable=protected-access
+    app.dependency_overrides[BaseRouter._get_session] = get_session
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url='http://test') as client:
+        yield client
+
+    app.dependency_overrides[BaseRouter._get_session] = get_request_session
+
+    telemetry_cache.clear()
+
+
+@mark.asyncio
+@mark.parametrize('url, limit', [
+    ('/api/v1/devices/all?limit=20', 2),
+    ('/api/v1/relays/current/dev0', 1),
+    ('/api/v1/telemetry/recent?offset=60', 1),
+])
+async def test_endpoint_query_counts(client, max_queries, url, limit):
+    with max_queries(limit):
+        response = await client.get(url)
+
+    assert response.status_code == 200
+    assert 'queries' in response.headers['Server-Timing']
+
+
+@mark.asyncio
+async def test_metrics_endpoint(client):
+    await client.get('/api/v1/relays/current/dev0')
+
+    response = await client.get('/metrics')
+
+    assert response.status_code == 200
+    assert response.headers['Content-Type'].startswith('text/plain')
+    assert 'espartan_http_request_queries_count{method="GET",route="/api/v1/relays/current/{device_id}"}' in response.text
@@ -1,8 +1,16 @@
-from pytest import fixture
+from datetime import datetime, timedelta, timezone
+from json import loads
+from unittest.mock import AsyncMock, MagicMock
+
+from esparkcore.data.models import Device, Telemetry
+from pytest import fixture, mark
 
 from fastapi.testclient import TestClient
 
+from src.data.models import Relay, RelayState, RelayUsage, Settings, TelemetryRollup
 from src.main import app
+from src.routers import DeviceRouter, RelayRouter, TelemetryRouter
+from src.services import refresh_tracker, settings_cache, telemetry_cache
 
 
 @fixture
@@ -22,26 +30,262 @@ def async_monkeypatch(monkeypatch):
 
 
 def test_relay_current_state(client, monkeypatch):
-    async def async_get_current_state(self, session, device_id):
-        return 1
+    async def async_get_current(self, session, device_id):
+        return RelayState(device_id=device_id, timestamp=datetime(2025, 1, 1, 10, tzinfo=timezone.utc), state=1)
 
-    monkeypatch.setattr('src.routers.relay.RelayRepository.get_current_state', async_get_current_state)
+    monkeypatch.setattr('src.routers.relay.RelayRepository.get_current', async_get_current)
 
     response = client.get('/api/v1/relays/current/dev1')
 
     assert response.status_code == 200
     assert response.json() == 1
+    assert response.headers['Last-Modified'] == 'Wed, 01 Jan 2025 10:00:00 GMT'
+
+    assert client.get('/api/v1/relays/current/dev1', headers={'If-None-Match': response.headers['ETag']}).status_code == 304
+    assert client.get('/api/v1/relays/current/dev1', headers={'If-Modified-Since': response.headers['Last-Modified']}).status_code == 304
+    assert client.get('/api/v1/relays/current/dev1', headers={'If-Modified-Since': 'Wed, 01 Jan 2025 09:59:59 GMT'}).status_code == 200
 
 
 def test_settings_get_by_id(client, monkeypatch):
+    calls = []
+
+    async def async_get(self, session, *args, **kwargs):
+        calls.append(args)
+
+        return Settings(id=1, threshold_on=17.0, threshold_off=18.0)
+
+    monkeypatch.setattr('src.services.settings.SettingsRepository.get', async_get)
+
+    settings_cache.invalidate()
+
+    try:
+        response = client.get('/api/v1/settings/1')
+
+        assert response.status_code == 200
+        assert response.json()['id'] == 1
+
+        response = client.get('/api/v1/settings/1', headers={'If-None-Match': response.headers['ETag']})
+
+        assert response.status_code == 304
+        assert len(calls) == 1
+    finally:
+        settings_cache.invalidate()
+
+
+def test_device_get_by_id_etag(client, monkeypatch):
     async def async_get(self, session, *args, **kwargs):
-        return {
-            'id' : 1,
-        }
+        return Device(id='dev1', capabilities='temperature', last_seen=datetime(2025, 1, 1, tzinfo=timezone.utc))
+
+    monkeypatch.setattr('esparkcore.data.repositories.DeviceRepository.get', async_get)
+
+    response = client.get('/api/v1/devices/dev1')
+
+    assert response.status_code == 200
+    assert response.json()['id'] == 'dev1'
+
+    response = client.get('/api/v1/devices/dev1', headers={'If-None-Match': response.headers['ETag']})
 
-    monkeypatch.setattr('src.routers.settings.SettingsRepository.get', async_get)
+    assert response.status_code == 304
+    assert response.content == b''
 
-    response = client.get('/api/v1/settings/1')
+
+def test_telemetry_recent(client, monkeypatch):
+    async def async_list(self, session, *args, **kwargs):
+        return [Device(id='dev1', capabilities='temperature,action_relay', last_seen=datetime.now(timezone.utc))]
+
+    monkeypatch.setattr('src.routers.telemetry.DeviceRepository.list', async_list)
+
+    telemetry_cache.clear()
+    telemetry_cache.put(Telemetry(id=1, device_id='dev1', data_type='temperature', value=1900, timestamp=datetime.now(timezone.utc)))
+
+    response = client.get('/api/v1/telemetry/recent?offset=60')
 
     assert response.status_code == 200
-    assert response.json()['id'] == 1
+    assert response.headers['X-Total-Count'] == '1'
+    assert response.json()[0]['value'] == 1900
+
+
+@mark.asyncio
+async def test_telemetry_update_refreshes_cache():
+    timestamp = datetime.now(timezone.utc)
+
+    telemetry_cache.clear()
+    telemetry_cache.put(Telemetry(id=1, device_id='dev1', data_type='battery', value=90, timestamp=timestamp))
+
+    await TelemetryRouter()._after_update(Telemetry(id=1, device_id='dev1', data_type='battery', value=80, timestamp=timestamp), AsyncMock())
+
+    assert telemetry_cache.get('dev1', 'battery').value == 80
+
+    telemetry_cache.clear()
+
+
+def test_relay_usage(client, monkeypatch):
+    async def async_list_usage(self, session, device_id, period, since, now):
+        return [RelayUsage(device_id=device_id, period=period, bucket=datetime(2025, 1, 1, 10, tzinfo=timezone.utc), on_seconds=900.0)]
+
+    monkeypatch.setattr('src.routers.relay.RelayRepository.list_usage', async_list_usage)
+
+    response = client.get('/api/v1/relays/usage/dev1?period=hour')
+
+    assert response.status_code == 200
+    assert response.json()[0]['duty_cycle'] == 0.25
+
+
+def test_telemetry_history_reads_rollups_beyond_retention(client, monkeypatch):
+    now = datetime.now(timezone.utc)
+
+    async def async_list(self, session, *args, **kwargs):
+        return [Telemetry(id=1, device_id='dev1', data_type='temperature', value=1900, timestamp=now)]
+
+    async def async_list_range(self, session, device_id, resolution, since, until):
+        assert resolution == 3600
+        return [TelemetryRollup(device_id=device_id, data_type='temperature', resolution=resolution, bucket=now - timedelta(days=10), min_value=1000, max_value=2000, sum_value=3000, count=2)]
+
+    monkeypatch.setattr('src.routers.telemetry.TelemetryRepository.list', async_list)
+    monkeypatch.setattr('src.routers.telemetry.TelemetryRollupRepository.list_range', async_list_range)
+
+    response = client.get(f'/api/v1/telemetry/history?device_id=dev1&offset={30 * 86400}')
+
+    assert response.status_code == 200
+    assert response.headers['X-Total-Count'] == '2'
+    assert [item['value'] for item in response.json()] == [1900, 1500]
+
+
+def test_telemetry_history_picks_the_resolution_from_the_span_beyond_retention(client, monkeypatch):
+    resolutions = []
+
+    async def async_list(self, session, *args, **kwargs):
+        return []
+
+    async def async_list_range(self, session, device_id, resolution, since, until):
+        resolutions.append(resolution)
+        return []
+
+    monkeypatch.setattr('src.routers.telemetry.TelemetryRepository.list', async_list)
+    monkeypatch.setattr('src.routers.telemetry.TelemetryRollupRepository.list_range', async_list_range)
+
+    assert client.get(f'/api/v1/telemetry/history?device_id=dev1&offset={8 * 86400}').status_code == 200
+    assert resolutions == [300]
+
+
+def test_telemetry_series_merges_raw_rows_and_rollups(client, monkeypatch):
+    bucket = int(datetime.now(timezone.utc).timestamp()) // 86400 * 86400 - 10 * 86400
+
+    async def async_list_series(self, session, device_ids, data_type, since, until, width):
+        return [('dev1', bucket, 1500, 1500, 1500, 1)]
+
+    async def async_list_rollup_series(self, session, device_ids, data_type, resolution, since, until, width):
+        assert resolution == 86400
+        return [('dev1', bucket, 1000, 2000, 3000, 2)]
+
+    monkeypatch.setattr('src.routers.telemetry.TelemetryRepository.list_series', async_list_series)
+    monkeypatch.setattr('src.routers.telemetry.TelemetryRollupRepository.list_series', async_list_rollup_series)
+
+    response = client.get(f'/api/v1/telemetry/series?device_id=dev1&data_type=temperature&offset={30 * 86400}&bucket=86400')
+
+    assert response.status_code == 200
+    assert response.json() == [{
+        'device_id' : 'dev1',
+        'data_type' : 'temperature',
+        'bucket'    : datetime.fromtimestamp(bucket, timezone.utc).isoformat().replace('+00:00', 'Z'),
+        'min'       : 1000,
+        'avg'       : 1500,
+        'max'       : 2000,
+        'count'     : 3,
+    }]
+
+
+def test_telemetry_series_rejects_too_many_buckets(client):
+    response = client.get(f'/api/v1/telemetry/series?device_id=dev1&data_type=temperature&offset={365 * 86400}&bucket=60')
+
+    assert response.status_code == 400
+
+
+@mark.asyncio
+async def test_device_parameters_are_published_with_a_version(monkeypatch):
+    client = MagicMock(publish=AsyncMock())
+
+    monkeypatch.setattr('src.routers.device.Client', MagicMock(return_value=MagicMock(__aenter__=AsyncMock(return_value=client), __aexit__=AsyncMock(return_value=None))))
+
+    router = DeviceRouter()
+
+    await router._publish_update(Device(id='dev1', capabilities='temperature', parameters={'sleep_interval': 300}))
+    await router._publish_update(Device(id='dev1', capabilities='temperature', parameters={'sleep_interval': 600}))
+
+    first, second = [loads(call.kwargs['payload']) for call in client.publish.await_args_list]
+
+    assert first['sleep_interval'] == 300
+    assert second['version'] >= first['version']
+    assert client.publish.await_args.kwargs['retain'] is True
+
+
+@mark.asyncio
+async def test_device_capabilities_are_invalidated_after_the_update_commits(monkeypatch):
+    cache = MagicMock()
+
+    monkeypatch.setattr('src.routers.device.capability_cache', cache)
+    monkeypatch.setattr('esparkcore.routers.device_router.DeviceRouter._after_update', AsyncMock())
+
+    router  = DeviceRouter()
+    session = MagicMock(info={})
+    device  = Device(id='dev1', capabilities='temperature')
+
+    await router._before_update(device, {'capabilities': 'temperature,action_relay'}, session)
+
+    cache.invalidate.assert_not_called()
+
+    await router._after_update(device, session)
+
+    cache.invalidate.assert_called_once()
+
+    await router._before_update(device, {'display_name': 'Living room'}, session)
+    await router._after_update(device, session)
+
+    cache.invalidate.assert_called_once()
+
+
+
+@mark.asyncio
+async def test_relay_writes_keep_the_current_state_in_sync(session):
+    router = RelayRouter()
+    repo   = router.repo
+
+    session.add(Device(id='dev1', capabilities='action_relay', last_seen=datetime.now(timezone.utc)))
+
+    first  = await repo.add(session, Relay(device_id='dev1', timestamp=datetime(2025, 1, 1, 10, tzinfo=timezone.utc), state=1))
+    await router._after_add(first, session)
+
+    second = await repo.add(session, Relay(device_id='dev1', timestamp=datetime(2025, 1, 1, 11, tzinfo=timezone.utc), state=0))
+    await router._after_add(second, session)
+
+    assert await repo.get_current_state(session, 'dev1') == 0
+
+    await router._before_update(second, {'state': 1}, session)
+    await repo.update(session, second, state=1)
+    await router._after_update(second, session)
+
+    assert await repo.get_current_state(session, 'dev1') == 1
+
+    for relay, state in ((second, 1), (first, None)):
+        await router._before_delete(relay, session)
+        await repo.delete(session, relay)
+        await router._after_delete(relay, session)
+
+        assert await repo.get_current_state(session, 'dev1') == state
+
+
+@mark.asyncio
+async def test_device_delete_prunes_the_refresh_time(session):
+    router = DeviceRouter()
+    device = Device(id='dev1', capabilities='action_relay', last_seen=datetime.now(timezone.utc))
+
+    session.add(device)
+    await session.commit()
+
+    refresh_tracker.mark('dev1', datetime.now(timezone.utc))
+
+    await router._before_delete(device, session)
+    await router.repo.delete(session, device)
+    await router._after_delete(device, session)
+
+    assert refresh_tracker.get('dev1') is None
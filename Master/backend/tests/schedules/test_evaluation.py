@@ -0,0 +1,181 @@
+from datetime import datetime, timezone
+
+from esparkcore.data.models import Device, OutboxEvent, Telemetry
+from pytest import fixture, mark
+from sqlmodel import select
+
+from src.data import ensure_device_capabilities
+from src.data.models import RelayState, SettingsSnapshot, Zone
+from src.schedules import evaluate
+from src.services import capability_cache, event_bus, refresh_tracker, settings_cache, telemetry_cache
+
+
+@fixture
+async def fleet(session_factory, monkeypatch):
+    monkeypatch.setattr('src.schedules.evaluation.async_session', session_factory)
+    monkeypatch.setattr('src.services.capabilities.async_session', session_factory)
+
+    now = datetime.now(timezone.utc)
+
+    async with session_factory() as session:
+        session.add(Device(id='relay1', capabilities='action_relay,temperature', last_seen=now))
+        session.add(Device(id='relay2', capabilities='action_relay', last_seen=now))
+        session.add(Device(id='sensor1', capabilities='temperature,humidity', last_seen=now))
+        session.add(Device(id='sensor2', capabilities='temperature,humidity', last_seen=now))
+
+        await session.flush()
+        await ensure_device_capabilities(session)
+        await session.commit()
+
+    capability_cache.invalidate()
+
+    settings_cache.snapshot = SettingsSnapshot(threshold_on=17.5, threshold_off=18.5, decision_strategy='min')
+
+    telemetry_cache.clear()
+    telemetry_cache.put(Telemetry(id=1, device_id='relay1', data_type='temperature', value=1700, timestamp=now))
+    telemetry_cache.put(Telemetry(id=2, device_id='sensor1', data_type='temperature', value=1900, timestamp=now))
+    telemetry_cache.put(Telemetry(id=3, device_id='sensor2', data_type='temperature', value=2000, timestamp=now))
+
+    yield session_factory
+
+    capability_cache.invalidate()
+    settings_cache.invalidate()
+    telemetry_cache.clear()
+
+
+async def _states(session_factory) -> dict[str, int]:
+    async with session_factory() as session:
+        relays = (await session.execute(select(RelayState))).scalars().all()
+        events = (await session.execute(select(OutboxEvent))).scalars().all()
+
+    assert {event.device_id: int(event.payload['state']) for event in events} == {relay.device_id: relay.state for relay in relays}
+
+    return {relay.device_id: relay.state for relay in relays}
+
+
+@mark.asyncio
+async def test_evaluate_without_zones(fleet):
+    await evaluate()
+
+    assert await _states(fleet) == {
+        'relay1' : 1,
+        'relay2' : 1,
+    }
+
+
+@mark.asyncio
+async def test_evaluate_with_zones(fleet):
+    async with fleet() as session:
+        session.add(Zone(name='living', actuator_id='relay1', sensor_ids='relay1'))
+        session.add(Zone(name='bedroom', actuator_id='relay2', sensor_ids='sensor1,sensor2', threshold_on=21.0, threshold_off=22.0))
+
+        await session.commit()
+
+    await evaluate()
+
+    assert await _states(fleet) == {
+        'relay1' : 1,
+        'relay2' : 1,
+    }
+
+    async with fleet() as session:
+        zone = (await session.execute(select(Zone).where(Zone.name == 'bedroom'))).scalars().one()
+        zone.threshold_on  = 17.0
+        zone.threshold_off = 18.0
+
+        await session.commit()
+
+    await evaluate()
+
+    assert await _states(fleet) == {
+        'relay1' : 1,
+        'relay2' : 0,
+    }
+
+
+@mark.asyncio
+async def test_evaluate_keeps_actuators_without_a_zone(fleet):
+    async with fleet() as session:
+        session.add(Zone(name='bedroom', actuator_id='relay2', sensor_ids='sensor1,sensor2', threshold_on=17.0, threshold_off=18.0))
+
+        await session.commit()
+
+    await evaluate()
+
+    assert await _states(fleet) == {
+        'relay1' : 1,
+        'relay2' : 0,
+    }
+
+
+@mark.asyncio
+async def test_evaluate_notifies_dispatcher(fleet, monkeypatch):
+    notified = []
+
+    monkeypatch.setattr('src.schedules.evaluation.outbox_dispatcher.notify', notified.append)
+
+    await evaluate()
+
+    assert sorted(notified) == ['relay1', 'relay2']
+
+    await evaluate()
+
+    assert sorted(notified) == ['relay1', 'relay2']
+
+
+@mark.asyncio
+async def test_evaluate_publishes_transitions(fleet):
+    subscription = event_bus.subscribe(['relay1'])
+
+    try:
+        await evaluate()
+        await evaluate()
+    finally:
+        event_bus.unsubscribe(subscription)
+
+    assert subscription.queue.qsize() == 1
+
+    event = subscription.queue.get_nowait()
+
+    assert (event.event_type, event.device_id, event.payload['state']) == ('relay', 'relay1', 1)
+
+
+@mark.asyncio
+async def test_evaluate_skips_unchanged_decisions(fleet):
+    await evaluate()
+
+    async with fleet() as session:
+        for event in (await session.execute(select(OutboxEvent))).scalars().all():
+            await session.delete(event)
+
+        relays = (await session.execute(select(RelayState))).scalars().all()
+
+        await session.commit()
+
+    await evaluate()
+
+    async with fleet() as session:
+        assert (await session.execute(select(OutboxEvent))).scalars().all() == []
+        assert [(relay.device_id, relay.timestamp) for relay in (await session.execute(select(RelayState))).scalars().all()] == [(relay.device_id, relay.timestamp) for relay in relays]
+
+
+@mark.asyncio
+async def test_evaluate_refreshes_stale_state(fleet, monkeypatch):
+    await evaluate()
+
+    monkeypatch.setattr('src.schedules.evaluation.app_config.relay_refresh_interval', 1)
+    refresh_tracker.reset()
+
+    async with fleet() as session:
+        for event in (await session.execute(select(OutboxEvent))).scalars().all():
+            await session.delete(event)
+
+        for relay in (await session.execute(select(RelayState))).scalars().all():
+            relay.timestamp = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+        await session.commit()
+
+    await evaluate()
+
+    async with fleet() as session:
+        assert {event.device_id for event in (await session.execute(select(OutboxEvent))).scalars().all()} == {'relay1', 'relay2'}
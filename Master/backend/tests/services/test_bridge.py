@@ -0,0 +1,66 @@
+from json import dumps
+from unittest.mock import MagicMock
+
+from src.services import EventBus, EventBridge
+
+
+def test_bridge_publishes_telemetry_to_listeners():
+    listener = MagicMock()
+
+    bridge = EventBridge()
+    bridge.add_listener(listener)
+    bridge.handle('espark/telemetry/thermo1', dumps({
+        'readings' : [['temperature', 2150], ['humidity', 4500, 60]],
+    }).encode())
+    bridge.handle('espark/telemetry/thermo1', dumps({
+        'data_type' : 'battery',
+        'value'     : 80,
+    }).encode())
+
+    readings = [(call.args[0].device_id, call.args[0].data_type, call.args[0].value) for call in listener.call_args_list]
+
+    assert readings == [
+        ('thermo1', 'temperature', 2150),
+        ('thermo1', 'humidity', 4500),
+        ('thermo1', 'battery', 80),
+    ]
+    assert listener.call_args_list[0].args[0].timestamp > listener.call_args_list[1].args[0].timestamp
+
+
+def test_bridge_publishes_switched_relay_states_only(monkeypatch):
+    event_bus = EventBus(10)
+    monkeypatch.setattr('src.services.bridge.event_bus', event_bus)
+
+    subscription = event_bus.subscribe()
+
+    bridge = EventBridge()
+
+    # The retained state received on subscribing only seeds the known state
+    bridge.handle('espark/action/relay1', dumps({'device_id': 'relay1', 'state': 0}).encode())
+    bridge.handle('espark/action/relay1', dumps({'device_id': 'relay1', 'state': 1}).encode())
+    bridge.handle('espark/action/relay1', dumps({'device_id': 'relay1', 'state': 1}).encode())
+    bridge.handle('espark/action/relay1', b'')
+
+    assert subscription.queue.qsize() == 1
+
+    event = subscription.queue.get_nowait()
+
+    assert event.event_type == 'relay'
+    assert event.device_id == 'relay1'
+    assert event.payload['state'] == 1
+
+
+def test_bridge_skips_malformed_messages(monkeypatch):
+    # The real log_error re-raises the error it logs
+    log_error = MagicMock(side_effect=ValueError)
+    listener  = MagicMock()
+
+    monkeypatch.setattr('src.services.bridge.log_error', log_error)
+
+    bridge = EventBridge()
+    bridge.add_listener(listener)
+    bridge.handle('espark/telemetry/thermo1', b'not json')
+    bridge.handle('espark/telemetry/thermo1', dumps({'readings': [['temperature', 2150]]}).encode())
+
+    assert log_error.call_count == 1
+    assert listener.call_count == 1
@@ -0,0 +1,62 @@
+from asyncio import sleep
+from unittest.mock import AsyncMock, MagicMock
+
+from pytest import mark
+
+from src.services import Debouncer
+
+
+@mark.asyncio
+async def test_notify_coalesces_bursts():
+    callback  = AsyncMock()
+    debouncer = Debouncer(callback, delay=0.05)
+
+    for _ in range(10):
+        debouncer.notify()
+
+    await sleep(0.1)
+
+    callback.assert_awaited_once()
+
+
+@mark.asyncio
+async def test_notify_respects_min_interval():
+    callback  = AsyncMock()
+    debouncer = Debouncer(callback, delay=0.01, min_interval=0.2)
+
+    await debouncer.run()
+
+    debouncer.notify()
+
+    await sleep(0.05)
+
+    assert callback.await_count == 1
+
+    await sleep(0.25)
+
+    assert callback.await_count == 2
+
+
+@mark.asyncio
+async def test_notify_survives_failures(monkeypatch):
+    error = RuntimeError('boom')
+
+    # The real log_error re-raises the error it logs
+    log_error = MagicMock(side_effect=error)
+
+    monkeypatch.setattr('src.services.debouncer.log_error', log_error)
+
+    callback  = AsyncMock(side_effect=[error, None])
+    debouncer = Debouncer(callback, delay=0.01)
+
+    debouncer.notify()
+    await sleep(0.05)
+
+    debouncer.notify()
+    await sleep(0.05)
+
+    assert callback.await_count == 2
+
+    log_error.assert_called_once_with(error)
+
+    await debouncer.close()
@@ -0,0 +1,47 @@
+from asyncio import sleep
+from unittest.mock import MagicMock
+
+from pytest import mark
+
+from src.services import OutboxDispatcher
+
+
+@mark.asyncio
+async def test_dispatcher_consumes_each_notified_device_once(monkeypatch):
+    calls = []
+
+    async def consume_outbox(device_id, event_type):
+        calls.append((device_id, event_type))
+
+        if device_id == 'relay2':
+            raise ConnectionError('Broker unavailable')
+
+    # The real log_error re-raises the error it logs
+    log_error = MagicMock(side_effect=ConnectionError)
+
+    monkeypatch.setattr('src.services.dispatcher.consume_outbox', consume_outbox)
+    monkeypatch.setattr('src.services.dispatcher.log_error', log_error)
+
+    dispatcher = OutboxDispatcher()
+    dispatcher.notify('relay1')
+    dispatcher.notify('relay2')
+    dispatcher.notify('relay1')
+    dispatcher.start()
+
+    try:
+        await sleep(0.01)
+
+        dispatcher.notify('relay1')
+
+        await sleep(0.01)
+    finally:
+        await dispatcher.close()
+
+    assert calls == [
+        ('relay1', 'relay_state_changed'),
+        ('relay2', 'relay_state_changed'),
+        ('relay1', 'relay_state_changed'),
+    ]
+    assert dispatcher.queued == set()
+
+    log_error.assert_called_once()
@@ -0,0 +1,48 @@
+from asyncio import get_running_loop
+from unittest.mock import AsyncMock, MagicMock
+
+from pytest import mark
+
+from src.routers import EventRouter
+from src.services import EventBus
+
+
+def test_event_bus_filters_by_device():
+    bus = EventBus()
+
+    everything = bus.subscribe()
+    relay1     = bus.subscribe(['relay1'])
+
+    bus.publish('relay', 'relay1', {'state': 1})
+    bus.publish('relay', 'relay2', {'state': 0})
+    bus.publish('settings', None, {'id': 1})
+
+    assert [event.device_id for event in [everything.queue.get_nowait() for _ in range(everything.queue.qsize())]] == ['relay1', 'relay2', None]
+    assert [event.device_id for event in [relay1.queue.get_nowait() for _ in range(relay1.queue.qsize())]] == ['relay1', None]
+
+
+def test_event_bus_drops_events_for_slow_subscribers():
+    bus          = EventBus(max_size=1)
+    subscription = bus.subscribe()
+
+    bus.publish('relay', 'relay1', {'state': 1})
+    bus.publish('relay', 'relay1', {'state': 0})
+
+    assert subscription.queue.qsize() == 1
+    assert subscription.queue.get_nowait().payload == {'state': 1}
+
+
+@mark.asyncio
+async def test_event_stream_formats_events_and_unsubscribes(monkeypatch):
+    monkeypatch.setattr('src.routers.events.app_config.event_stream_heartbeat', 0.01)
+
+    bus     = EventBus()
+    router  = EventRouter(bus)
+    request = MagicMock(is_disconnected=AsyncMock(side_effect=[False, False, True]))
+
+    # The subscription is only made once the stream starts
+    get_running_loop().call_soon(bus.publish, 'relay', 'relay1', {'state': 1})
+
+    # pylint: disable=protected-access
+    assert [message async for message in router._stream(request, ['relay1'])] == ['event: relay\ndata: {"state": 1}\n\n', ': keep-alive\n\n']
+    assert bus.subscriptions == set()
@@ -0,0 +1,116 @@
+from asyncio import create_task, sleep
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+from esparkcore.data.models import Telemetry
+from pytest import mark
+from sqlmodel import select
+
+from src.data import count_queries
+from src.services import IngestBuffer
+
+
+def _telemetry(value: int) -> Telemetry:
+    return Telemetry(device_id='dev1', data_type='temperature', value=value, timestamp=datetime.now(timezone.utc))
+
+
+@mark.asyncio
+async def test_ingest_buffer_writes_a_batch_with_one_insert(monkeypatch, session_factory):
+    monkeypatch.setattr('src.services.ingest.async_session', session_factory)
+
+    buffer = IngestBuffer(batch_size=3, flush_interval=60, capacity=10)
+    buffer.start()
+
+    try:
+        with count_queries() as stats:
+            for value in range(3):
+                await buffer.add(_telemetry(value))
+
+            await sleep(0.05)
+    finally:
+        await buffer.close()
+
+    assert stats.count == 1
+    assert buffer.pending == []
+
+    async with session_factory() as session:
+        assert [telemetry.value for telemetry in (await session.execute(select(Telemetry).order_by(Telemetry.id))).scalars().all()] == [0, 1, 2]
+
+
+@mark.asyncio
+async def test_ingest_buffer_flushes_on_interval_and_on_close(monkeypatch, session_factory):
+    monkeypatch.setattr('src.services.ingest.async_session', session_factory)
+
+    buffer = IngestBuffer(batch_size=100, flush_interval=0.01, capacity=1000)
+    buffer.start()
+
+    await buffer.add(_telemetry(1))
+    await sleep(0.05)
+
+    assert buffer.pending == []
+
+    await buffer.close()
+    await buffer.add(_telemetry(2))
+    await buffer.close()
+
+    async with session_factory() as session:
+        assert len((await session.execute(select(Telemetry))).scalars().all()) == 2
+
+
+@mark.asyncio
+async def test_ingest_buffer_holds_back_producers_when_full():
+    repo   = MagicMock(add_all=AsyncMock(side_effect=[OSError('database is locked'), None]))
+    buffer = IngestBuffer(repo=repo, batch_size=2, flush_interval=60, capacity=2)
+
+    await buffer.add(_telemetry(1))
+    await buffer.add(_telemetry(2))
+
+    producer = create_task(buffer.add(_telemetry(3)))
+    await sleep(0.01)
+
+    assert not producer.done()
+    assert await buffer.flush() == 0
+    assert len(buffer.pending) == 2
+
+    assert await buffer.flush() == 2
+
+    await producer
+
+    assert [telemetry.value for telemetry in buffer.pending] == [3]
+
+
+@mark.asyncio
+async def test_ingest_buffer_drops_rows_rejected_by_the_database(monkeypatch, session_factory):
+    monkeypatch.setattr('src.services.ingest.async_session', session_factory)
+
+    buffer = IngestBuffer(batch_size=2, flush_interval=60, capacity=4)
+
+    await buffer.add(_telemetry(1))
+    await buffer.add(_telemetry(None))
+    await buffer.add(_telemetry(3))
+
+    assert await buffer.flush() == 2
+    assert await buffer.flush() == 1
+    assert buffer.pending == []
+
+    async with session_factory() as session:
+        assert [telemetry.value for telemetry in (await session.execute(select(Telemetry).order_by(Telemetry.id))).scalars().all()] == [1, 3]
+
+
+@mark.asyncio
+async def test_ingest_buffer_keeps_rows_a_final_flush_could_not_write(monkeypatch):
+    # The real log_error re-raises the error it logs
+    log_error = MagicMock(side_effect=RuntimeError)
+
+    monkeypatch.setattr('src.services.ingest.log_error', log_error)
+
+    repo   = MagicMock(add_all=AsyncMock(side_effect=OSError('database is locked')))
+    buffer = IngestBuffer(repo=repo, batch_size=2, flush_interval=60, capacity=4)
+    buffer.start()
+
+    await buffer.add(_telemetry(1))
+    await buffer.close()
+
+    assert buffer.task.done()
+    assert [telemetry.value for telemetry in buffer.pending] == [1]
+    assert log_error.call_count == 2
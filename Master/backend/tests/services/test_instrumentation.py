@@ -0,0 +1,20 @@
+from pytest import mark
+from sqlalchemy import text
+
+from src.services import instrument_job
+from src.services.instrumentation import job_queries
+
+
+@mark.asyncio
+async def test_instrument_job_counts_queries(session_factory):
+    async def job():
+        async with session_factory() as session:
+            await session.execute(text('SELECT 1'))
+            await session.execute(text('SELECT 2'))
+
+    await instrument_job('test_job', job)()
+
+    series = job_queries.series[(('job', 'test_job'),)]
+
+    assert series[-1] == 1
+    assert series[-2] == 2
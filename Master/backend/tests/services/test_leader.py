@@ -0,0 +1,55 @@
+from unittest.mock import AsyncMock, MagicMock
+
+from pytest import mark
+
+from src.services import LeaderElection
+
+
+@mark.asyncio
+async def test_leader_election_notifies_transitions_and_guards_jobs(monkeypatch, session_factory):
+    monkeypatch.setattr('src.services.leader.async_session', session_factory)
+
+    leader   = LeaderElection(ttl=30)
+    follower = LeaderElection(ttl=30)
+    acquired = AsyncMock()
+    released = AsyncMock()
+    job      = AsyncMock()
+
+    leader.add_listener(acquired, released)
+
+    assert await leader.renew()
+    assert not await follower.renew()
+
+    await leader.guard(job)()
+    await follower.guard(job)()
+
+    job.assert_awaited_once()
+    acquired.assert_awaited_once()
+
+    await leader.close()
+
+    released.assert_awaited_once()
+
+    assert not leader.is_leader
+    assert await follower.renew()
+
+
+@mark.asyncio
+async def test_leader_election_steps_down_when_lease_cannot_be_renewed(monkeypatch, session_factory):
+    # The real log_error re-raises the error it logs
+    log_error = MagicMock(side_effect=OSError)
+
+    monkeypatch.setattr('src.services.leader.async_session', session_factory)
+    monkeypatch.setattr('src.services.leader.log_error', log_error)
+
+    repo     = MagicMock(acquire=AsyncMock(side_effect=[True, OSError('database is locked')]))
+    released = AsyncMock()
+    election = LeaderElection(ttl=30, repo=repo)
+
+    election.add_listener(AsyncMock(), released)
+
+    assert await election.renew()
+    assert not await election.renew()
+
+    released.assert_awaited_once()
+    log_error.assert_called_once()
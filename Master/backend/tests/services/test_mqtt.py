@@ -0,0 +1,140 @@
+from struct import pack
+from unittest.mock import AsyncMock, MagicMock
+
+from pytest import mark
+
+from src.services import MQTTManager, telemetry_cache
+
+
+@mark.asyncio
+async def test_handle_telemetry_updates_cache(monkeypatch):
+    buffer = MagicMock(add=AsyncMock())
+
+    monkeypatch.setattr('src.services.mqtt.ingest_buffer', buffer)
+
+    manager = MQTTManager()
+    manager._handle_triggers = AsyncMock()
+
+    telemetry_cache.clear()
+
+    await manager._handle_telemetry('dev1', {
+        'data_type' : 'temperature',
+        'value'     : 1900,
+    })
+
+    buffer.add.assert_awaited_once()
+    manager._handle_triggers.assert_awaited_once_with('dev1', 'temperature', 1900)
+
+    assert telemetry_cache.get('dev1', 'temperature').value == 1900
+
+
+@mark.asyncio
+async def test_handle_registration_invalidates_capabilities_for_new_devices(monkeypatch):
+    cache = MagicMock(contains=AsyncMock(side_effect=[False, True]))
+
+    monkeypatch.setattr('src.services.mqtt.capability_cache', cache)
+    monkeypatch.setattr('esparkcore.services.MQTTManager._handle_registration', AsyncMock())
+
+    manager = MQTTManager()
+
+    await manager._handle_registration('dev1', {})
+
+    cache.invalidate.assert_called_once()
+
+    await manager._handle_registration('dev1', {})
+
+    cache.invalidate.assert_called_once()
+
+
+@mark.asyncio
+async def test_handle_triggers_skips_the_database_when_no_trigger_matches(monkeypatch):
+    handle_triggers = AsyncMock()
+
+    monkeypatch.setattr('src.services.mqtt.trigger_cache', MagicMock(matches=AsyncMock(side_effect=[False, True])))
+    monkeypatch.setattr('esparkcore.services.MQTTManager._handle_triggers', handle_triggers)
+
+    manager = MQTTManager()
+
+    await manager._handle_triggers('dev1', 'temperature', 1900)
+
+    handle_triggers.assert_not_awaited()
+
+    await manager._handle_triggers('dev1', 'temperature', 1900)
+
+    handle_triggers.assert_awaited_once()
+
+
+@mark.asyncio
+async def test_handle_telemetry_accepts_batched_readings(monkeypatch):
+    buffer = MagicMock(add=AsyncMock())
+
+    monkeypatch.setattr('src.services.mqtt.ingest_buffer', buffer)
+
+    manager = MQTTManager()
+    manager._handle_triggers = AsyncMock()
+
+    telemetry_cache.clear()
+
+    await manager._handle_telemetry('dev1', {
+        'device_id' : 'dev1',
+        'readings'  : [['temperature', 1950], ['humidity', 5025], ['battery', 9000]],
+    })
+
+    assert buffer.add.await_count == 3
+    assert manager._handle_triggers.await_count == 3
+
+    assert telemetry_cache.get('dev1', 'humidity').value == 5025
+    assert telemetry_cache.get('dev1', 'battery').value == 9000
+
+
+@mark.asyncio
+async def test_process_message_decodes_binary_and_json_telemetry():
+    manager = MQTTManager()
+    manager._handle_telemetry = AsyncMock()
+
+    await manager._process_message('espark/telemetry/dev1', pack('<BBBhBh', 1, 2, 0, 1950, 1, 5025))
+    await manager._process_message('espark/telemetry/dev1', b'{"data_type": "temperature", "value": 1950}')
+
+    assert manager._handle_telemetry.await_args_list[0].args == ('dev1', {'readings': [('temperature', 1950), ('humidity', 5025)]})
+    assert manager._handle_telemetry.await_args_list[1].args == ('dev1', {'data_type': 'temperature', 'value': 1950})
+
+
+@mark.asyncio
+async def test_handle_telemetry_dates_queued_readings_back(monkeypatch):
+    buffer = MagicMock(add=AsyncMock())
+
+    monkeypatch.setattr('src.services.mqtt.ingest_buffer', buffer)
+
+    manager = MQTTManager()
+    manager._handle_triggers = AsyncMock()
+
+    await manager._handle_telemetry('dev1', {
+        'device_id' : 'dev1',
+        'readings'  : [['temperature', 1900, 1200], ['temperature', 1950]],
+    })
+
+    queued, fresh = [call.args[0] for call in buffer.add.await_args_list]
+
+    assert 1200 <= (fresh.timestamp - queued.timestamp).total_seconds() < 1210
+
+
+@mark.asyncio
+async def test_handle_telemetry_skips_malformed_readings_of_a_batch(monkeypatch):
+    buffer = MagicMock(add=AsyncMock())
+
+    monkeypatch.setattr('src.services.mqtt.ingest_buffer', buffer)
+
+    manager = MQTTManager()
+    manager._handle_triggers = AsyncMock()
+
+    telemetry_cache.clear()
+
+    await manager._handle_telemetry('dev1', {
+        'device_id' : 'dev1',
+        'readings'  : [['temperature', None], ['humidity'], 'pressure', ['battery', 90]],
+    })
+
+    assert [call.args[0].data_type for call in buffer.add.await_args_list] == ['battery']
+    manager._handle_triggers.assert_awaited_once_with('dev1', 'battery', 90)
+
+    assert telemetry_cache.get('dev1', 'battery').value == 90
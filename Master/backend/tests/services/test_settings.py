@@ -0,0 +1,39 @@
+from unittest.mock import AsyncMock, MagicMock
+
+from pytest import mark
+
+from src.data.models import Settings, SettingsSnapshot
+from src.services import DecisionEngine, SettingsCache
+
+
+@mark.asyncio
+async def test_settings_cache_loads_once(monkeypatch):
+    session = MagicMock()
+    session.__aenter__ = AsyncMock(return_value=session)
+    session.__aexit__  = AsyncMock(return_value=None)
+
+    monkeypatch.setattr('src.services.settings.async_session', lambda: session)
+
+    repo  = MagicMock(get=AsyncMock(return_value=Settings(id=1, threshold_on=17.0, threshold_off=18.0, decision_strategy='avg')))
+    cache = SettingsCache(repo)
+
+    snapshot = await cache.get()
+
+    assert snapshot == SettingsSnapshot(threshold_on=17.0, threshold_off=18.0, decision_strategy='avg')
+    assert await cache.get() is snapshot
+
+    repo.get.assert_awaited_once()
+
+    cache.invalidate()
+    await cache.get()
+
+    assert repo.get.await_count == 2
+
+
+@mark.asyncio
+async def test_decision_engine_uses_snapshot():
+    engine = DecisionEngine()
+
+    assert await engine.decide([19.0, 22.0], SettingsSnapshot(threshold_on=20.0, threshold_off=21.0, decision_strategy='avg')) is None
+    assert await engine.decide([19.0, 22.0], SettingsSnapshot(threshold_on=20.0, threshold_off=21.0, decision_strategy='min')) is True
+    assert await engine.decide([10.0], SettingsSnapshot(threshold_on=5.0, threshold_off=6.0, decision_strategy='min')) is True
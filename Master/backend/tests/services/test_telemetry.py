@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta, timezone
+
+from esparkcore.data.models import Telemetry
+from pytest import mark
+
+from src.services import TelemetryCache
+
+
+def test_put_keeps_latest():
+    cache = TelemetryCache()
+    now   = datetime.now(timezone.utc)
+
+    cache.put(Telemetry(id=2, device_id='dev1', data_type='temperature', value=1900, timestamp=now))
+    cache.put(Telemetry(id=1, device_id='dev1', data_type='temperature', value=1800, timestamp=now - timedelta(minutes=1)))
+
+    assert cache.get('dev1', 'temperature').value == 1900
+
+
+def test_put_normalizes_naive_timestamps():
+    cache = TelemetryCache()
+
+    cache.put(Telemetry(id=1, device_id='dev1', data_type='temperature', value=1900, timestamp=datetime(2025, 1, 1)))
+
+    assert cache.get('dev1', 'temperature').timestamp.tzinfo == timezone.utc
+
+
+def test_list_latest():
+    cache = TelemetryCache()
+    now   = datetime.now(timezone.utc)
+
+    cache.put(Telemetry(id=1, device_id='dev1', data_type='temperature', value=1900, timestamp=now))
+    cache.put(Telemetry(id=2, device_id='dev1', data_type='humidity', value=5000, timestamp=now))
+    cache.put(Telemetry(id=3, device_id='dev2', data_type='temperature', value=2000, timestamp=now))
+
+    assert sorted(item.value for item in cache.list_latest('temperature')) == [1900, 2000]
+    assert [item.value for item in cache.list_latest('temperature', ['dev2'])] == [2000]
+    assert len(cache.list_latest(device_ids=['dev1'])) == 2
+
+
+def test_remove():
+    cache     = TelemetryCache()
+    telemetry = Telemetry(id=1, device_id='dev1', data_type='temperature', value=1900, timestamp=datetime.now(timezone.utc))
+
+    cache.put(telemetry)
+    cache.remove(Telemetry(id=2, device_id='dev1', data_type='temperature'))
+
+    assert cache.get('dev1', 'temperature') is telemetry
+
+    cache.remove(telemetry)
+
+    assert cache.get('dev1', 'temperature') is None
+
+
+@mark.asyncio
+async def test_warm(monkeypatch):
+    cache = TelemetryCache()
+    now   = datetime.now(timezone.utc)
+
+    async def list_latest(self, session, *args, **kwargs):
+        return [Telemetry(id=1, device_id='dev1', data_type='temperature', value=1900, timestamp=now)]
+
+    monkeypatch.setattr('src.services.telemetry.TelemetryRepository.list_latest', list_latest)
+
+    await cache.warm()
+
+    assert cache.get('dev1', 'temperature').value == 1900
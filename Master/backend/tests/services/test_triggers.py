@@ -0,0 +1,27 @@
+from esparkcore.data.models import Trigger
+from pytest import mark
+
+from src.services import TriggerCache
+
+
+@mark.asyncio
+async def test_trigger_cache_matches_without_querying_again(monkeypatch, session_factory, max_queries):
+    monkeypatch.setattr('src.services.triggers.async_session', session_factory)
+
+    async with session_factory() as session:
+        session.add(Trigger(name='Door opened', device_id='door1', data_type='magnet', condition='==', value=1, notification_ids='1'))
+        session.add(Trigger(name='Battery low', condition='<', value=20, data_type='battery', notification_ids='1'))
+
+        await session.commit()
+
+    cache = TriggerCache()
+
+    with max_queries(1):
+        assert await cache.matches('door1', 'magnet', 1)
+        assert not await cache.matches('door2', 'magnet', 1)
+        assert await cache.matches('thermo1', 'battery', 10)
+        assert not await cache.matches('thermo1', 'battery', 50)
+
+    cache.invalidate()
+
+    assert cache.triggers is None
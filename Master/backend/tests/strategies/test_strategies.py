@@ -0,0 +1,22 @@
+from src.data.models import SettingsSnapshot
+from src.strategies import AvgStrategy, MinStrategy
+
+SETTINGS = SettingsSnapshot(threshold_on=17.5, threshold_off=18.5, decision_strategy='min')
+
+
+def test_avg_strategy():
+    strategy = AvgStrategy()
+
+    assert strategy.evaluate([], SETTINGS) is None
+    assert strategy.evaluate([16.0, 18.0], SETTINGS) is True
+    assert strategy.evaluate([18.0, 20.0], SETTINGS) is False
+    assert strategy.evaluate([17.0, 19.0], SETTINGS) is None
+
+
+def test_min_strategy():
+    strategy = MinStrategy()
+
+    assert strategy.evaluate([], SETTINGS) is None
+    assert strategy.evaluate([17.0, 25.0], SETTINGS) is True
+    assert strategy.evaluate([19.0, 25.0], SETTINGS) is False
+    assert strategy.evaluate([18.0, 25.0], SETTINGS) is None
@@ -0,0 +1,21 @@
+from src.utils import MetricsRegistry
+
+
+def test_histogram_renders_prometheus_text():
+    registry  = MetricsRegistry()
+    histogram = registry.histogram('job_queries', 'Queries per job', (1, 5))
+
+    histogram.observe(1, job='evaluation_job')
+    histogram.observe(3, job='evaluation_job')
+    histogram.observe(9, job='evaluation_job')
+
+    assert registry.histogram('job_queries', 'Queries per job') is histogram
+    assert registry.render() == '\n'.join([
+        '# HELP job_queries Queries per job',
+        '# TYPE job_queries histogram',
+        'job_queries_bucket{job="evaluation_job",le="1"} 1',
+        'job_queries_bucket{job="evaluation_job",le="5"} 2',
+        'job_queries_bucket{job="evaluation_job",le="+Inf"} 3',
+        'job_queries_sum{job="evaluation_job"} 13',
+        'job_queries_count{job="evaluation_job"} 3',
+    ]) + '\n'
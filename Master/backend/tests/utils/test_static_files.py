@@ -0,0 +1,84 @@
+from gzip import decompress
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pytest import fixture
+
+from src.utils import SpaStaticFiles
+
+SCRIPT = b'console.log("espartan");\n' * 100
+
+
+def _fail(*args, **kwargs):
+    raise AssertionError('Unexpected call')
+
+
+@fixture
+def web(tmp_path):
+    (tmp_path / 'assets').mkdir()
+    (tmp_path / 'assets' / 'index-abc123.js').write_bytes(SCRIPT)
+    (tmp_path / 'index.html').write_text('<html></html>')
+
+    static_files = SpaStaticFiles(directory=tmp_path, html=True)
+
+    app = FastAPI()
+    app.mount('/web', static_files, name='web')
+
+    return TestClient(app), static_files
+
+
+def test_assets_are_immutable_and_compressed(web):
+    client, _ = web
+
+    response = client.get('/web/assets/index-abc123.js', headers={'Accept-Encoding': 'gzip'})
+
+    assert response.status_code == 200
+    assert response.headers['Cache-Control'] == 'public, max-age=31536000, immutable'
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.headers['Vary'] == 'Accept-Encoding'
+    assert response.content == SCRIPT
+
+    assert client.get('/web/assets/index-abc123.js', headers={'Accept-Encoding': 'gzip', 'If-None-Match': response.headers['ETag']}).status_code == 304
+
+
+def test_uncompressed_when_not_accepted(web):
+    client, _ = web
+
+    response = client.get('/web/assets/index-abc123.js', headers={'Accept-Encoding': 'identity, gzip;q=0'})
+
+    assert 'Content-Encoding' not in response.headers
+    assert response.content == SCRIPT
+
+
+def test_compressed_once(web, monkeypatch):
+    client, static_files = web
+
+    client.get('/web/assets/index-abc123.js', headers={'Accept-Encoding': 'gzip'})
+
+    monkeypatch.setattr('src.utils.static_files.compress', _fail)
+
+    response = client.get('/web/assets/index-abc123.js', headers={'Accept-Encoding': 'gzip'})
+
+    assert decompress(next(iter(static_files.compressed.values()))) == SCRIPT
+    assert response.status_code == 200
+
+
+def test_deep_links_fall_back_to_index(web, monkeypatch):
+    client, static_files = web
+
+    response = client.get('/web/devices/dev1')
+
+    assert response.status_code == 200
+    assert response.headers['Cache-Control'] == 'no-cache'
+    assert response.text == '<html></html>'
+
+    monkeypatch.setattr('starlette.staticfiles.os.stat', _fail)
+
+    assert client.get('/web/devices/dev1').text == '<html></html>'
+    assert 'devices/dev1' in static_files.fallbacks
+
+
+def test_missing_assets_are_not_immutable(web):
+    client, _ = web
+
+    assert client.get('/web/assets/index-old.js').headers['Cache-Control'] == 'no-cache'
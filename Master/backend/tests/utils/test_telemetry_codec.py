@@ -0,0 +1,33 @@
+from ast import literal_eval, parse
+from pathlib import Path
+from struct import pack
+
+from pytest import mark, raises
+
+from src.utils import DATA_TYPES, decode_readings, is_binary
+
+
+def test_decode_readings():
+    payload = pack('<BBBhBhBiBh', 1, 4, 0, -550, 1, 5025, 0x82, 40000, 0x7f, 1)
+
+    assert is_binary(payload)
+    assert not is_binary(b'{"data_type": "temperature", "value": 1950}')
+    assert decode_readings(payload) == [('temperature', -550), ('humidity', 5025), ('battery', 40000)]
+
+
+def test_decode_readings_rejects_truncated_payloads():
+    with raises(ValueError):
+        decode_readings(pack('<BBBh', 1, 2, 0, 1950))
+
+
+@mark.parametrize('worker', ['Worker-Door', 'Worker-Mail', 'Worker-Thermo'])
+def test_data_types_match_esparknode(worker):
+    constants = Path(__file__).parents[4] / worker / 'esparknode' / 'constants.py'
+
+    # The node table is read from its source, since esparknode is not installed alongside the Master
+    for node in parse(constants.read_text()).body:
+        if getattr(node, 'target', None) is not None and node.target.id == 'DATA_TYPES':
+            assert literal_eval(node.value) == DATA_TYPES
+            return
+
+    raise AssertionError(f'DATA_TYPES not found in {constants}')
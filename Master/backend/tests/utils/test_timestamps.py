@@ -0,0 +1,8 @@
+from datetime import datetime, timedelta, timezone
+
+from src.utils import as_utc
+
+
+def test_as_utc():
+    assert as_utc(datetime(2025, 1, 1, 12)) == datetime(2025, 1, 1, 12, tzinfo=timezone.utc)
+    assert as_utc(datetime(2025, 1, 1, 12, tzinfo=timezone(timedelta(hours=2)))).hour == 10
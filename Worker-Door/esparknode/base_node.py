@@ -1,8 +1,11 @@
 from json import dumps
 from time import sleep, time
 
-from esparknode.configs import CAPABILITIES, ENVIRONMENT, PARAMETERS_UPDATE_TIMEOUT, SENSOR_RETRIES, UNUSED_PINS
+from esparknode.configs import CAPABILITIES, ENVIRONMENT, SENSOR_RETRIES, TELEMETRY_BATCH_ENABLED, TELEMETRY_ENCODING, UNUSED_PINS
 from esparknode.constants import NODE_NAME, NODE_VERSION, TOPIC_ACTION, TOPIC_DEVICE, TOPIC_OTA, TOPIC_REGISTRATION, TOPIC_TELEMETRY
+from esparknode.data.base_storage import BaseStorage
+from esparknode.data.parameters_cache import VERSION_KEY, ParametersCache
+from esparknode.data.telemetry_queue import TelemetryQueue
 from esparknode.networks.base_bluetooth import BaseBluetoothManager
 from esparknode.networks.base_mqtt import BaseMQTTManager
 from esparknode.networks.base_requests import BaseRequests
@@ -13,6 +16,7 @@ from esparknode.utils.base_ota_manager import BaseOtaManager
 from esparknode.utils.base_sleeper import BaseSleeper
 from esparknode.utils.base_watchdog import BaseWatchdog
 from esparknode.utils.logging import log_debug
+from esparknode.utils.telemetry_codec import encode_readings
 
 
 class BaseNode:
@@ -28,6 +32,7 @@ class BaseNode:
             ota_manager       : BaseOtaManager       = None,
             sensors           : list[BaseSensor]     = None,
             triggers          : list[BaseTrigger]    = None,
+            storage           : BaseStorage          = None,
     ):
         self.device_id         = device_id
         self.sleeper           = sleeper
@@ -39,9 +44,10 @@ class BaseNode:
         self.ota_manager       = ota_manager
         self.sensors           = sensors if sensors is not None else []
         self.triggers          = triggers if triggers is not None else []
+        self.telemetry_queue   = TelemetryQueue(storage) if storage is not None else None
+        self.parameters_cache  = ParametersCache(storage) if storage is not None else None
 
-        self.parameters_updated : bool = False
-        self.sleep_interval     : int  = 600
+        self.sleep_interval : int = 600
 
         self._manage_power()
 
@@ -67,13 +73,30 @@ class BaseNode:
         if topic == f'{TOPIC_ACTION}/{self.device_id}':
             self._handle_action(payload)
         elif topic == f'{TOPIC_DEVICE}/{self.device_id}':
-            self._handle_parameters_update(payload)
+            self._update_parameters(payload)
         elif topic == f'{TOPIC_OTA}/{self.device_id}':
             self._handle_otp(payload)
 
-    # pylint: disable=unused-argument
+    def load_parameters(self) -> None:
+        parameters = self.parameters_cache.load() if self.parameters_cache else {}
+
+        if parameters:
+            log_debug(f'Using cached parameters, version {parameters.get(VERSION_KEY)}')
+
+            self._handle_parameters_update(parameters)
+
+    def _update_parameters(self, parameters: dict) -> None:
+        if self.parameters_cache:
+            # The broker delivers the retained parameters on every connection, so only newer ones are applied and written to flash
+            if not self.parameters_cache.is_newer(parameters):
+                return
+
+            self.parameters_cache.save(parameters)
+
+        self._handle_parameters_update(parameters)
+
     def _handle_parameters_update(self, parameters: dict) -> None:
-        self.parameters_updated = True
+        pass
 
     def _handle_action(self, payload: dict) -> None:
         pass
@@ -92,17 +115,19 @@ class BaseNode:
             else:
                 log_debug(f'Error {ota_data["status_code"]}: Failed to download OTA update.', payload['device_id'], self.mqtt_manager)
 
-    def register(self) -> None:
+    def register(self) -> bool:
         log_debug(f'Registering device {self.device_id}...')
 
-        self.mqtt_manager.publish(f'{TOPIC_REGISTRATION}/{self.device_id}', dumps({
+        return self.mqtt_manager.publish(f'{TOPIC_REGISTRATION}/{self.device_id}', dumps({
             'device_id'    : self.device_id,
             'app_name'     : NODE_NAME,
             'app_version'  : NODE_VERSION,
             'capabilities' : ','.join(CAPABILITIES),
         }))
 
-    def publish_telemetry(self):
+    def read_telemetry(self) -> list:
+        readings = []
+
         for sensor in self.sensors:
             deadline = time() + SENSOR_RETRIES
             while time() < deadline:
@@ -110,17 +135,9 @@ class BaseNode:
                     telemetry = sensor.read()
                     if telemetry is not None:
                         for data_type, value in telemetry.items():
-                            payload = {
-                                'device_id' : self.device_id,
-                                'data_type' : data_type,
-                                'value'     : round(value * 100),
-                            }
-
-                            log_debug(f'Publishing telemetry data for device {self.device_id}: {dumps(payload)}')
+                            readings.append([data_type, round(value * 100)])
 
-                            self.mqtt_manager.publish(f'{TOPIC_TELEMETRY}/{self.device_id}', dumps(payload))
-
-                            self.watchdog.feed()
+                    self.watchdog.feed()
 
                     break
                 # pylint: disable=broad-exception-caught
@@ -129,25 +146,86 @@ class BaseNode:
 
                     sleep(1)
 
-    def start(self) -> None:
-        self.register()
+        return readings
+
+    def publish_readings(self, readings: list) -> bool:
+        queued = self.telemetry_queue.peek() if self.telemetry_queue else []
+
+        if not readings and not queued:
+            return True
+
+        if self._send_readings(queued + readings):
+            if queued:
+                log_debug(f'Published {len(queued)} queued readings')
+
+                self.telemetry_queue.clear()
+
+            return True
+
+        self.queue_readings(readings)
+
+        return False
+
+    def queue_readings(self, readings: list) -> None:
+        if self.telemetry_queue and readings:
+            log_debug(f'Queueing {len(readings)} readings until the next successful connection')
+
+            self.telemetry_queue.push(readings)
+
+    def _send_readings(self, readings: list) -> bool:
+        payload = encode_readings(readings) if TELEMETRY_ENCODING == 'binary' else None
+
+        if payload is not None:
+            log_debug(f'Publishing {len(payload)} bytes of telemetry data for device {self.device_id}')
+
+            published = self.mqtt_manager.publish(f'{TOPIC_TELEMETRY}/{self.device_id}', payload)
+        elif TELEMETRY_BATCH_ENABLED or any(len(reading) > 2 for reading in readings):
+            # Every reading of a wake cycle goes out in one message, costing a single round-trip to the broker
+            payload = dumps({
+                'device_id' : self.device_id,
+                'readings'  : readings,
+            })
+
+            log_debug(f'Publishing telemetry data for device {self.device_id}: {payload}')
+
+            published = self.mqtt_manager.publish(f'{TOPIC_TELEMETRY}/{self.device_id}', payload)
+        else:
+            published = True
+
+            for data_type, value in readings:
+                payload = dumps({
+                    'device_id' : self.device_id,
+                    'data_type' : data_type,
+                    'value'     : value,
+                })
+
+                log_debug(f'Publishing telemetry data for device {self.device_id}: {payload}')
+
+                if not self.mqtt_manager.publish(f'{TOPIC_TELEMETRY}/{self.device_id}', payload):
+                    published = False
+                    break
 
         self.watchdog.feed()
 
-        deadline = time() + PARAMETERS_UPDATE_TIMEOUT
-        while time() < deadline:
-            if self.parameters_updated:
-                break
+        return published
 
-            self.watchdog.feed()
+    def publish_telemetry(self):
+        self.publish_readings(self.read_telemetry())
 
-            sleep(1)
+    def start(self) -> None:
+        # The parameters of an earlier wake apply straight away, instead of waiting for the broker to deliver them
+        self.load_parameters()
 
-        if not self.parameters_updated:
-            log_debug('Parameters update timeout reached, entering deepsleep mode...')
+        if not self.register() and self.telemetry_queue:
+            # Without a broker, readings are kept for the next wake instead of retrying the connection now
+            log_debug('Registration failed, queueing telemetry and entering deepsleep mode...')
 
-            self.sleeper.deep_sleep(self.sleep_interval * 1000)
+            self.queue_readings(self.read_telemetry())
         else:
+            self.watchdog.feed()
+
+            self.mqtt_manager.check_msg()
+
             self.publish_telemetry()
 
         self.watchdog.feed()
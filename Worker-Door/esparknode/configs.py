@@ -15,11 +15,17 @@ CAPABILITIES : list[str] = [
 WATCHDOG_ENABLED : bool = True
 WATCHDOG_TIMEOUT : int  = 15000
 
+WIFI_FAST_TIMEOUT : int = 3000
+
 MQTT_TIMEOUT   : int = 20
 MQTT_KEEPALIVE : int = 60
 
-PARAMETERS_UPDATE_TIMEOUT : int = 20
-SENSOR_RETRIES            : int = 5
+SENSOR_RETRIES : int = 5
+
+TELEMETRY_BATCH_ENABLED : bool = True
+TELEMETRY_ENCODING      : str  = 'json'
+
+TELEMETRY_QUEUE_CAPACITY : int = 50
 
 LED_PIN : int = 8
 
@@ -4,3 +4,9 @@ class BaseStorage:
 
     def get_int(self, key: str) -> int | None:
         raise NotImplementedError('Subclasses must implement this method')
+
+    def set_blob(self, key: str, value: bytes) -> None:
+        raise NotImplementedError('Subclasses must implement this method')
+
+    def get_blob(self, key: str) -> bytes | None:
+        raise NotImplementedError('Subclasses must implement this method')
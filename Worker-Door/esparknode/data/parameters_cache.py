@@ -0,0 +1,35 @@
+from json import dumps, loads
+
+from esparknode.data.base_storage import BaseStorage
+
+PARAMETERS_KEY : str = 'parameters'
+VERSION_KEY    : str = 'version'
+
+
+class ParametersCache:
+    def __init__(self, storage: BaseStorage):
+        self.storage = storage
+
+    def load(self) -> dict:
+        blob = self.storage.get_blob(PARAMETERS_KEY)
+        if not blob:
+            return {}
+
+        try:
+            parameters = loads(blob.decode())
+        except ValueError:
+            return {}
+
+        return parameters if isinstance(parameters, dict) else {}
+
+    def is_newer(self, parameters: dict) -> bool:
+        cached = self.load()
+
+        # Parameters published without a version are only compared by content
+        if parameters.get(VERSION_KEY) is None or cached.get(VERSION_KEY) is None:
+            return parameters != cached
+
+        return parameters[VERSION_KEY] > cached[VERSION_KEY]
+
+    def save(self, parameters: dict) -> None:
+        self.storage.set_blob(PARAMETERS_KEY, dumps(parameters).encode())
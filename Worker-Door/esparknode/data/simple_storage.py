@@ -5,6 +5,7 @@ from esparknode.data.base_storage import BaseStorage
 
 class Storage(BaseStorage):
     FILE_PATH = '/tmp/espark.ini'
+    BLOB_PATH = '/tmp/espark-{}.bin'
 
     def set_int(self, key: str, value: int) -> None:
         mappings = self._load() or {}
@@ -16,6 +17,17 @@ class Storage(BaseStorage):
         mappings = self._load()
         return None if mappings is None else mappings.get(key)
 
+    def set_blob(self, key: str, value: bytes) -> None:
+        with open(self.BLOB_PATH.format(key), 'wb') as file:
+            file.write(value)
+
+    def get_blob(self, key: str) -> bytes | None:
+        if not path.exists(self.BLOB_PATH.format(key)):
+            return None
+
+        with open(self.BLOB_PATH.format(key), 'rb') as file:
+            return file.read() or None
+
     def _load(self):
         mappings: dict[str, int] = {}
 
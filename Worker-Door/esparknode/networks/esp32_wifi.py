@@ -1,43 +1,144 @@
 # pylint: disable=import-error
 from network import WLAN
 # pylint: disable=wrong-import-order
-from time import sleep
+from binascii import hexlify, unhexlify
+from json import dumps, loads
+from time import sleep_ms, ticks_add, ticks_diff, ticks_ms
 
+from esparknode.configs import WIFI_FAST_TIMEOUT
+from esparknode.data.base_storage import BaseStorage
 from esparknode.networks.base_wifi import BaseWiFiManager
 from esparknode.utils.base_watchdog import BaseWatchdog
 from esparknode.utils.logging import log_debug
 
-TIMEOUT: int = 60
+TIMEOUT       : int = 60
+POLL_INTERVAL : int = 100
+WIFI_KEY      : str = 'wifi'
 
 
 class WiFiManager(BaseWiFiManager):
-    def __init__(self, watchdog: BaseWatchdog, ssid: str, password: str) -> None:
-        super().__init__(watchdog, ssid, password)
+    def __init__(self, watchdog: BaseWatchdog, ssid: str, password: str, storage: BaseStorage = None) -> None:
+        super().__init__(watchdog, ssid, password, storage)
 
         self.wlan = WLAN(WLAN.IF_STA)
 
     def ensure_wifi_on(self) -> bool:
         self.wlan.active(True)
 
-        if not self.wlan.isconnected():
-            log_debug(f'Connecting to WiFi SSID: {self.ssid}')
-            self.wlan.connect(self.ssid, self.password)
+        if self.wlan.isconnected():
+            return True
 
-            timeout: int = 0
-            while not self.wlan.isconnected() and timeout < TIMEOUT:
-                log_debug(f'WiFi status: {self.wlan.status()}')
+        start  = ticks_ms()
+        cached = self._load_connection()
 
-                self.watchdog.feed()
+        # The access point, channel and IP address of the last connection skip the scan and DHCP
+        if cached is not None:
+            if self._connect(cached['bssid'], cached['channel'], cached['ifconfig'], WIFI_FAST_TIMEOUT):
+                log_debug(f'WiFi fast reconnect took {ticks_diff(ticks_ms(), start)} ms: {self.wlan.ifconfig()}')
 
-                sleep(1)
+                return True
 
-                timeout += 1
+            log_debug(f'WiFi fast reconnect failed after {ticks_diff(ticks_ms(), start)} ms, falling back to a full connect')
 
-        log_debug(f'WiFi connected: {self.wlan.ifconfig()}')
-        return self.wlan.isconnected()
+            # A stale entry would fail the fast path on every wake, so it is only kept again once a full connect succeeds
+            self._clear_connection()
+
+            self.wlan.disconnect()
+            self.wlan.ifconfig('dhcp')
+
+        # The scan only finds the access point to remember, so it is skipped when there is nowhere to remember it
+        bssid, channel = self._scan() if self.storage is not None else (None, None)
+
+        log_debug(f'Connecting to WiFi SSID: {self.ssid}')
+
+        if self._connect(bssid, channel, None, TIMEOUT * 1000):
+            log_debug(f'WiFi full connect took {ticks_diff(ticks_ms(), start)} ms: {self.wlan.ifconfig()}')
+
+            if bssid is not None:
+                self._save_connection(bssid, channel)
+
+            return True
+
+        log_debug(f'WiFi connect failed after {ticks_diff(ticks_ms(), start)} ms, status: {self.wlan.status()}')
+
+        return False
 
     def ensure_wifi_off(self) -> bool:
         self.wlan.active(False)
         log_debug('WiFi turned off')
 
         return not self.wlan.isconnected()
+
+    def _connect(self, bssid: bytes, channel: int, ifconfig: tuple, timeout: int) -> bool:
+        if ifconfig is not None:
+            self.wlan.ifconfig(ifconfig)
+
+        if channel is not None:
+            try:
+                self.wlan.config(channel=channel)
+            # pylint: disable=broad-exception-caught
+            except Exception:
+                pass
+
+        if bssid is not None:
+            self.wlan.connect(self.ssid, self.password, bssid=bssid)
+        else:
+            self.wlan.connect(self.ssid, self.password)
+
+        deadline = ticks_add(ticks_ms(), timeout)
+        while not self.wlan.isconnected() and ticks_diff(deadline, ticks_ms()) > 0:
+            self.watchdog.feed()
+
+            sleep_ms(POLL_INTERVAL)
+
+        return self.wlan.isconnected()
+
+    def _scan(self) -> tuple:
+        # The strongest access point broadcasting the SSID is remembered for the next wake
+        try:
+            networks = [network for network in self.wlan.scan() if network[0].decode() == self.ssid]
+        # pylint: disable=broad-exception-caught
+        except Exception as e:
+            log_debug(f'WiFi scan failed: {e}')
+
+            return None, None
+
+        if not networks:
+            return None, None
+
+        best = max(networks, key=lambda network: network[3])
+
+        return best[1], best[2]
+
+    def _load_connection(self) -> dict | None:
+        if self.storage is None:
+            return None
+
+        blob = self.storage.get_blob(WIFI_KEY)
+        if not blob:
+            return None
+
+        try:
+            cached = loads(blob.decode())
+
+            return {
+                'bssid'    : unhexlify(cached['bssid']),
+                'channel'  : cached['channel'],
+                'ifconfig' : tuple(cached['ifconfig']),
+            }
+        except (KeyError, ValueError):
+            return None
+
+    def _clear_connection(self) -> None:
+        if self.storage is not None:
+            self.storage.set_blob(WIFI_KEY, b'')
+
+    def _save_connection(self, bssid: bytes, channel: int) -> None:
+        if self.storage is None:
+            return
+
+        self.storage.set_blob(WIFI_KEY, dumps({
+            'bssid'    : hexlify(bssid).decode(),
+            'channel'  : channel,
+            'ifconfig' : list(self.wlan.ifconfig()),
+        }).encode())
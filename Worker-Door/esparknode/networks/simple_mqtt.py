@@ -1,4 +1,4 @@
-from paho.mqtt.client import Client
+from paho.mqtt.client import MQTT_ERR_SUCCESS, Client
 
 from esparknode.configs import MQTT_KEEPALIVE
 from esparknode.constants import TOPIC_ACTION, TOPIC_DEVICE, TOPIC_OTA
@@ -27,6 +27,10 @@ class MQTTManager(BaseMQTTManager):
 
         self._mqtt_callback(message.topic.encode(), message.payload)
 
+    def check_msg(self) -> None:
+        # Messages are handled as they arrive by the network loop of the client
+        pass
+
     def _ensure_mqtt(self):
         if self.client.is_connected():
             log_debug('MQTT already connected')
@@ -50,8 +54,14 @@ class MQTTManager(BaseMQTTManager):
 
         return True
 
-    def publish(self, topic: str, msg: str, retain: bool = False) -> None:
-        if not self._ensure_mqtt():
-            return
+    def publish(self, topic: str, msg: str, retain: bool = False) -> bool:
+        try:
+            if not self._ensure_mqtt():
+                return False
+
+            return self.client.publish(topic, msg, qos=1, retain=retain).rc == MQTT_ERR_SUCCESS
+        # pylint: disable=broad-exception-caught
+        except Exception as e:
+            log_debug(f'Failed to publish to {topic}: {type(e).__name__}: {e}')
 
-        self.client.publish(topic, msg, qos=1, retain=retain)
+            return False
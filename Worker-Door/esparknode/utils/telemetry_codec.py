@@ -0,0 +1,43 @@
+from struct import pack_into
+
+from esparknode.constants import DATA_TYPES, ENCODING_VERSION
+
+INT16_MIN  : int = -32768
+INT16_MAX  : int = 32767
+INT32_MIN  : int = -2147483648
+INT32_MAX  : int = 2147483647
+INT32_FLAG : int = 0x80
+
+
+def encode_readings(readings: list):
+    if len(readings) > 255:
+        return None
+
+    size = 2
+    for reading in readings:
+        # Queued readings carry their age, which only the JSON format can express
+        if len(reading) != 2:
+            return None
+
+        data_type, value = reading
+        if data_type not in DATA_TYPES or value < INT32_MIN or value > INT32_MAX:
+            return None
+
+        size += 3 if INT16_MIN <= value <= INT16_MAX else 5
+
+    # The whole message is packed into one preallocated buffer, instead of building strings on the heap
+    buffer = bytearray(size)
+    pack_into('<BB', buffer, 0, ENCODING_VERSION, len(readings))
+
+    offset = 2
+    for data_type, value in readings:
+        code = DATA_TYPES.index(data_type)
+
+        if INT16_MIN <= value <= INT16_MAX:
+            pack_into('<Bh', buffer, offset, code, value)
+            offset += 3
+        else:
+            pack_into('<Bi', buffer, offset, code | INT32_FLAG, value)
+            offset += 5
+
+    return buffer
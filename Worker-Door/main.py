@@ -9,6 +9,7 @@ from src.secrets import MQTT_HOST, WIFI_PASSWORD, WIFI_SSID
 from src.worker_node import WorkerNode
 
 if esparknode.configs.ENVIRONMENT == 'unix':
+    from esparknode.data.simple_storage import Storage
     from esparknode.networks.dummy_bluetooth import BluetoothManager
     from esparknode.networks.dummy_wifi import WiFiManager
     from esparknode.networks.simple_mqtt import MQTTManager
@@ -20,6 +21,7 @@ if esparknode.configs.ENVIRONMENT == 'unix':
 elif esparknode.configs.ENVIRONMENT == 'esp32':
     from machine import Pin, unique_id
 
+    from esparknode.data.esp32_storage import Storage
     from esparknode.networks.esp32_bluetooth import BluetoothManager
     from esparknode.networks.esp32_mqtt import MQTTManager
     from esparknode.networks.esp32_wifi import WiFiManager
@@ -38,9 +40,10 @@ else:
 
 id                = ''.join(f'{b:02x}' for b in device_id)
 sleeper           = Sleeper()
+storage           = Storage()
 watchdog          = Watchdog()
 bluetooth_manager = BluetoothManager()
-wifi_manager      = WiFiManager(watchdog=watchdog, ssid=WIFI_SSID, password=WIFI_PASSWORD)
+wifi_manager      = WiFiManager(watchdog=watchdog, ssid=WIFI_SSID, password=WIFI_PASSWORD, storage=storage)
 mqtt_manager      = MQTTManager(wifi_manager=wifi_manager, watchdog=watchdog, device_id=id, host=MQTT_HOST)
 
 print(f'Starting device with ID: {id}')
@@ -54,6 +57,7 @@ try:
         mqtt_manager      = mqtt_manager,
         bluetooth_manager = bluetooth_manager,
         triggers          = triggers,
+        storage           = storage,
     ).start()
 except Exception as e:
     log_crash(e, device_id=id, mqtt_manager=mqtt_manager)
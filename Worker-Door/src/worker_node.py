@@ -1,10 +1,9 @@
-from json import dumps
 from time import sleep, time
 
 import esparknode.configs
 
-from esparknode.constants import TOPIC_TELEMETRY
 from esparknode.base_node import BaseNode
+from esparknode.data.base_storage import BaseStorage
 from esparknode.networks.base_bluetooth import BaseBluetoothManager
 from esparknode.networks.base_mqtt import BaseMQTTManager
 from esparknode.networks.base_wifi import BaseWiFiManager
@@ -28,6 +27,7 @@ class WorkerNode(BaseNode):
             bluetooth_manager : BaseBluetoothManager = None,
             sensors           : list[BaseSensor]     = None,
             triggers          : list[BaseTrigger]    = None,
+            storage           : BaseStorage          = None,
     ):
         super().__init__(
             device_id=device_id,
@@ -38,6 +38,7 @@ class WorkerNode(BaseNode):
             bluetooth_manager=bluetooth_manager,
             sensors=sensors,
             triggers=triggers,
+            storage=storage,
         )
 
         self.sleep_interval = DETECTION_DELAY
@@ -67,20 +68,12 @@ class WorkerNode(BaseNode):
         if trigger.get_name() == SWITCH_NAME:
             door_open : bool = not value
 
-            self.mqtt_manager.publish(f'{TOPIC_TELEMETRY}/{self.device_id}', dumps({
-                'device_id' : self.device_id,
-                'data_type' : CAPABILITY_DOOR_OPEN,
-                'value'     : 100 if door_open else 0,
-            }))
+            self.publish_readings([[CAPABILITY_DOOR_OPEN, 100 if door_open else 0]])
 
             if not door_open:
                 self._on_door_closed()
         elif trigger.get_name() == MOTION_SENSOR_NAME:
-            self.mqtt_manager.publish(f'{TOPIC_TELEMETRY}/{self.device_id}', dumps({
-                'device_id' : self.device_id,
-                'data_type' : CAPABILITY_MOTION,
-                'value'     : 100 if value else 0,
-            }))
+            self.publish_readings([[CAPABILITY_MOTION, 100 if value else 0]])
 
             if value:
                 self.last_detection_time = time()
@@ -98,11 +91,7 @@ class WorkerNode(BaseNode):
                     log_debug(f'Door open state: {door_open}', self.device_id, self.mqtt_manager)
 
                     if not door_open:
-                        self.mqtt_manager.publish(f'{TOPIC_TELEMETRY}/{self.device_id}', dumps({
-                            'device_id' : self.device_id,
-                            'data_type' : CAPABILITY_DOOR_OPEN,
-                            'value'     : 0,
-                        }))
+                        self.publish_readings([[CAPABILITY_DOOR_OPEN, 0]])
 
                         gpio_interrupt.wake_on(0)
 
@@ -133,11 +122,7 @@ class WorkerNode(BaseNode):
     def publish_telemetry(self):
         self._on_door_closed()
 
-        self.mqtt_manager.publish(f'{TOPIC_TELEMETRY}/{self.device_id}', dumps({
-            'device_id' : self.device_id,
-            'data_type' : CAPABILITY_DOOR_OPEN,
-            'value'     : 100,
-        }))
+        self.publish_readings([[CAPABILITY_DOOR_OPEN, 100]])
 
         self.start_detection()
 
@@ -165,11 +150,7 @@ class WorkerNode(BaseNode):
 
                         log_debug('Issuing door-open warnings')
 
-                        self.mqtt_manager.publish(f'{TOPIC_TELEMETRY}/{self.device_id}', dumps({
-                            'device_id' : self.device_id,
-                            'data_type' : CAPABILITY_DOOR_OPEN,
-                            'value'     : 200,
-                        }))
+                        self.publish_readings([[CAPABILITY_DOOR_OPEN, 200]])
 
                     self.start_buzzer()
                 else:
@@ -185,11 +166,7 @@ class WorkerNode(BaseNode):
 
         log_debug('Issuing door-open final alert')
 
-        self.mqtt_manager.publish(f'{TOPIC_TELEMETRY}/{self.device_id}', dumps({
-            'device_id' : self.device_id,
-            'data_type' : CAPABILITY_DOOR_OPEN,
-            'value'     : 300,
-        }))
+        self.publish_readings([[CAPABILITY_DOOR_OPEN, 300]])
 
         self._on_door_opened()
 
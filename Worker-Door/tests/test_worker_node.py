@@ -3,6 +3,9 @@ from unittest.mock import MagicMock
 
 import esparknode.configs
 
+from esparknode.data.base_storage import BaseStorage
+from esparknode.data.parameters_cache import ParametersCache
+from esparknode.data.telemetry_queue import TelemetryQueue
 from esparknode.triggers.base_trigger import BaseTrigger
 
 from src.worker_node import WorkerNode
@@ -26,6 +29,17 @@ class DummyTrigger(BaseTrigger):
         self.stopped = True
 
 
+class MemoryStorage(BaseStorage):
+    def __init__(self):
+        self.blobs = {}
+
+    def set_blob(self, key, value):
+        self.blobs[key] = value
+
+    def get_blob(self, key):
+        return self.blobs.get(key) or None
+
+
 @fixture
 def worker_node(monkeypatch):
     sleeper           = MagicMock()
@@ -90,3 +104,28 @@ def test_start_buzzer_and_stop_buzzer(worker_node, monkeypatch):
     worker_node.stop_buzzer()
 
     assert worker_node.buzzer_started is False
+
+def test_load_parameters_restores_cached_detection_settings(worker_node):
+    worker_node.parameters_cache = ParametersCache(MemoryStorage())
+
+    worker_node._on_mqtt_message('espark/device/dev1', {
+        'max_detection_duration' : 456,
+        'buzzer_enabled'         : False,
+        'version'                : 1,
+    })
+
+    worker_node.max_detection_duration = 0
+    worker_node.buzzer_enabled         = True
+
+    worker_node.load_parameters()
+
+    assert worker_node.max_detection_duration == 456
+    assert worker_node.buzzer_enabled is False
+
+def test_on_triggered_queues_readings_while_offline(worker_node):
+    worker_node.telemetry_queue = TelemetryQueue(MemoryStorage())
+    worker_node.mqtt_manager.publish = MagicMock(return_value=False)
+
+    worker_node._on_triggered(True, worker_node.triggers[0])
+
+    assert [reading[:2] for reading in worker_node.telemetry_queue.peek()] == [['motion', 100]]
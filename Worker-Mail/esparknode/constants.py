@@ -7,3 +7,18 @@ TOPIC_CRASH        : str = 'espark/crash'
 
 NODE_NAME    : str = 'espark-node'
 NODE_VERSION : str = '0.0.0'
+
+# Position in this tuple is the code of a data type in binary telemetry, so new data types are only ever appended
+DATA_TYPES : tuple = (
+    'temperature',
+    'humidity',
+    'battery',
+    'pressure',
+    'air_quality',
+    'light_level',
+    'door_open',
+    'motion',
+    'mail',
+)
+
+ENCODING_VERSION : int = 1
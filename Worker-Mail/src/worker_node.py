@@ -1,9 +1,7 @@
-from json import dumps
 from time import sleep
 
 import esparknode.configs
 
-from esparknode.constants import TOPIC_TELEMETRY
 from esparknode.base_node import BaseNode
 from esparknode.networks.base_bluetooth import BaseBluetoothManager
 from esparknode.networks.base_mqtt import BaseMQTTManager
@@ -39,8 +37,6 @@ class WorkerNode(BaseNode):
             triggers=triggers,
         )
 
-        self.parameters_updated = True
-
         for trigger in self.triggers:
             trigger.register_callback(self._on_triggered)
 
@@ -52,11 +48,7 @@ class WorkerNode(BaseNode):
 
     # pylint: disable=unused-argument
     def _on_triggered(self, value: bool, trigger: BaseTrigger, pin_index: int = 0) -> None:
-        self.mqtt_manager.publish(f'{TOPIC_TELEMETRY}/{self.device_id}', dumps({
-            'device_id' : self.device_id,
-            'data_type' : CAPABILITY_MAIL,
-            'value'     : (100 if value else -100) if pin_index == 0 else (200 if value else -200) if pin_index == 1 else 0,
-        }))
+        self.publish_readings([[CAPABILITY_MAIL, (100 if value else -100) if pin_index == 0 else (200 if value else -200) if pin_index == 1 else 0]])
 
     def publish_telemetry(self) -> None:
         if len(self.triggers) > 0:
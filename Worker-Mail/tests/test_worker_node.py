@@ -1,3 +1,5 @@
+from json import loads
+
 from pytest import fixture
 from unittest.mock import MagicMock
 
@@ -54,3 +56,9 @@ def test_on_triggered_publishes_telemetry(worker_node):
 
     assert worker_node.device_id in args[0]
     assert 'mail' in args[1] or 'data_type' in args[1]
+
+def test_on_triggered_publishes_readings(worker_node):
+    worker_node.mqtt_manager.publish = MagicMock(return_value=True)
+    worker_node._on_triggered(False, worker_node.triggers[0], 1)
+
+    assert loads(worker_node.mqtt_manager.publish.call_args[0][1])['readings'] == [['mail', -200]]
@@ -17,3 +17,25 @@ class Storage(BaseStorage):
             return self.nvs.get_i32(key)
         except OSError:
             return None
+
+    def set_blob(self, key: str, value: bytes) -> None:
+        # NVS needs the size of a blob to read it back, so it is stored next to the blob
+        if value:
+            self.nvs.set_blob(key, value)
+
+        self.nvs.set_i32(f'{key}_size', len(value))
+        self.nvs.commit()
+
+    def get_blob(self, key: str) -> bytes | None:
+        size = self.get_int(f'{key}_size')
+        if not size:
+            return None
+
+        buffer = bytearray(size)
+
+        try:
+            self.nvs.get_blob(key, buffer)
+        except OSError:
+            return None
+
+        return bytes(buffer)
@@ -0,0 +1,42 @@
+from json import dumps, loads
+from time import time
+
+from esparknode.configs import TELEMETRY_QUEUE_CAPACITY
+from esparknode.data.base_storage import BaseStorage
+
+TELEMETRY_QUEUE_KEY : str = 'telemetry'
+
+
+class TelemetryQueue:
+    def __init__(self, storage: BaseStorage, capacity: int = TELEMETRY_QUEUE_CAPACITY):
+        self.storage  = storage
+        self.capacity = capacity
+
+    def push(self, readings: list) -> None:
+        if not readings:
+            return
+
+        now     = round(time())
+        entries = self._load() + [[data_type, value, now] for data_type, value in readings]
+
+        # The oldest readings are dropped first once the queue is full
+        self.storage.set_blob(TELEMETRY_QUEUE_KEY, dumps(entries[-self.capacity:]).encode())
+
+    def peek(self) -> list:
+        now = round(time())
+
+        # Queued readings carry their age in seconds, so the Master can date them back
+        return [[data_type, value, max(0, now - timestamp)] for data_type, value, timestamp in self._load()]
+
+    def clear(self) -> None:
+        self.storage.set_blob(TELEMETRY_QUEUE_KEY, b'')
+
+    def _load(self) -> list:
+        blob = self.storage.get_blob(TELEMETRY_QUEUE_KEY)
+        if not blob:
+            return []
+
+        try:
+            return loads(blob.decode())
+        except ValueError:
+            return []
@@ -27,6 +27,9 @@ class BaseMQTTManager:
         if self.on_callback:
             self.on_callback(topic.decode(), loads(msg.decode()))
 
+    def check_msg(self) -> None:
+        raise NotImplementedError('Subclasses must implement this method')
+
     def _ensure_mqtt(self):
         raise NotImplementedError('Subclasses must implement this method')
 
@@ -34,5 +37,5 @@ class BaseMQTTManager:
         raise NotImplementedError('Subclasses must implement this method')
 
     # pylint: disable=unused-argument
-    def publish(self, topic: str, msg: str, retain: bool = False) -> None:
+    def publish(self, topic: str, msg: str, retain: bool = False) -> bool:
         raise NotImplementedError('Subclasses must implement this method')
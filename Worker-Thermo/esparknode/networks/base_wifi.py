@@ -1,11 +1,13 @@
+from esparknode.data.base_storage import BaseStorage
 from esparknode.utils.base_watchdog import BaseWatchdog
 
 
 class BaseWiFiManager:
-    def __init__(self, watchdog: BaseWatchdog, ssid: str, password: str):
+    def __init__(self, watchdog: BaseWatchdog, ssid: str, password: str, storage: BaseStorage = None):
         self.watchdog = watchdog
         self.ssid     = ssid
         self.password = password
+        self.storage  = storage
 
     def ensure_wifi_on(self) -> bool:
         raise NotImplementedError('Subclasses must implement this method')
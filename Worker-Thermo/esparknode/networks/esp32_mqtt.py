@@ -1,5 +1,5 @@
 # pylint: disable=import-error
-from time import sleep, time
+from time import sleep, sleep_ms, ticks_add, ticks_diff, ticks_ms, time
 
 from umqtt.simple import MQTTClient
 
@@ -8,7 +8,11 @@ from esparknode.constants import TOPIC_ACTION, TOPIC_DEVICE, TOPIC_OTA
 from esparknode.networks.base_mqtt import BaseMQTTManager
 from esparknode.networks.base_wifi import BaseWiFiManager
 from esparknode.utils.base_watchdog import BaseWatchdog
-from esparknode.utils.logging import log_error
+from esparknode.utils.logging import log_debug
+
+CHECK_TIMEOUT : int = 500
+CHECK_LIMIT   : int = 10
+POLL_INTERVAL : int = 50
 
 
 class MQTTManager(BaseMQTTManager):
@@ -22,7 +26,35 @@ class MQTTManager(BaseMQTTManager):
     ):
         super().__init__(wifi_manager, watchdog, device_id, host, port)
 
-        self.client = MQTTClient(device_id, host, port, keepalive=MQTT_KEEPALIVE)
+        self.client   = MQTTClient(device_id, host, port, keepalive=MQTT_KEEPALIVE)
+        self.received = 0
+
+    def check_msg(self) -> None:
+        received = self.received
+        deadline = ticks_add(ticks_ms(), CHECK_TIMEOUT)
+
+        try:
+            # umqtt returns None after a PUBLISH as well as when nothing is waiting, so handled messages are counted by the callback
+            while self.received - received < CHECK_LIMIT and ticks_diff(deadline, ticks_ms()) > 0:
+                before = self.received
+
+                self.client.check_msg()
+                self.watchdog.feed()
+
+                if self.received == before:
+                    # Retained messages arrive back to back, so an empty poll after one of them means there are no more
+                    if self.received > received:
+                        break
+
+                    sleep_ms(POLL_INTERVAL)
+        # pylint: disable=broad-exception-caught
+        except Exception as e:
+            log_debug(f'Failed to check MQTT messages: {type(e).__name__}: {e}')
+
+    def _mqtt_callback(self, topic: bytes, msg: bytes):
+        self.received += 1
+
+        super()._mqtt_callback(topic, msg)
 
     def _ensure_mqtt(self):
         try:
@@ -49,7 +81,7 @@ class MQTTManager(BaseMQTTManager):
                 return True
             # pylint: disable=broad-exception-caught
             except Exception as e:
-                log_error(e, self.device_id, self)
+                log_debug(f'Failed to connect to MQTT broker: {type(e).__name__}: {e}')
 
                 self.watchdog.feed()
 
@@ -57,12 +89,17 @@ class MQTTManager(BaseMQTTManager):
 
         return False
 
-    def publish(self, topic: str, msg: str, retain: bool = False) -> None:
+    def publish(self, topic: str, msg: str, retain: bool = False) -> bool:
         if not self._ensure_mqtt():
-            return
+            return False
 
         try:
             self.client.publish(topic, msg, qos=1, retain=retain)
+
+            return True
         # pylint: disable=broad-exception-caught
         except Exception as e:
-            log_error(e, self.device_id, self)
+            # Failures are reported to the caller instead of raised, so unsent readings can be queued
+            log_debug(f'Failed to publish to {topic}: {type(e).__name__}: {e}')
+
+            return False
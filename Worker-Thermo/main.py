@@ -11,6 +11,7 @@ from src.worker_node import WorkerNode
 
 if esparknode.configs.ENVIRONMENT == 'unix':
     from esparknode.actions.simple_relay import Relay
+    from esparknode.data.simple_storage import Storage
     from esparknode.networks.dummy_bluetooth import BluetoothManager
     from esparknode.networks.dummy_wifi import WiFiManager
     from esparknode.networks.simple_mqtt import MQTTManager
@@ -31,6 +32,7 @@ elif esparknode.configs.ENVIRONMENT == 'esp32':
     from machine import unique_id
 
     from esparknode.actions.latching_relay import LatchingRelay
+    from esparknode.data.esp32_storage import Storage
     from esparknode.networks.esp32_bluetooth import BluetoothManager
     from esparknode.networks.esp32_mqtt import MQTTManager
     from esparknode.networks.esp32_wifi import WiFiManager
@@ -56,9 +58,10 @@ else:
 
 id                = ''.join(f'{b:02x}' for b in device_id)
 sleeper           = Sleeper()
+storage           = Storage()
 watchdog          = Watchdog()
 bluetooth_manager = BluetoothManager()
-wifi_manager      = WiFiManager(watchdog=watchdog, ssid=WIFI_SSID, password=WIFI_PASSWORD)
+wifi_manager      = WiFiManager(watchdog=watchdog, ssid=WIFI_SSID, password=WIFI_PASSWORD, storage=storage)
 mqtt_manager      = MQTTManager(wifi_manager=wifi_manager, watchdog=watchdog, device_id=id, host=MQTT_HOST)
 
 log_debug(f'Starting device with ID: {id}')
@@ -73,6 +76,7 @@ try:
         bluetooth_manager = bluetooth_manager,
         actions           = actions,
         sensors           = sensors,
+        storage           = storage,
     ).start()
 except Exception as e:
     log_crash(e, device_id=id, mqtt_manager=mqtt_manager)
@@ -1,5 +1,6 @@
 from esparknode.actions.base_relay import BaseRelay
 from esparknode.base_node import BaseNode
+from esparknode.data.base_storage import BaseStorage
 from esparknode.networks.base_bluetooth import BaseBluetoothManager
 from esparknode.networks.base_mqtt import BaseMQTTManager
 from esparknode.networks.base_wifi import BaseWiFiManager
@@ -22,6 +23,7 @@ class WorkerNode(BaseNode):
             actions           : list[BaseRelay]      = None,
             sensors           : list[BaseSensor]     = None,
             triggers          : list[BaseTrigger]    = None,
+            storage           : BaseStorage          = None,
     ):
         super().__init__(
             device_id=device_id,
@@ -32,6 +34,7 @@ class WorkerNode(BaseNode):
             bluetooth_manager=bluetooth_manager,
             sensors=sensors,
             triggers=triggers,
+            storage=storage,
         )
 
         self.actions = actions if actions is not None else []
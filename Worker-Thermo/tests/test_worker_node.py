@@ -1,6 +1,13 @@
+from json import loads
+from struct import pack
+
 from pytest import fixture
 from unittest.mock import MagicMock
 
+from esparknode.data.base_storage import BaseStorage
+from esparknode.data.parameters_cache import ParametersCache
+from esparknode.data.telemetry_queue import TelemetryQueue
+
 from src.worker_node import WorkerNode
 
 
@@ -41,3 +48,151 @@ def test_handle_parameters_update(worker_node):
     })
 
     assert worker_node.sleep_interval == 456
+
+
+def test_publish_telemetry_sends_one_batched_message(worker_node):
+    sensor = MagicMock()
+    sensor.read.return_value = {
+        'temperature' : 19.5,
+        'humidity'    : 50.25,
+    }
+
+    worker_node.sensors = [sensor, sensor]
+
+    worker_node.publish_telemetry()
+
+    worker_node.mqtt_manager.publish.assert_called_once()
+
+    topic, payload = worker_node.mqtt_manager.publish.call_args[0]
+
+    assert topic == 'espark/telemetry/dev1'
+    assert loads(payload) == {
+        'device_id' : 'dev1',
+        'readings'  : [['temperature', 1950], ['humidity', 5025], ['temperature', 1950], ['humidity', 5025]],
+    }
+
+
+def test_publish_telemetry_sends_binary_readings(worker_node, monkeypatch):
+    monkeypatch.setattr('esparknode.base_node.TELEMETRY_ENCODING', 'binary')
+
+    sensor = MagicMock()
+    sensor.read.return_value = {
+        'temperature' : -5.5,
+        'humidity'    : 50.25,
+        'battery'     : 400,
+    }
+
+    worker_node.sensors = [sensor]
+
+    worker_node.publish_telemetry()
+
+    topic, payload = worker_node.mqtt_manager.publish.call_args[0]
+
+    assert topic == 'espark/telemetry/dev1'
+    assert bytes(payload) == pack('<BBBhBhBi', 1, 3, 0, -550, 1, 5025, 0x82, 40000)
+
+
+def test_register_does_not_advertise_the_encoding(worker_node, monkeypatch):
+    monkeypatch.setattr('esparknode.base_node.TELEMETRY_ENCODING', 'binary')
+
+    worker_node.register()
+
+    # The Master tells binary telemetry apart by its version byte
+    assert 'encoding_binary' not in loads(worker_node.mqtt_manager.publish.call_args[0][1])['capabilities']
+
+
+class MemoryStorage(BaseStorage):
+    def __init__(self):
+        self.blobs = {}
+
+    def set_blob(self, key, value):
+        self.blobs[key] = value
+
+    def get_blob(self, key):
+        return self.blobs.get(key) or None
+
+
+def test_publish_telemetry_queues_readings_until_the_next_connection(worker_node):
+    sensor = MagicMock()
+    sensor.read.return_value = {
+        'temperature' : 19.5,
+    }
+
+    worker_node.sensors         = [sensor]
+    worker_node.telemetry_queue = TelemetryQueue(MemoryStorage())
+
+    worker_node.mqtt_manager.publish.return_value = False
+    worker_node.publish_telemetry()
+
+    assert worker_node.telemetry_queue.peek() == [['temperature', 1950, 0]]
+
+    worker_node.mqtt_manager.publish.return_value = True
+    worker_node.publish_telemetry()
+
+    assert loads(worker_node.mqtt_manager.publish.call_args[0][1])['readings'] == [['temperature', 1950, 0], ['temperature', 1950]]
+    assert worker_node.telemetry_queue.peek() == []
+
+
+def test_start_queues_telemetry_when_registration_fails(worker_node):
+    sensor = MagicMock()
+    sensor.read.return_value = {
+        'temperature' : 19.5,
+    }
+
+    worker_node.sensors         = [sensor]
+    worker_node.telemetry_queue = TelemetryQueue(MemoryStorage())
+
+    worker_node.mqtt_manager.publish.return_value = False
+    worker_node.start()
+
+    worker_node.mqtt_manager.publish.assert_called_once()
+    worker_node.sleeper.deep_sleep.assert_called_once()
+
+    assert worker_node.telemetry_queue.peek() == [['temperature', 1950, 0]]
+
+
+def test_telemetry_queue_drops_the_oldest_readings():
+    queue = TelemetryQueue(MemoryStorage(), capacity=2)
+
+    queue.push([['temperature', 1900], ['humidity', 5000]])
+    queue.push([['battery', 9000]])
+
+    assert [reading[0] for reading in queue.peek()] == ['humidity', 'battery']
+
+
+def test_start_applies_cached_parameters_without_waiting(worker_node):
+    worker_node.parameters_cache = ParametersCache(MemoryStorage())
+    worker_node.parameters_cache.save({
+        'sleep_interval' : 300,
+        'version'        : 2,
+    })
+
+    worker_node.mqtt_manager.publish.return_value = True
+    worker_node.start()
+
+    worker_node.mqtt_manager.check_msg.assert_called_once()
+    worker_node.sleeper.deep_sleep.assert_called_once_with(300 * 1000)
+
+
+def test_retained_parameters_only_update_the_cache_when_newer(worker_node):
+    worker_node.parameters_cache = ParametersCache(MemoryStorage())
+
+    worker_node._on_mqtt_message('espark/device/dev1', {
+        'sleep_interval' : 300,
+        'version'        : 2,
+    })
+    worker_node._on_mqtt_message('espark/device/dev1', {
+        'sleep_interval' : 900,
+        'version'        : 1,
+    })
+
+    assert worker_node.sleep_interval == 300
+    assert worker_node.parameters_cache.load()['version'] == 2
+
+    worker_node._on_mqtt_message('espark/device/dev1', {
+        'sleep_interval' : 60,
+        'version'        : 3,
+    })
+
+    assert worker_node.sleep_interval == 60
+    assert worker_node.parameters_cache.load()['version'] == 3